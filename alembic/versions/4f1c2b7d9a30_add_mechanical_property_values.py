@@ -0,0 +1,58 @@
+"""Add mechanical_property_values with numeric mechanical properties
+
+Revision ID: 4f1c2b7d9a30
+Revises: ea28427ef508
+Create Date: 2026-10-18 20:14:37.208941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from materials.derived import rebuild_mechanical_property_values
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1c2b7d9a30'
+down_revision: Union[str, None] = 'ea28427ef508'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Таблица могла быть создана пустой вызовом Base.metadata.create_all при импорте пакета
+    if not sa.inspect(op.get_bind()).has_table('mechanical_property_values'):
+        op.create_table(
+            'mechanical_property_values',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('material_id', sa.Integer(), nullable=False),
+            sa.Column('mechanical_properties_id', sa.Integer(), nullable=False),
+            sa.Column('property', sa.String(), nullable=False),
+            sa.Column('product_form', sa.String(), nullable=True),
+            sa.Column('category', sa.String(), nullable=True),
+            sa.Column('standard', sa.String(), nullable=True),
+            sa.Column('min_value', sa.Float(), nullable=False),
+            sa.Column('max_value', sa.Float(), nullable=False),
+            sa.ForeignKeyConstraint(['material_id'], ['materials.id']),
+            sa.ForeignKeyConstraint(['mechanical_properties_id'], ['mechanical_properties.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    op.create_index('ix_mechanical_property_values_material_id', 'mechanical_property_values', ['material_id'],
+                    if_not_exists=True)
+    op.create_index('ix_mechanical_property_values_mechanical_properties_id', 'mechanical_property_values',
+                    ['mechanical_properties_id'], if_not_exists=True)
+    op.create_index('ix_mechanical_property_values_property_form_min', 'mechanical_property_values',
+                    ['property', 'product_form', 'min_value'], if_not_exists=True)
+    op.create_index('ix_mechanical_property_values_property_min', 'mechanical_property_values',
+                    ['property', 'min_value'], if_not_exists=True)
+    op.create_index('ix_mechanical_property_values_property_max', 'mechanical_property_values',
+                    ['property', 'max_value'], if_not_exists=True)
+
+    # Заполняем таблицу разбором строковых значений mechanical_properties
+    rebuild_mechanical_property_values(op.get_bind())
+    op.execute('ANALYZE mechanical_property_values')
+
+
+def downgrade() -> None:
+    op.drop_table('mechanical_property_values')
@@ -0,0 +1,28 @@
+"""Add characteristics_fts full-text index over characteristics_of_material
+
+Revision ID: 5d9e7a31c0b4
+Revises: b83e5d41c6f2
+Create Date: 2026-10-18 22:14:37.218406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from materials.derived import create_characteristics_fts, drop_characteristics_fts
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9e7a31c0b4'
+down_revision: Union[str, None] = 'b83e5d41c6f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Виртуальная таблица FTS5 с внешним содержимым и триггеры, синхронизирующие ее с characteristics_of_material
+    create_characteristics_fts(op.get_bind())
+
+
+def downgrade() -> None:
+    drop_characteristics_fts(op.get_bind())
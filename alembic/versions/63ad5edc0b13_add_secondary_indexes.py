@@ -0,0 +1,45 @@
+"""Add secondary indexes on material_id, brand and standards.material_name
+
+Revision ID: 63ad5edc0b13
+Revises: dec204b8f6d2
+Create Date: 2026-10-18 19:09:04.835783
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '63ad5edc0b13'
+down_revision: Union[str, None] = 'dec204b8f6d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Индексы, используемые функциями crud: (имя индекса, таблица, столбцы, уникальный)
+INDEXES = [
+    ('ix_materials_id', 'materials', ['id'], False),
+    ('ix_materials_brand', 'materials', ['brand'], True),
+    ('ix_hardness_material_id', 'hardness', ['material_id'], False),
+    ('ix_chemical_composition_material_id', 'chemical_composition', ['material_id'], False),
+    ('ix_mechanical_properties_material_id', 'mechanical_properties', ['material_id'], False),
+    ('ix_technological_properties_material_id', 'technological_properties', ['material_id'], False),
+    ('ix_characteristics_of_material_material_id', 'characteristics_of_material', ['material_id'], False),
+    ('ix_material_indices_material_id', 'material_indices', ['material_id'], False),
+    ('ix_material_indices_index_of_material_class', 'material_indices', ['index_of_material_class'], False),
+    ('ix_standards_material_name', 'standards', ['material_name'], False),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, unique in INDEXES:
+        op.create_index(name, table, columns, unique=unique, if_not_exists=True)
+    # Обновляем статистику, чтобы планировщик SQLite выбирал новые индексы
+    op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,37 @@
+"""Add indexes for standard resolution via standard_id and reverse lookup by standard
+
+Revision ID: a41f6c2e9b57
+Revises: e7a2c94f1d08
+Create Date: 2026-10-18 23:26:48.130592
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f6c2e9b57'
+down_revision: Union[str, None] = 'e7a2c94f1d08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Индексы для определения стандарта через standard_id и поиска марок по стандарту: (имя, таблица, столбцы)
+INDEXES = [
+    ('ix_chemical_composition_standard_id', 'chemical_composition', ['standard_id']),
+    ('ix_standards_standard', 'standards', ['standard']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+    # Обновляем статистику, чтобы планировщик SQLite выбирал новые индексы
+    op.execute('ANALYZE chemical_composition')
+    op.execute('ANALYZE standards')
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,51 @@
+"""Add hardness_values with parsed hardness scale and range
+
+Revision ID: b83e5d41c6f2
+Revises: 4f1c2b7d9a30
+Create Date: 2026-10-18 20:41:09.553172
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from materials.derived import rebuild_hardness_values
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83e5d41c6f2'
+down_revision: Union[str, None] = '4f1c2b7d9a30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Таблица могла быть создана пустой вызовом Base.metadata.create_all при импорте пакета
+    if not sa.inspect(op.get_bind()).has_table('hardness_values'):
+        op.create_table(
+            'hardness_values',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('material_id', sa.Integer(), nullable=False),
+            sa.Column('hardness_id', sa.Integer(), nullable=False),
+            sa.Column('scale', sa.String(), nullable=False),
+            sa.Column('condition', sa.String(), nullable=True),
+            sa.Column('min_value', sa.Float(), nullable=False),
+            sa.Column('max_value', sa.Float(), nullable=False),
+            sa.ForeignKeyConstraint(['material_id'], ['materials.id']),
+            sa.ForeignKeyConstraint(['hardness_id'], ['hardness.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    op.create_index('ix_hardness_values_material_id', 'hardness_values', ['material_id'], if_not_exists=True)
+    op.create_index('ix_hardness_values_hardness_id', 'hardness_values', ['hardness_id'], if_not_exists=True)
+    op.create_index('ix_hardness_values_scale_min_max', 'hardness_values', ['scale', 'min_value', 'max_value'],
+                    if_not_exists=True)
+    op.create_index('ix_hardness_values_scale_max', 'hardness_values', ['scale', 'max_value'], if_not_exists=True)
+
+    # Заполняем таблицу разбором строковых значений hardness
+    rebuild_hardness_values(op.get_bind())
+    op.execute('ANALYZE hardness_values')
+
+
+def downgrade() -> None:
+    op.drop_table('hardness_values')
@@ -0,0 +1,51 @@
+"""Add foreign_analogs with parsed foreign grades of materials
+
+Revision ID: e7a2c94f1d08
+Revises: 5d9e7a31c0b4
+Create Date: 2026-10-18 22:52:16.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from materials.derived import rebuild_foreign_analogs
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a2c94f1d08'
+down_revision: Union[str, None] = '5d9e7a31c0b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Таблица могла быть создана пустой вызовом Base.metadata.create_all при импорте пакета
+    if not sa.inspect(op.get_bind()).has_table('foreign_analogs'):
+        op.create_table(
+            'foreign_analogs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('material_id', sa.Integer(), nullable=False),
+            sa.Column('characteristics_id', sa.Integer(), nullable=False),
+            sa.Column('standard_system', sa.String(), nullable=True),
+            sa.Column('foreign_grade', sa.String(), nullable=False),
+            sa.Column('normalized_grade', sa.String(), nullable=False),
+            sa.ForeignKeyConstraint(['material_id'], ['materials.id']),
+            sa.ForeignKeyConstraint(['characteristics_id'], ['characteristics_of_material.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    op.create_index('ix_foreign_analogs_characteristics_id', 'foreign_analogs', ['characteristics_id'],
+                    if_not_exists=True)
+    op.create_index('ix_foreign_analogs_grade_system', 'foreign_analogs', ['normalized_grade', 'standard_system'],
+                    if_not_exists=True)
+    op.create_index('ix_foreign_analogs_material_system', 'foreign_analogs', ['material_id', 'standard_system'],
+                    if_not_exists=True)
+
+    # Заполняем таблицу разбором строковых значений characteristics_of_material.foreign_analogs
+    rebuild_foreign_analogs(op.get_bind())
+    op.execute('ANALYZE foreign_analogs')
+
+
+def downgrade() -> None:
+    op.drop_table('foreign_analogs')
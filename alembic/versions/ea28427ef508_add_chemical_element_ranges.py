@@ -0,0 +1,53 @@
+"""Add chemical_element_ranges with numeric element contents
+
+Revision ID: ea28427ef508
+Revises: 63ad5edc0b13
+Create Date: 2026-10-18 19:32:10.412507
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from materials.derived import rebuild_chemical_element_ranges
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ea28427ef508'
+down_revision: Union[str, None] = '63ad5edc0b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Таблица могла быть создана пустой вызовом Base.metadata.create_all при импорте пакета
+    if not sa.inspect(op.get_bind()).has_table('chemical_element_ranges'):
+        op.create_table(
+            'chemical_element_ranges',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('material_id', sa.Integer(), nullable=False),
+            sa.Column('chemical_composition_id', sa.Integer(), nullable=False),
+            sa.Column('element', sa.String(), nullable=False),
+            sa.Column('min_value', sa.Float(), nullable=False),
+            sa.Column('max_value', sa.Float(), nullable=False),
+            sa.ForeignKeyConstraint(['material_id'], ['materials.id']),
+            sa.ForeignKeyConstraint(['chemical_composition_id'], ['chemical_composition.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    op.create_index('ix_chemical_element_ranges_material_id', 'chemical_element_ranges', ['material_id'],
+                    if_not_exists=True)
+    op.create_index('ix_chemical_element_ranges_chemical_composition_id', 'chemical_element_ranges',
+                    ['chemical_composition_id'], if_not_exists=True)
+    op.create_index('ix_chemical_element_ranges_element_min_max', 'chemical_element_ranges',
+                    ['element', 'min_value', 'max_value'], if_not_exists=True)
+    op.create_index('ix_chemical_element_ranges_element_max', 'chemical_element_ranges',
+                    ['element', 'max_value'], if_not_exists=True)
+
+    # Заполняем таблицу разбором строковых значений chemical_composition
+    rebuild_chemical_element_ranges(op.get_bind())
+    op.execute('ANALYZE chemical_element_ranges')
+
+
+def downgrade() -> None:
+    op.drop_table('chemical_element_ranges')
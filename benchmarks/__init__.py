@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Замеры производительности пакета `materials`: задержки (перцентили) и пропускная способность функций `crud` и способов
+получения полной информации о материале (`example.print_material_info`).
+
+Пакет не входит в дистрибутив (см. `setup.py`). Замеры запускаются из корня репозитория:
+
+    python -m benchmarks.run
+
+Модули:
+- `benchmarks.common`: Измерение задержек, перцентили, многопоточные замеры, холодный старт в отдельном процессе.
+- `benchmarks.synthetic`: Синтетический каталог, в `SCALE` раз больше поставляемой базы данных.
+- `benchmarks.crud_bench`: Вызовы функций `crud`: одиночные и пакетные.
+- `benchmarks.material_info_bench`: Способы получения полной информации о материале.
+- `benchmarks.multiprocess_bench`: Чтение из нескольких процессов при разных параметрах подключения SQLite.
+- `benchmarks.records_bench`: Память и время загрузки объектов ORM и записей только для чтения.
+- `benchmarks.run`: Запуск замеров, вывод таблиц, сохранение результатов и сравнение с предыдущим запуском.
+"""
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль содержит общие средства замеров: измерение задержек вызова (`time.perf_counter`), перцентили, замеры в
+нескольких потоках и замер холодного старта в отдельном процессе Python.
+
+Каждый набор замеров (`benchmarks.crud_bench`, `benchmarks.material_info_bench`) предоставляет функции
+`single_calls(brand)` и `batch_calls(brands)`, которые возвращают словари "имя -> вызов без аргументов". Холодный старт
+измеряется в новом процессе: импорт модуля набора (и пакета `materials`) и первый вызов, без прогретых пулов
+соединений, кэшей и индексов.
+
+Основные компоненты:
+- `Timing`: Результат замера: перцентили задержки и пропускная способность.
+- `percentile(values, q)`: Перцентиль упорядоченной последовательности (с линейной интерполяцией).
+- `measure(function, repeat, time_limit)`: Задержки последовательных вызовов.
+- `summarize(name, mode, latencies, threads, elapsed)`: Сводка замера.
+- `run_threads(function, threads, repeat, time_limit)`: Задержки и пропускная способность при вызовах из нескольких
+  потоков.
+- `measure_cold(module, name, database, repeat)`: Время импорта и первого вызова в отдельном процессе.
+- `prefer_installed_package()`: Исключает корень репозитория из путей импорта, чтобы замерялся установленный пакет
+  `materials` (например, колесо из `dist/`), если задана переменная окружения `MATERIALS_BENCH_INSTALLED`.
+- `format_timings(timings)`: Таблица результатов.
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+# Минимальное количество вызовов замера, даже если превышено ограничение времени
+MIN_REPEAT = 5
+
+# Корень репозитория: отдельный процесс холодного старта импортирует `benchmarks` и `materials` из него
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Переменная окружения: замерять установленный пакет `materials`, а не пакет из репозитория
+INSTALLED_ENV = "MATERIALS_BENCH_INSTALLED"
+
+# Программа холодного старта: импорт модуля набора замеров, затем первый вызов. Выводит время импорта и вызова
+_COLD_PROBE = """
+import importlib, json, sys, time
+from benchmarks.common import prefer_installed_package
+prefer_installed_package()
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+call = module.single_calls()[sys.argv[2]]
+called = time.perf_counter()
+call()
+print(json.dumps([imported - start, time.perf_counter() - called]))
+"""
+
+
+class Timing(NamedTuple):
+    """Результат замера. Задержки в секундах, пропускная способность - вызовов в секунду."""
+    name: str
+    mode: str
+    threads: int
+    calls: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    throughput: float
+
+
+# Функция для исключения корня репозитория из путей импорта (пакет `benchmarks` к этому моменту уже импортирован),
+# если задана переменная окружения INSTALLED_ENV. Вызывается до импорта `materials`
+def prefer_installed_package() -> None:
+    if os.getenv(INSTALLED_ENV, "").lower() in ("1", "true"):
+        sys.path[:] = [path for path in sys.path if os.path.abspath(path or os.curdir) != ROOT_DIR]
+
+
+# Функция для вычисления перцентиля упорядоченной последовательности (q от 0 до 100)
+def percentile(values: Sequence[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+# Функция для измерения задержек последовательных вызовов: `repeat` вызовов, но не дольше `time_limit` секунд
+# (не меньше `MIN_REPEAT` вызовов)
+def measure(function: Callable[[], object], repeat: int = 200, time_limit: Optional[float] = 2.0) -> List[float]:
+    latencies = []
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        finish = time.perf_counter()
+        latencies.append(finish - start)
+        if deadline is not None and finish > deadline and len(latencies) >= MIN_REPEAT:
+            break
+    return latencies
+
+
+# Функция для получения сводки замера. Если общее время `elapsed` не задано, оно равно сумме задержек
+def summarize(name: str, mode: str, latencies: Sequence[float], threads: int = 1,
+              elapsed: Optional[float] = None) -> Timing:
+    values = sorted(latencies)
+    elapsed = sum(values) if elapsed is None else elapsed
+    return Timing(name, mode, threads, len(values), percentile(values, 50), percentile(values, 90),
+                  percentile(values, 99), values[-1] if values else float("nan"),
+                  len(values) / elapsed if elapsed else float("nan"))
+
+
+# Функция для замера вызовов из `threads` потоков одновременно: каждый поток выполняет до `repeat` вызовов.
+# Пропускная способность - общее число вызовов, деленное на время от общего старта до завершения последнего потока
+def run_threads(function: Callable[[], object], threads: int, repeat: int = 50,
+                time_limit: Optional[float] = 2.0, name: str = "", mode: str = "threads") -> Timing:
+    barrier = threading.Barrier(threads + 1)
+    results: List[List[float]] = [[] for _ in range(threads)]
+    errors: List[BaseException] = []
+
+    def worker(latencies: List[float]) -> None:
+        barrier.wait()
+        try:
+            latencies.extend(measure(function, repeat, time_limit))
+        except BaseException as error:
+            errors.append(error)
+
+    workers = [threading.Thread(target=worker, args=(latencies,)) for latencies in results]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return summarize(name, mode, [latency for latencies in results for latency in latencies], threads, elapsed)
+
+
+# Функция для замера холодного старта вызова `name` набора `module` в отдельном процессе с базой данных `database`.
+# Возвращает списки времени импорта и времени первого вызова
+def measure_cold(module: str, name: str, database: Optional[str] = None,
+                 repeat: int = 3) -> Dict[str, List[float]]:
+    environ = dict(os.environ)
+    if database is not None:
+        environ["MATERIALS_DATABASE_PATH"] = database
+    environ["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT_DIR, environ.get("PYTHONPATH")]))
+    imports, calls = [], []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _COLD_PROBE, module, name], env=environ, cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True).stdout
+        imported, called = json.loads(output.strip().splitlines()[-1])
+        imports.append(imported)
+        calls.append(called)
+    return {"import": imports, "call": calls}
+
+
+# Функция для форматирования результатов в таблицу (задержки в миллисекундах)
+def format_timings(timings: Sequence[Timing]) -> str:
+    header = f"{'замер':<52} {'режим':<8} {'потоки':>6} {'вызовы':>7} {'p50, мс':>9} {'p90, мс':>9} {'p99, мс':>9} " \
+             f"{'max, мс':>9} {'выз/с':>9}"
+    lines = [header, "-" * len(header)]
+    for timing in timings:
+        lines.append(f"{timing.name[:52]:<52} {timing.mode:<8} {timing.threads:>6} {timing.calls:>7} "
+                     f"{timing.p50 * 1000:>9.3f} {timing.p90 * 1000:>9.3f} {timing.p99 * 1000:>9.3f} "
+                     f"{timing.max * 1000:>9.3f} {timing.throughput:>9.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль содержит набор замеров функций `crud`.
+
+Одиночные вызовы - все функции `crud` с аргументами проверки планов запросов (`checks._crud_calls`), поэтому новая
+функция `crud` попадает в замеры вместе с проверкой ее плана. Пакетные вызовы - пакетные функции для `BATCH_SIZE`
+брендов и, для сравнения, одиночные функции, вызванные в цикле для тех же брендов.
+
+Основные компоненты:
+- `BATCH_SIZE`: Количество брендов пакетного вызова.
+- `sample_brands(size, seed)`: Воспроизводимая выборка брендов.
+- `single_calls(brand)`: Одиночные вызовы всех функций `crud`.
+- `batch_calls(brands)`: Пакетные вызовы и циклы одиночных вызовов.
+"""
+import random
+from typing import Callable, Dict, List, Sequence
+
+from materials import crud
+from materials.checks import _crud_calls
+
+# Количество брендов пакетного вызова
+BATCH_SIZE = 100
+
+# Бренд одиночных вызовов
+BRAND = "30ХМА"
+
+# Пакетные функции и одиночные функции, которые они заменяют
+_BULK_FUNCTIONS = {
+    "get_materials_by_brands": "get_material_by_brand",
+    "get_hardness_by_brands": "get_hardness_by_brand",
+    "get_chemical_composition_by_brands": "get_chemical_composition_by_brand",
+    "get_technological_properties_by_brands": "get_technological_properties_by_brand",
+    "get_mechanical_properties_by_brands": "get_mechanical_properties_by_brand",
+    "get_characteristics_by_brands": "get_characteristics_by_brand",
+    "get_standards": "get_standard_of_chemical_composition_by_brand",
+    "get_material_profiles": "get_material_profile",
+}
+
+
+# Функция для получения воспроизводимой выборки брендов
+def sample_brands(size: int = BATCH_SIZE, seed: int = 0) -> List[str]:
+    brands = sorted(crud.get_all_brands())
+    return random.Random(seed).sample(brands, min(size, len(brands)))
+
+
+# Функция для получения одиночных вызовов всех функций crud
+def single_calls(brand: str = BRAND) -> Dict[str, Callable[[], object]]:
+    return {name: (lambda call=call: call(None)) for name, call in _crud_calls(brand)}
+
+
+# Функция для получения пакетных вызовов для списка брендов и циклов одиночных вызовов для тех же брендов
+def batch_calls(brands: Sequence[str]) -> Dict[str, Callable[[], object]]:
+    brands = list(brands)
+    calls: Dict[str, Callable[[], object]] = {}
+    for bulk_name, single_name in _BULK_FUNCTIONS.items():
+        bulk, single = getattr(crud, bulk_name), getattr(crud, single_name)
+        calls[f"{bulk_name}[{len(brands)}]"] = lambda bulk=bulk: bulk(brands)
+        calls[f"{single_name} x{len(brands)}"] = lambda single=single: [single(brand) for brand in brands]
+    calls[f"get_materials_bulk[{len(brands)}]"] = lambda: crud.get_materials_bulk(brands)
+    return calls
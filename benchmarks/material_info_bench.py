@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль содержит набор замеров способов получения полной информации о материале - того, что выводит
+`example.print_material_info`:
+
+- `print_material_info`: сама функция примера (вывод направляется в `os.devnull`);
+- `six_calls`: прежний вариант примера - шесть вызовов `crud` (материал, химический состав, механические и
+  технологические свойства, твердость, стандарт);
+- `cached_six_calls`: те же шесть вызовов через кэш `cache.crud_cache`;
+- `profile`: `crud.get_material_profile` - запрос материала и по запросу на таблицу свойств (`selectinload`);
+- `aio_profile`: `aio.get_material_profile` (если установлен `aiosqlite`); каждый поток использует свой цикл событий;
+- `snapshot_profile`: профиль из снимка базы данных в памяти (`snapshot`);
+- `compiled_profile`: профиль из скомпилированного каталога (`compiled`).
+
+При холодном старте в замер первого вызова входит построение снимка, кэша или открытие скомпилированного каталога.
+
+Основные компоненты:
+- `single_calls(brand)`: Получение информации об одном материале каждым способом.
+- `batch_calls(brands)`: Получение информации о списке материалов каждым способом.
+"""
+import asyncio
+import contextlib
+import functools
+import io
+import os
+import threading
+from typing import Callable, Dict, Optional, Sequence
+
+from materials import crud
+from materials.cache import crud_cache
+from materials.compiled import get_compiled_catalogue
+from materials.snapshot import get_snapshot
+
+from benchmarks.crud_bench import BRAND
+
+_loops = threading.local()
+_example = None
+_devnull = open(os.devnull, "w", encoding="utf-8")
+
+
+# Функция для вывода информации о материале функцией примера. Модуль примера выводит информацию при импорте, поэтому
+# импортируется с перенаправлением вывода; сама функция выводит в `os.devnull` (перенаправление `sys.stdout` не
+# потокобезопасно)
+def _print_material_info(brand: str) -> None:
+    global _example
+    if _example is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            from materials import example
+        example.print = functools.partial(print, file=_devnull)
+        _example = example
+    _example.print_material_info(brand)
+
+
+# Функция для получения информации о материале шестью вызовами crud (прежний вариант примера)
+def _six_calls(brand: str, source=crud) -> Optional[tuple]:
+    material = source.get_material_by_brand(brand)
+    if not material:
+        return None
+    return (material, source.get_chemical_composition_by_brand(brand),
+            source.get_mechanical_properties_by_brand(brand), source.get_technological_properties_by_brand(brand),
+            source.get_hardness_by_brand(brand), source.get_standard_of_chemical_composition_by_brand(brand))
+
+
+# Функция для получения профиля асинхронной функцией в цикле событий текущего потока
+def _aio_profile(brand: str):
+    from materials import aio
+    loop = getattr(_loops, "loop", None)
+    if loop is None:
+        loop = _loops.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(aio.get_material_profile(brand))
+
+
+# Функция для получения способов получения информации о материале
+def _patterns() -> Dict[str, Callable[[str], object]]:
+    patterns = {
+        "print_material_info": _print_material_info,
+        "six_calls": _six_calls,
+        "cached_six_calls": lambda brand: _six_calls(brand, crud_cache),
+        "profile": crud.get_material_profile,
+        "snapshot_profile": lambda brand: get_snapshot().get_material_profile(brand),
+        "compiled_profile": lambda brand: get_compiled_catalogue().get_material_profile(brand),
+    }
+    try:
+        import aiosqlite  # noqa: F401
+        patterns["aio_profile"] = _aio_profile
+    except ImportError:
+        pass
+    return patterns
+
+
+# Функция для получения информации об одном материале каждым способом
+def single_calls(brand: str = BRAND) -> Dict[str, Callable[[], object]]:
+    return {name: (lambda pattern=pattern: pattern(brand)) for name, pattern in _patterns().items()}
+
+
+# Функция для получения информации о списке материалов каждым способом
+def batch_calls(brands: Sequence[str]) -> Dict[str, Callable[[], object]]:
+    brands = list(brands)
+    return {f"{name} x{len(brands)}": (lambda pattern=pattern: [pattern(brand) for brand in brands])
+            for name, pattern in _patterns().items()}
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль измеряет пропускную способность чтения из нескольких процессов, читающих один файл базы данных (как
+рабочие процессы gunicorn), при разных параметрах подключения (`CONFIGS`, см. `materials.database`):
+
+- `plain`: параметры SQLite по умолчанию (без отображения в память, кэш страниц 2000 КиБ);
+- `tuned`: `mmap_size` и `cache_size` по умолчанию пакета;
+- `wal`: то же и режим журнала WAL;
+- `read_only`: то же и файл только для чтения как неизменяемый (`mode=ro&immutable=1`).
+
+Каждая конфигурация запускается в отдельном процессе Python (параметры читаются из переменных окружения при импорте
+пакета) на копии базы данных во временном каталоге. Процесс создает движок и выполняет первый запрос, затем
+запускает `--processes` дочерних процессов через `fork()` (проверка сброса пула соединений после `fork()`). Каждый
+дочерний процесс в течение `--duration` секунд получает профиль и твердость случайных брендов.
+
+Использование:
+    python -m benchmarks.multiprocess_bench --processes 1,2,4,8 --duration 3
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence
+
+from benchmarks.common import ROOT_DIR, percentile
+
+# Конфигурации: имя -> переменные окружения
+CONFIGS = {
+    "plain": {"MATERIALS_MMAP_SIZE": "0", "MATERIALS_SQLITE_CACHE_SIZE": "2000"},
+    "tuned": {},
+    "wal": {"MATERIALS_JOURNAL_MODE": "WAL"},
+    "read_only": {"MATERIALS_READ_ONLY": "1"},
+}
+
+
+# Функция, выполняемая дочерним процессом: вызовы в течение duration секунд, результат - список задержек
+def _child(brands: List[str], duration: float, seed: int, queue) -> None:
+    from materials import crud
+    rng = random.Random(seed)
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while True:
+        brand = rng.choice(brands)
+        start = time.perf_counter()
+        crud.get_material_profile(brand)
+        crud.get_hardness_by_brand(brand)
+        finish = time.perf_counter()
+        latencies.append(finish - start)
+        if finish > deadline:
+            break
+    queue.put(latencies)
+
+
+# Функция для замера в текущем процессе: processes дочерних процессов после fork(). Возвращает вызовы в секунду и
+# перцентили задержки
+def run_processes(processes: int, duration: float) -> Dict[str, float]:
+    from materials import crud
+    brands = crud.get_all_brands()
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    workers = [context.Process(target=_child, args=(brands, duration, seed, queue)) for seed in range(processes)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    latencies = sorted(latency for _ in workers for latency in queue.get())
+    elapsed = time.perf_counter() - start
+    for worker in workers:
+        worker.join()
+    return {"calls": len(latencies), "throughput": len(latencies) / elapsed,
+            "p50": percentile(latencies, 50), "p99": percentile(latencies, 99)}
+
+
+# Функция для замера конфигурации config в отдельном процессе на копии базы данных database
+def run_config(config: str, database: str, processes: int, duration: float) -> Dict[str, float]:
+    environ = dict(os.environ, MATERIALS_DATABASE_PATH=database, **CONFIGS[config])
+    environ["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT_DIR, environ.get("PYTHONPATH")]))
+    command = [sys.executable, "-m", "benchmarks.multiprocess_bench", "--worker", "--processes", str(processes),
+               "--duration", str(duration)]
+    output = subprocess.run(command, env=environ, cwd=ROOT_DIR, stdout=subprocess.PIPE, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замер чтения из нескольких процессов")
+    parser.add_argument("--config", nargs="+", choices=list(CONFIGS), default=list(CONFIGS), help="конфигурации")
+    parser.add_argument("--processes", default=f"1,2,4,{os.cpu_count()}", help="количество процессов через запятую")
+    parser.add_argument("--duration", type=float, default=3.0, help="длительность замера, секунды")
+    parser.add_argument("--database", help="база данных (по умолчанию поставляемая)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    counts = sorted({int(item) for item in str(args.processes).split(",")})
+
+    if args.worker:
+        print(json.dumps(run_processes(counts[0], args.duration)))
+        return 0
+
+    from materials.database import DATABASE_PATH
+
+    print(f"Процессоров: {os.cpu_count()}, длительность {args.duration} с; вызов - профиль и твердость бренда")
+    print(f"{'конфигурация':<12} {'процессы':>8} {'вызовы':>8} {'выз/с':>9} {'p50, мс':>9} {'p99, мс':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for config in args.config:
+            database = os.path.join(directory, f"{config}.db")
+            shutil.copyfile(args.database or DATABASE_PATH, database)
+            for processes in counts:
+                result = run_config(config, database, processes, args.duration)
+                print(f"{config:<12} {processes:>8} {result['calls']:>8} {result['throughput']:>9.1f} "
+                      f"{result['p50'] * 1000:>9.3f} {result['p99'] * 1000:>9.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
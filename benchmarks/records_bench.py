@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль сравнивает память и время загрузки объектов ORM и записей только для чтения (`materials.records`), которые
+возвращают функции `crud`:
+
+- `orm`: объекты моделей из запроса ORM (`db.query(model).all()`), отсоединенные от сессии;
+- `dense`: плотные записи с `__slots__` на каждый столбец, построенные из строк запроса Core (прежний вид
+  `ChemicalCompositionRecord`, для остальных таблиц совпадает с `record`);
+- `record`: записи `RECORD_CLASSES` из строк запроса Core; химический состав - разреженная запись
+  (`SparseRecord`), хранящая только заполненные элементы.
+
+Для каждой таблицы свойств загружаются все строки; память - прирост памяти, удерживаемой загруженным списком
+(`tracemalloc`), время - медиана нескольких загрузок без `tracemalloc`. Отдельно измеряется задержка одиночного вызова
+`crud.get_chemical_composition_by_brand` и того же запроса через ORM.
+
+Использование:
+    python -m benchmarks.records_bench
+    MATERIALS_DATABASE_PATH=benchmarks/data/materials_x100.db python -m benchmarks.records_bench --repeat 3
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from materials import crud
+from materials.database import session_scope
+from materials.models import Material, ChemicalComposition
+from materials.records import RECORD_CLASSES, _record_class
+
+from benchmarks.common import measure, percentile
+from benchmarks.crud_bench import BRAND
+
+# Таблицы сравнения: имя -> модель
+TABLES = dict(materials=Material, **crud.BULK_TABLES)
+
+# Плотная запись химического состава (по атрибуту `__slots__` на каждый столбец) для сравнения с разреженной
+_DenseChemicalCompositionRecord = _record_class("ChemicalCompositionRecord", ChemicalComposition)
+
+
+# Функция для получения способов загрузки таблицы модели: имя способа -> функция (сессия -> список)
+def _loaders(model) -> Dict[str, Callable[[Session], list]]:
+    def orm(db: Session) -> list:
+        objects = db.query(model).all()
+        db.expunge_all()
+        return objects
+
+    def records(record_class) -> Callable[[Session], list]:
+        return lambda db: [record_class(*row) for row in db.execute(select(model.__table__))]
+
+    loaders = {"orm": orm, "record": records(RECORD_CLASSES[model])}
+    if model is ChemicalComposition:
+        loaders["dense"] = records(_DenseChemicalCompositionRecord)
+    return loaders
+
+
+# Функция для замера памяти, удерживаемой результатом загрузки (байты)
+def _retained_memory(load: Callable[[Session], list]) -> int:
+    with session_scope() as db:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            result = load(db)
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+    del result
+    return retained
+
+
+# Функция для замера медианного времени загрузки (секунды)
+def _load_time(load: Callable[[Session], list], repeat: int) -> float:
+    latencies = []
+    for _ in range(repeat):
+        with session_scope() as db:
+            start = time.perf_counter()
+            load(db)
+            latencies.append(time.perf_counter() - start)
+    return percentile(latencies, 50)
+
+
+# Функция для сравнения способов загрузки всех таблиц: строки (таблица, способ, строк, байт, байт на строку, секунды)
+def compare_tables(repeat: int = 5, tables: Optional[Sequence[str]] = None) -> List[tuple]:
+    results = []
+    for name in tables or TABLES:
+        model = TABLES[name]
+        with session_scope() as db:
+            rows = db.query(model).count()
+        for loader, load in _loaders(model).items():
+            memory = _retained_memory(load)
+            results.append((name, loader, rows, memory, memory / rows if rows else 0.0, _load_time(load, repeat)))
+    return results
+
+
+# Функция для сравнения задержки одиночного получения химического состава: запись из строки Core и объект ORM
+def compare_single_call(brand: str = BRAND, repeat: int = 500) -> Dict[str, float]:
+    def orm() -> object:
+        with session_scope() as db:
+            material = db.query(Material).filter(Material.brand == brand).first()
+            return db.query(ChemicalComposition).filter(ChemicalComposition.material_id == material.id).first()
+
+    calls = {"orm": orm, "record": lambda: crud.get_chemical_composition_by_brand(brand)}
+    return {name: percentile(measure(call, repeat, time_limit=None), 50) for name, call in calls.items()}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Сравнение памяти и времени загрузки объектов ORM и записей")
+    parser.add_argument("--table", nargs="+", choices=list(TABLES), help="таблицы (по умолчанию все)")
+    parser.add_argument("--repeat", type=int, default=5, help="количество загрузок таблицы для замера времени")
+    args = parser.parse_args(argv)
+
+    print(f"{'таблица':<26} {'способ':<7} {'строк':>8} {'память, МиБ':>12} {'байт/строка':>12} {'время, мс':>10}")
+    for name, loader, rows, memory, per_row, seconds in compare_tables(args.repeat, args.table):
+        print(f"{name:<26} {loader:<7} {rows:>8} {memory / 2 ** 20:>12.2f} {per_row:>12.0f} {seconds * 1000:>10.1f}")
+
+    single = compare_single_call()
+    print(f"\nget_chemical_composition_by_brand('{BRAND}'), медиана: "
+          + ", ".join(f"{name} {seconds * 1000:.3f} мс" for name, seconds in single.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль запускает замеры производительности на поставляемой базе данных и на синтетическом каталоге, в `--scale`
+раз большем (см. `benchmarks.synthetic`), и выводит таблицы результатов.
+
+Для каждой базы данных замеры выполняются в отдельном процессе (путь к базе данных передается переменной окружения
+`MATERIALS_DATABASE_PATH`). Для каждого набора (`SUITES`) измеряются:
+- `cold`: импорт пакета и первый вызов в новом процессе (`--cold-repeat` процессов на вызов; 0 - не измерять);
+- `warm`: последовательные одиночные вызовы после прогревающего вызова;
+- `batch`: пакетные вызовы для `--batch-size` брендов (и одиночные вызовы в цикле для тех же брендов);
+- `threads`: одиночные вызовы из 1 ... N потоков одновременно (`--threads`), пропускная способность - вызовов в
+  секунду во всех потоках.
+
+Каждый замер ограничен `--repeat` вызовами и `--time-limit` секундами. Результаты можно сохранить (`--output`) и
+сравнить с сохраненными ранее (`--baseline`): замеры, медиана которых выросла более чем в `--tolerance` раз, выводятся
+как регрессии, и код возврата равен 1. Чтобы замерить установленное колесо из `dist/`, а не пакет из репозитория,
+установите его в окружение и укажите `--installed`.
+
+Использование:
+    python -m benchmarks.run                                   # поставляемая база данных и каталог x100
+    python -m benchmarks.run --scale 0 --suite material_info   # только поставляемая база данных
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --installed --baseline before.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence
+
+from benchmarks.common import (INSTALLED_ENV, MIN_REPEAT, ROOT_DIR, Timing, format_timings, measure,
+                               measure_cold, prefer_installed_package, run_threads, summarize)
+
+# Наборы замеров: имя -> модуль
+SUITES = {
+    "crud": "benchmarks.crud_bench",
+    "material_info": "benchmarks.material_info_bench",
+}
+
+
+# Функция для выполнения замеров набора `suite` в текущем процессе
+def run_suite(suite: str, args: argparse.Namespace) -> List[Timing]:
+    module = importlib.import_module(SUITES[suite])
+    timings = []
+
+    if args.cold_repeat:
+        imports = []
+        for name in module.single_calls():
+            cold = measure_cold(SUITES[suite], name, args.database, args.cold_repeat)
+            imports += cold["import"]
+            timings.append(summarize(name, "cold", cold["call"]))
+        timings.insert(0, summarize(f"import {SUITES[suite]}", "cold", imports))
+
+    single = module.single_calls()
+    for name, call in single.items():
+        call()
+        timings.append(summarize(name, "warm", measure(call, args.repeat, args.time_limit)))
+
+    from benchmarks.crud_bench import sample_brands
+    for name, call in module.batch_calls(sample_brands(args.batch_size)).items():
+        call()
+        timings.append(summarize(name, "batch", measure(call, max(args.repeat // 20, MIN_REPEAT), args.time_limit)))
+
+    for threads in args.threads:
+        for name, call in single.items():
+            timings.append(run_threads(call, threads, max(args.repeat // threads, MIN_REPEAT), args.time_limit,
+                                       name=name))
+    return timings
+
+
+# Функция для выполнения замеров в текущем процессе (база данных задана переменной окружения)
+def run_worker(args: argparse.Namespace) -> Dict[str, object]:
+    prefer_installed_package()
+    import materials
+    from materials import database
+
+    results = []
+    for suite in args.suite:
+        for timing in run_suite(suite, args):
+            results.append(dict(timing._asdict(), suite=suite))
+    return {"package": os.path.dirname(materials.__file__), "database": database.DATABASE_PATH,
+            "size": os.path.getsize(database.DATABASE_PATH), "results": results}
+
+
+# Функция для запуска замеров для базы данных `database` в отдельном процессе
+def run_database(database: str, args: argparse.Namespace) -> Dict[str, object]:
+    environ = dict(os.environ, MATERIALS_DATABASE_PATH=database)
+    environ["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT_DIR, environ.get("PYTHONPATH")]))
+    if args.installed:
+        environ[INSTALLED_ENV] = "1"
+    command = [sys.executable, "-m", "benchmarks.run", "--worker", "--database", database, "--suite", *args.suite,
+               "--threads", ",".join(map(str, args.threads)), "--repeat", str(args.repeat),
+               "--time-limit", str(args.time_limit), "--batch-size", str(args.batch_size),
+               "--cold-repeat", str(args.cold_repeat)]
+    output = subprocess.run(command, env=environ, cwd=ROOT_DIR, stdout=subprocess.PIPE, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# Функция для сравнения медиан с сохраненными результатами. Возвращает строки с замерами, медиана которых выросла
+# более чем в `tolerance` раз
+def compare(report: Dict[str, Dict[str, object]], baseline: Dict[str, Dict[str, object]],
+            tolerance: float) -> List[str]:
+    regressions = []
+    for label, result in report.items():
+        before = {(item["suite"], item["name"], item["mode"], item["threads"]): item
+                  for item in baseline.get(label, {}).get("results", [])}
+        for item in result["results"]:
+            previous = before.get((item["suite"], item["name"], item["mode"], item["threads"]))
+            if previous and previous["p50"] and item["p50"] > previous["p50"] * tolerance:
+                regressions.append(f"{label}: {item['name']} ({item['mode']}, потоков {item['threads']}): "
+                                   f"p50 {previous['p50'] * 1000:.3f} -> {item['p50'] * 1000:.3f} мс")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры производительности пакета materials")
+    parser.add_argument("--suite", nargs="+", choices=list(SUITES), default=list(SUITES), help="наборы замеров")
+    parser.add_argument("--database", help="база данных (по умолчанию поставляемая)")
+    parser.add_argument("--scale", type=int, default=100, help="кратность синтетического каталога (0 - без него)")
+    parser.add_argument("--threads", type=lambda value: [int(item) for item in value.split(",")], default=[1, 2, 4, 8],
+                        help="количество потоков через запятую")
+    parser.add_argument("--repeat", type=int, default=200, help="наибольшее количество вызовов замера")
+    parser.add_argument("--time-limit", type=float, default=2.0, help="наибольшая длительность замера, секунды")
+    parser.add_argument("--batch-size", type=int, default=100, help="количество брендов пакетного вызова")
+    parser.add_argument("--cold-repeat", type=int, default=3, help="количество процессов холодного старта на вызов")
+    parser.add_argument("--installed", action="store_true", help="замерять установленный пакет materials")
+    parser.add_argument("--output", help="файл для сохранения результатов (JSON)")
+    parser.add_argument("--baseline", help="файл с результатами для сравнения (JSON)")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="допустимый рост медианы при сравнении")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return 0
+
+    from benchmarks.synthetic import generate_catalogue
+    from materials.database import DATABASE_PATH
+
+    databases = {"bundled": args.database or DATABASE_PATH}
+    if args.scale > 1:
+        databases[f"x{args.scale}"] = generate_catalogue(scale=args.scale, source=databases["bundled"])
+    report = {}
+    for label, database in databases.items():
+        result = run_database(database, args)
+        report[label] = result
+        print(f"\n{label}: {result['database']} ({result['size'] / 2 ** 20:.1f} МБ), пакет {result['package']}, "
+              f"Python {platform.python_version()}, процессоров {os.cpu_count()}")
+        print(format_timings([Timing(**{field: item[field] for field in Timing._fields})
+                              for item in result["results"]]))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=1)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        print("\nРегрессии:" if regressions else "\nРегрессий нет.")
+        for line in regressions:
+            print(line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль создает синтетический каталог - копию поставляемой базы данных, в которой каждая таблица моделей пакета
+повторена `scale` раз. Копия `k` (k = 1 ... scale - 1) получает идентификаторы, сдвинутые на `k * max(id)` таблицы
+(внешние ключи сдвигаются на `k * max(id)` таблицы, на которую они ссылаются), а бренды и наименования материалов
+стандартов - суффикс `~k` ('30ХМА' -> '30ХМА~1'). Исходные записи сохраняются без изменений, поэтому замеры с
+брендами поставляемой базы данных работают и на синтетическом каталоге.
+
+Полнотекстовый индекс характеристик обновляется триггерами при вставке, после вставки выполняется `ANALYZE`.
+
+Основные компоненты:
+- `SCALE`: Кратность синтетического каталога по умолчанию.
+- `DATA_DIR`: Каталог для синтетических баз данных (не хранится в репозитории).
+- `generate_catalogue(path, scale, source, force)`: Создает синтетический каталог, если он еще не создан.
+
+Использование:
+    python -m benchmarks.synthetic --scale 100
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import time
+from typing import Optional, Sequence
+
+from materials.database import DATABASE_PATH
+from materials.models import Base
+
+# Кратность синтетического каталога по умолчанию
+SCALE = 100
+
+# Каталог для синтетических баз данных
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Столбцы, значения которых должны оставаться уникальными в каждой копии
+_SUFFIXED_COLUMNS = {("materials", "brand"), ("standards", "material_name")}
+
+
+# Функция для получения пути синтетического каталога кратности scale
+def catalogue_path(scale: int = SCALE) -> str:
+    return os.path.join(DATA_DIR, f"materials_x{scale}.db")
+
+
+# Функция для построения выражения столбца копии `copy.k`
+def _column_expression(table, column, offsets) -> str:
+    name = f'"{column.name}"'
+    if column.primary_key:
+        return f"{name} + copy.k * {offsets[table.name]}"
+    for foreign_key in column.foreign_keys:
+        return f"{name} + copy.k * {offsets[foreign_key.column.table.name]}"
+    if (table.name, column.name) in _SUFFIXED_COLUMNS:
+        return f"{name} || '~' || copy.k"
+    return name
+
+
+# Функция для создания синтетического каталога: копия базы данных `source`, в которой записи каждой таблицы повторены
+# `scale` раз. Существующий каталог пересоздается, только если `force` или он старше `source`
+def generate_catalogue(path: Optional[str] = None, scale: int = SCALE, source: str = DATABASE_PATH,
+                       force: bool = False) -> str:
+    path = path or catalogue_path(scale)
+    if not force and os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source):
+        return path
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = path + ".tmp"
+    shutil.copyfile(source, temporary)
+    connection = sqlite3.connect(temporary)
+    try:
+        tables = list(Base.metadata.sorted_tables)
+        offsets = {table.name: connection.execute(f"SELECT coalesce(max(id), 0) FROM {table.name}").fetchone()[0]
+                   for table in tables}
+        with connection:
+            for table in tables:
+                columns = ", ".join(f'"{column.name}"' for column in table.columns)
+                expressions = ", ".join(_column_expression(table, column, offsets) for column in table.columns)
+                connection.execute(
+                    f"WITH RECURSIVE copy(k) AS (SELECT 1 UNION ALL SELECT k + 1 FROM copy WHERE k < ?) "
+                    f"INSERT INTO {table.name} ({columns}) SELECT {expressions} FROM {table.name}, copy "
+                    f"WHERE {table.name}.id <= ?", (scale - 1, offsets[table.name]))
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    os.replace(temporary, path)
+    return path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Создание синтетического каталога материалов")
+    parser.add_argument("--scale", type=int, default=SCALE, help="кратность каталога")
+    parser.add_argument("--path", help="путь к создаваемой базе данных")
+    parser.add_argument("--force", action="store_true", help="пересоздать существующий каталог")
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    path = generate_catalogue(args.path, args.scale, force=args.force)
+    print(f"{path}: {os.path.getsize(path) / 2 ** 20:.1f} МБ, {time.perf_counter() - start:.1f} с")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,11 +10,21 @@
 
 Основные компоненты:
 - Модели: Base, Material, MaterialIndices, Hardness, ChemicalComposition, TechnologicalProperties,
-MechanicalProperties, CharacteristicsOfMaterial.
+MechanicalProperties, CharacteristicsOfMaterial, Standard, ChemicalElementRange, MechanicalPropertyValue,
+HardnessValue, ForeignAnalog.
 - Функции CRUD: get_material_by_brand, get_hardness_by_brand, get_chemical_composition_by_brand,
 get_technological_properties_by_brand, get_mechanical_properties_by_brand,
-get_characteristics_by_brand, query_data_example.
-- Подключение к базе данных: SessionLocal, engine.
+get_characteristics_by_brand, get_chemical_element_ranges_by_brand, find_by_mechanical_property, find_by_hardness,
+find_by_foreign_analog, get_foreign_analogs_by_brand, search_characteristics, get_brands_by_standard,
+query_data_example.
+- Пакетные функции CRUD: get_materials_by_brands, get_hardness_by_brands, get_chemical_composition_by_brands,
+get_technological_properties_by_brands, get_mechanical_properties_by_brands, get_characteristics_by_brands,
+get_materials_bulk, get_standards.
+- Профиль материала: get_material_profile, get_material_profiles, MaterialProfile.
+- Потоковое чтение таблиц: iter_rows, iter_materials, iter_chemical_compositions, iter_mechanical_properties,
+iter_brands.
+- Подключение к базе данных: SessionLocal, engine, get_engine, session_scope. Импорт пакета не подключается к базе
+данных: движок создается при первом запросе.
 
 Пример использования:
     from materials import SessionLocal, Material, get_material_by_brand
@@ -25,9 +35,7 @@ get_characteristics_by_brand, query_data_example.
     material = get_material_by_brand("SteelX", db)
     print(material)
 """
-import os
-
-from .database import SessionLocal, engine
+from .database import SessionLocal, get_engine, session_scope
 from .models import (
     Base,
     Material,
@@ -36,7 +44,12 @@ from .models import (
     ChemicalComposition,
     TechnologicalProperties,
     MechanicalProperties,
-    CharacteristicsOfMaterial
+    CharacteristicsOfMaterial,
+    Standard,
+    ChemicalElementRange,
+    MechanicalPropertyValue,
+    HardnessValue,
+    ForeignAnalog,
 )
 from .crud import (
     get_material_by_brand,
@@ -46,13 +59,42 @@ from .crud import (
     get_technological_properties_by_brand,
     get_mechanical_properties_by_brand,
     get_characteristics_by_brand,
+    get_chemical_element_ranges_by_brand,
+    find_by_mechanical_property,
+    find_by_hardness,
+    find_by_foreign_analog,
+    get_foreign_analogs_by_brand,
+    search_characteristics,
     get_all_brands,
     get_brands_by_material_class_index,
     get_standard_of_chemical_composition_by_brand,
+    get_brands_by_standard,
+    get_standards,
+    BulkResult,
+    get_materials_by_brands,
+    get_hardness_by_brands,
+    get_chemical_composition_by_brands,
+    get_technological_properties_by_brands,
+    get_mechanical_properties_by_brands,
+    get_characteristics_by_brands,
+    get_materials_bulk,
+    get_material_profile,
+    get_material_profiles,
+    iter_rows,
+    iter_materials,
+    iter_chemical_compositions,
+    iter_mechanical_properties,
+    iter_brands,
 )
+from .records import MaterialProfile
+
+
+# Движок базы данных создается при первом обращении к `materials.engine` (см. `database.get_engine`)
+def __getattr__(name: str):
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Настройка логирования пакета
-os.environ["SQLALCHEMY_ECHO"] = "False"
 
 # Экспортируем все функции, чтобы они были доступны через `import materials`
 __all__ = [
@@ -63,7 +105,31 @@ __all__ = [
     "get_technological_properties_by_brand",
     "get_mechanical_properties_by_brand",
     "get_characteristics_by_brand",
+    "get_chemical_element_ranges_by_brand",
+    "find_by_mechanical_property",
+    "find_by_hardness",
+    "find_by_foreign_analog",
+    "get_foreign_analogs_by_brand",
+    "search_characteristics",
     "get_all_brands",
     "get_brands_by_material_class_index",
     "get_standard_of_chemical_composition_by_brand",
+    "get_brands_by_standard",
+    "get_standards",
+    "BulkResult",
+    "get_materials_by_brands",
+    "get_hardness_by_brands",
+    "get_chemical_composition_by_brands",
+    "get_technological_properties_by_brands",
+    "get_mechanical_properties_by_brands",
+    "get_characteristics_by_brands",
+    "get_materials_bulk",
+    "get_material_profile",
+    "get_material_profiles",
+    "iter_rows",
+    "iter_materials",
+    "iter_chemical_compositions",
+    "iter_mechanical_properties",
+    "iter_brands",
+    "MaterialProfile",
 ]
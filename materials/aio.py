@@ -0,0 +1,411 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль содержит асинхронные версии функций модуля `crud` для приложений на asyncio. Запросы выполняются через
+`AsyncSession` SQLAlchemy и асинхронный драйвер SQLite `aiosqlite`, поэтому не блокируют цикл событий.
+
+Функции повторяют функции `crud` (с теми же аргументами, параметр `db` принимает `AsyncSession`) и объявлены как
+`async def`. В отличие от функций `crud`, они не печатают сообщения о ненайденных материалах, а просто возвращают
+`None`, и получают запись таблицы свойств одним запросом с соединением с таблицей `materials`.
+
+Основные компоненты:
+- `get_async_engine()`: Возвращает асинхронный движок, создавая его при первом вызове.
+- `async_session_scope(db)`: Асинхронный контекстный менеджер, выдающий сессию на время одного вызова.
+- `dispose_async_engine()`: Закрывает соединения асинхронного движка (например, при остановке приложения).
+- `gather_by_brands(function, brands, concurrency)`: Выполняет функцию для списка брендов конкурентно и возвращает
+  `BulkResult`.
+- Функции `get_material_by_brand`, `get_hardness_by_brand`, `get_chemical_composition_by_brand`, `get_all_brands`,
+  `get_brands_by_material_class_index`, пакетные функции `get_*_by_brands`, `get_materials_bulk`, профили материалов
+  `get_material_profile` и `get_material_profiles` и остальные функции `crud`.
+- Асинхронные генераторы `iter_rows` и `iter_materials` для потокового чтения таблиц (`async for`).
+
+Каждый вызов без явно переданной сессии открывает собственную `AsyncSession`, поэтому конкурентные вызовы
+(`asyncio.gather`) выполняются в разных соединениях пула. Количество одновременно открытых соединений ограничено
+параметрами `MATERIALS_POOL_SIZE` и `MATERIALS_MAX_OVERFLOW` (см. `materials.database`).
+
+Модулю требуется пакет `aiosqlite` (`pip install materials[aio]`).
+
+Использование:
+    import asyncio
+    from materials import aio
+
+    async def main():
+        composition = await aio.get_chemical_composition_by_brand("30ХМА")
+        compositions = await aio.gather_by_brands(aio.get_chemical_composition_by_brand, ["30ХМА", "Л63"])
+        await aio.dispose_async_engine()
+
+    asyncio.run(main())
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from materials.crud import BULK_TABLES, ITER_BATCH_SIZE, BulkResult, _add_standards_by_name, _brand_records, \
+    _brands_by_standard_statement, _build_profiles, _characteristics_search_statement, _chunks, _first_by_brand, \
+    _first_record_statement, _foreign_analog_statement, _get_related_statement, _hardness_statements, _iter_statement, \
+    _mechanical_property_statement, _profile_statement, _records_statement, _resolve_standards, \
+    _standards_by_name_statement, _standards_statement, _to_record, _unique
+from materials.database import ECHO, MAX_OVERFLOW, POOL_SIZE, POOL_TIMEOUT, READ_ONLY, MaterialsSession, \
+    configure_sqlite_engine, sqlite_url
+from materials.models import Base, Material, MaterialIndices, Hardness, ChemicalComposition, \
+    TechnologicalProperties, MechanicalProperties, CharacteristicsOfMaterial, ChemicalElementRange, \
+    MechanicalPropertyValue, HardnessValue, ForeignAnalog
+from materials.records import RECORD_CLASSES, ChemicalCompositionRecord, CharacteristicsRecord, \
+    ForeignAnalogRecord, HardnessRecord, HardnessValueRecord, MaterialIndicesRecord, MaterialProfile, MaterialRecord, \
+    MechanicalPropertiesRecord, MechanicalPropertyValueRecord, TechnologicalPropertiesRecord
+
+ASYNC_DATABASE_URL = sqlite_url(driver="sqlite+aiosqlite")
+
+# Количество одновременно выполняемых запросов в `gather_by_brands` по умолчанию
+GATHER_CONCURRENCY = POOL_SIZE + MAX_OVERFLOW
+
+_async_engine: Optional[AsyncEngine] = None
+_schema_ready = False
+# Блокировка создания таблиц: одновременные первые сессии ждут, пока одна из них выполнит create_all. Создается при
+# первой сессии (в Python 3.8-3.9 блокировка привязывается к циклу событий при создании) и сбрасывается вместе с движком
+_schema_lock: Optional[asyncio.Lock] = None
+AsyncSessionLocal = async_sessionmaker(sync_session_class=MaterialsSession, autocommit=False, autoflush=False,
+                                       expire_on_commit=False)
+
+
+# Функция для получения асинхронного движка базы данных (создается при первом вызове)
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        try:
+            import aiosqlite  # noqa: F401
+        except ImportError as error:
+            raise ImportError("Для materials.aio требуется пакет aiosqlite: pip install aiosqlite") from error
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            echo=ECHO,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+        )
+        configure_sqlite_engine(_async_engine.sync_engine)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+# Функция для закрытия соединений асинхронного движка; следующий запрос создаст движок заново
+async def dispose_async_engine() -> None:
+    global _async_engine, _schema_ready, _schema_lock
+    if _async_engine is not None:
+        engine, _async_engine, _schema_ready, _schema_lock = _async_engine, None, False, None
+        await engine.dispose()
+
+
+@asynccontextmanager
+async def async_session_scope(db: Optional[AsyncSession] = None) -> AsyncIterator[AsyncSession]:
+    """Выдает сессию на время вызова: переданную явно или новую сессию, которая закрывается при выходе из блока."""
+    global _schema_ready, _schema_lock
+    if db is not None:
+        yield db
+        return
+    engine = get_async_engine()
+    if not _schema_ready and not READ_ONLY:
+        if _schema_lock is None:
+            _schema_lock = asyncio.Lock()
+        async with _schema_lock:
+            if not _schema_ready:
+                async with engine.begin() as connection:
+                    await connection.run_sync(Base.metadata.create_all)
+                _schema_ready = True
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+# Функция для получения первой (по id) записи таблицы модели со значением столбца `column` (см. `crud._first_record`)
+async def _first_record(model, db: AsyncSession, column, value):
+    connection = await db.connection()
+    result = await connection.execute(_first_record_statement(model, column), {"value": value})
+    return _to_record(model, result.first())
+
+
+# Функция для получения первой записи таблицы свойств по бренду одним запросом
+async def _get_related_by_brand(model, brand: str, db: Optional[AsyncSession]):
+    statement = _records_statement(model, Material.brand == brand) \
+        .join(Material, Material.id == model.material_id).limit(1)
+    async with async_session_scope(db) as db:
+        return _to_record(model, (await db.execute(statement)).first())
+
+
+# Функция для проверки существования материала по бренду
+async def get_material_by_brand(brand: str, db: Optional[AsyncSession] = None) -> Optional[MaterialRecord]:
+    async with async_session_scope(db) as db:
+        return await _first_record(Material, db, Material.brand, brand)
+
+
+# Функция для получения индекса класса материала по идентификатору
+async def get_material_class_index_by_id(index_id: int,
+                                         db: Optional[AsyncSession] = None) -> Optional[MaterialIndicesRecord]:
+    async with async_session_scope(db) as db:
+        return await _first_record(MaterialIndices, db, MaterialIndices.id, index_id)
+
+
+# Функция для запроса данных из таблицы Hardness
+async def get_hardness_by_brand(brand: str, db: Optional[AsyncSession] = None) -> Optional[HardnessRecord]:
+    return await _get_related_by_brand(Hardness, brand, db)
+
+
+# Функция для запроса данных из таблицы ChemicalComposition
+async def get_chemical_composition_by_brand(brand: str,
+                                            db: Optional[AsyncSession] = None) -> Optional[ChemicalCompositionRecord]:
+    return await _get_related_by_brand(ChemicalComposition, brand, db)
+
+
+# Функция для запроса данных из таблицы TechnologicalProperties
+async def get_technological_properties_by_brand(
+        brand: str, db: Optional[AsyncSession] = None) -> Optional[TechnologicalPropertiesRecord]:
+    return await _get_related_by_brand(TechnologicalProperties, brand, db)
+
+
+# Функция для запроса данных из таблицы MechanicalProperties
+async def get_mechanical_properties_by_brand(brand: str,
+                                             db: Optional[AsyncSession] = None) -> Optional[MechanicalPropertiesRecord]:
+    return await _get_related_by_brand(MechanicalProperties, brand, db)
+
+
+# Функция для запроса данных из таблицы CharacteristicsOfMaterial
+async def get_characteristics_by_brand(brand: str,
+                                       db: Optional[AsyncSession] = None) -> Optional[CharacteristicsRecord]:
+    return await _get_related_by_brand(CharacteristicsOfMaterial, brand, db)
+
+
+# Функция для получения числовых диапазонов содержания химических элементов по бренду: элемент -> (min, max)
+async def get_chemical_element_ranges_by_brand(
+        brand: str, db: Optional[AsyncSession] = None) -> Optional[Dict[str, Tuple[float, float]]]:
+    async with async_session_scope(db) as db:
+        material = await get_material_by_brand(brand, db)
+        if material is None:
+            return None
+        rows = await db.execute(
+            select(ChemicalElementRange.element, ChemicalElementRange.min_value, ChemicalElementRange.max_value)
+            .where(ChemicalElementRange.material_id == material.id).order_by(ChemicalElementRange.id))
+    return {element: (min_value, max_value) for element, min_value, max_value in rows}
+
+
+# Функция для поиска значений механического свойства по пределам и виду проката (см. `crud.find_by_mechanical_property`)
+async def find_by_mechanical_property(
+        property_name: str, min_value: Optional[float] = None, max_value: Optional[float] = None,
+        product_form: Optional[str] = None,
+        db: Optional[AsyncSession] = None) -> List[Tuple[str, MechanicalPropertyValueRecord]]:
+    statement = _mechanical_property_statement(property_name, min_value, max_value, product_form)
+    async with async_session_scope(db) as db:
+        rows = (await db.execute(statement)).all()
+    return _brand_records(MechanicalPropertyValue, rows)
+
+
+# Функция для поиска значений твердости, пересекающихся с диапазоном (см. `crud.find_by_hardness`)
+async def find_by_hardness(min_value: Optional[float] = None, max_value: Optional[float] = None, scale: str = "HB",
+                           convert: bool = True,
+                           db: Optional[AsyncSession] = None) -> List[Tuple[str, HardnessValueRecord]]:
+    rows = []
+    async with async_session_scope(db) as db:
+        for statement in _hardness_statements(min_value, max_value, scale, convert):
+            rows.extend(_brand_records(HardnessValue, await db.execute(statement)))
+    rows.sort(key=lambda row: (row[0], row[1].id))
+    return rows
+
+
+# Функция для поиска материалов по зарубежному аналогу (см. `crud.find_by_foreign_analog`)
+async def find_by_foreign_analog(grade: str, standard_system: Optional[str] = None,
+                                 db: Optional[AsyncSession] = None) -> List[Tuple[str, ForeignAnalogRecord]]:
+    statement = _foreign_analog_statement(grade, standard_system)
+    if statement is None:
+        return []
+    async with async_session_scope(db) as db:
+        rows = (await db.execute(statement)).all()
+    return _brand_records(ForeignAnalog, rows)
+
+
+# Функция для полнотекстового поиска по характеристикам материалов (см. `crud.search_characteristics`)
+async def search_characteristics(query: str, limit: Optional[int] = 20,
+                                 db: Optional[AsyncSession] = None) -> List[Tuple[str, CharacteristicsRecord]]:
+    statement = _characteristics_search_statement(query, limit)
+    if statement is None:
+        return []
+    async with async_session_scope(db) as db:
+        rows = (await db.execute(statement)).all()
+    return _brand_records(CharacteristicsOfMaterial, rows)
+
+
+# Функция для получения списка всех брендов
+async def get_all_brands(db: Optional[AsyncSession] = None) -> List[str]:
+    async with async_session_scope(db) as db:
+        return list((await db.execute(select(Material.brand))).scalars())
+
+
+# Функция для получения всех брендов по index_of_material_class
+async def get_brands_by_material_class_index(index_of_material_class: int,
+                                             db: Optional[AsyncSession] = None) -> List[str]:
+    statement = select(Material.brand).join(MaterialIndices, MaterialIndices.material_id == Material.id) \
+        .where(MaterialIndices.index_of_material_class == index_of_material_class).order_by(Material.id)
+    async with async_session_scope(db) as db:
+        return list(dict.fromkeys((await db.execute(statement)).scalars()))
+
+
+# Функция для получения стандартов химического состава найденных брендов (см. `crud._get_standards`)
+async def _get_standards(brands: List[str], db: AsyncSession) -> Dict[str, Optional[str]]:
+    standards: Dict[str, Optional[str]] = {}
+    for chunk in _chunks(brands):
+        resolved, unresolved = _resolve_standards(chunk, (await db.execute(_standards_statement(chunk))).all())
+        if unresolved:
+            _add_standards_by_name(resolved, (await db.execute(_standards_by_name_statement(unresolved))).all())
+        standards.update(resolved)
+    return standards
+
+
+# Функция для получения стандарта химического состава по бренду
+async def get_standard_of_chemical_composition_by_brand(brand: str,
+                                                        db: Optional[AsyncSession] = None) -> Optional[str]:
+    async with async_session_scope(db) as db:
+        return (await _get_standards([brand], db)).get(brand)
+
+
+# Функция для получения брендов, химический состав которых соответствует стандарту
+async def get_brands_by_standard(standard: str, db: Optional[AsyncSession] = None) -> List[str]:
+    async with async_session_scope(db) as db:
+        return sorted((await db.execute(_brands_by_standard_statement(standard))).scalars().all())
+
+
+# Функция для пакетного получения записей таблицы свойств по списку брендов
+async def _get_related_by_brands(model, brands: Iterable[str], db: Optional[AsyncSession]) -> BulkResult:
+    brands = _unique(brands)
+    found = {}
+    async with async_session_scope(db) as db:
+        for chunk in _chunks(brands):
+            _first_by_brand(_brand_records(model, await db.execute(_get_related_statement(model, chunk))), found)
+    return BulkResult({brand: found[brand] for brand in brands if brand in found},
+                      [brand for brand in brands if brand not in found])
+
+
+# Функция для пакетного получения материалов по списку брендов
+async def get_materials_by_brands(brands: Iterable[str], db: Optional[AsyncSession] = None) -> BulkResult:
+    brands = _unique(brands)
+    found = {}
+    async with async_session_scope(db) as db:
+        for chunk in _chunks(brands):
+            for row in await db.execute(select(Material.__table__).where(Material.brand.in_(chunk))):
+                material = MaterialRecord(*row)
+                found[material.brand] = material
+    return BulkResult({brand: found[brand] for brand in brands if brand in found},
+                      [brand for brand in brands if brand not in found])
+
+
+# Функция для пакетного запроса данных из таблицы Hardness
+async def get_hardness_by_brands(brands: Iterable[str], db: Optional[AsyncSession] = None) -> BulkResult:
+    return await _get_related_by_brands(Hardness, brands, db)
+
+
+# Функция для пакетного запроса данных из таблицы ChemicalComposition
+async def get_chemical_composition_by_brands(brands: Iterable[str], db: Optional[AsyncSession] = None) -> BulkResult:
+    return await _get_related_by_brands(ChemicalComposition, brands, db)
+
+
+# Функция для пакетного запроса данных из таблицы TechnologicalProperties
+async def get_technological_properties_by_brands(brands: Iterable[str],
+                                                 db: Optional[AsyncSession] = None) -> BulkResult:
+    return await _get_related_by_brands(TechnologicalProperties, brands, db)
+
+
+# Функция для пакетного запроса данных из таблицы MechanicalProperties
+async def get_mechanical_properties_by_brands(brands: Iterable[str], db: Optional[AsyncSession] = None) -> BulkResult:
+    return await _get_related_by_brands(MechanicalProperties, brands, db)
+
+
+# Функция для пакетного запроса данных из таблицы CharacteristicsOfMaterial
+async def get_characteristics_by_brands(brands: Iterable[str], db: Optional[AsyncSession] = None) -> BulkResult:
+    return await _get_related_by_brands(CharacteristicsOfMaterial, brands, db)
+
+
+# Функция для пакетного получения материалов вместе с выбранными таблицами свойств (см. `crud.get_materials_bulk`)
+async def get_materials_bulk(brands: Iterable[str], include: Optional[Iterable[str]] = None,
+                             db: Optional[AsyncSession] = None) -> BulkResult:
+    include = list(BULK_TABLES) if include is None else _unique(include)
+    unknown = [name for name in include if name not in BULK_TABLES]
+    if unknown:
+        raise ValueError(f"Неизвестные таблицы для пакетной загрузки: {unknown}. Доступны: {list(BULK_TABLES)}")
+
+    async with async_session_scope(db) as db:
+        materials = await get_materials_by_brands(brands, db)
+        result = BulkResult({brand: {"material": material} for brand, material in materials.items()},
+                            materials.missing)
+        brand_by_id = {material.id: brand for brand, material in materials.items()}
+        material_ids = list(brand_by_id)
+
+        for name in include:
+            model = BULK_TABLES[name]
+            found = {}
+            for chunk in _chunks(material_ids):
+                for row in await db.execute(_records_statement(model, model.material_id.in_(chunk))):
+                    record = RECORD_CLASSES[model](*row)
+                    found.setdefault(record.material_id, record)
+            for material_id, brand in brand_by_id.items():
+                result[brand][name] = found.get(material_id)
+    return result
+
+
+# Функция для пакетного получения стандартов химического состава по списку брендов
+async def get_standards(brands: Iterable[str], db: Optional[AsyncSession] = None) -> BulkResult:
+    brands = _unique(brands)
+    async with async_session_scope(db) as db:
+        standards = await _get_standards(brands, db)
+    return BulkResult({brand: standards[brand] for brand in brands if brand in standards},
+                      [brand for brand in brands if brand not in standards])
+
+
+# Функция для получения профиля материала (см. `crud.get_material_profile`)
+async def get_material_profile(brand: str, db: Optional[AsyncSession] = None) -> Optional[MaterialProfile]:
+    async with async_session_scope(db) as db:
+        profiles = _build_profiles((await db.execute(_profile_statement([brand]))).unique())
+    return profiles.get(brand)
+
+
+# Функция для пакетного получения профилей материалов по списку брендов
+async def get_material_profiles(brands: Iterable[str], db: Optional[AsyncSession] = None) -> BulkResult:
+    brands = _unique(brands)
+    profiles = {}
+    async with async_session_scope(db) as db:
+        for chunk in _chunks(brands):
+            profiles.update(_build_profiles((await db.execute(_profile_statement(chunk))).unique()))
+    return BulkResult({brand: profiles[brand] for brand in brands if brand in profiles},
+                      [brand for brand in brands if brand not in profiles])
+
+
+# Функция для потокового чтения таблицы (см. `crud.iter_rows`): асинхронный генератор строк, читаемых из курсора
+# частями по `batch_size`
+async def iter_rows(table, fields: Optional[Sequence[str]] = None, batch_size: int = ITER_BATCH_SIZE,
+                    db: Optional[AsyncSession] = None) -> AsyncIterator[Row]:
+    statement = _iter_statement(table, fields).execution_options(yield_per=batch_size)
+    async with async_session_scope(db) as db:
+        result = await db.stream(statement)
+        async for row in result:
+            yield row
+
+
+# Функция для потокового чтения таблицы materials
+def iter_materials(fields: Optional[Sequence[str]] = None, batch_size: int = ITER_BATCH_SIZE,
+                   db: Optional[AsyncSession] = None) -> AsyncIterator[Row]:
+    return iter_rows(Material, fields, batch_size, db)
+
+
+# Функция для конкурентного выполнения функции модуля для списка брендов. Одновременно выполняется не более
+# `concurrency` вызовов; бренды, для которых функция вернула None, перечислены в `missing` результата
+async def gather_by_brands(function: Callable[[str], Awaitable], brands: Iterable[str],
+                           concurrency: int = GATHER_CONCURRENCY) -> BulkResult:
+    brands = _unique(brands)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(brand: str):
+        async with semaphore:
+            return await function(brand)
+
+    values = await asyncio.gather(*(call(brand) for brand in brands))
+    return BulkResult({brand: value for brand, value in zip(brands, values) if value is not None},
+                      [brand for brand, value in zip(brands, values) if value is None])
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль реализует поиск марок материалов по неточному написанию: с латинскими буквами вместо кириллических
+('30XMA' вместо '30ХМА'), в другом регистре, с пробелами и дефисами, по началу марки и с опечатками.
+
+Поиск выполняется по индексу в памяти, построенному по брендам таблицы `materials` и наименованиям материалов таблицы
+`standards`. Индекс строится при первом поиске (два запроса) и перестраивается после изменения данных через модели
+пакета (см. `database.get_write_generation`); сам поиск не обращается к базе данных.
+
+Перед индексированием и поиском строка нормализуется функцией `normalize_brand`: буквы приводятся к верхнему регистру,
+латинские буквы, совпадающие по начертанию с кириллическими (A, B, C, E, H, K, M, O, P, T, X, Y), заменяются
+кириллическими, 'Ё' - на 'Е', запятая - на точку, пробелы, дефисы и подчеркивания удаляются.
+
+Кандидаты упорядочиваются по виду совпадения, затем по убыванию оценки:
+- `exact`: нормализованная строка совпадает с нормализованной маркой (оценка 1.0);
+- `prefix`: марка начинается со строки поиска (оценка - доля длины марки, покрытая строкой поиска). Поиск выполняется
+  двоичным поиском по упорядоченному списку нормализованных марок;
+- `fuzzy`: марка похожа на строку поиска (оценка - сходство по триграммам, как в `pg_trgm`: отношение числа общих
+  триграмм к числу триграмм в объединении). Кандидаты выбираются по инвертированному индексу триграмм, поэтому оценка
+  вычисляется только для марок, имеющих общие триграммы со строкой поиска.
+
+Основные компоненты:
+- `normalize_brand(text)`: Нормализует марку для поиска.
+- `BrandIndex`: Индекс марок: упорядоченный список для поиска по началу и индекс триграмм.
+- `BrandMatch`: Результат поиска: марка, оценка, вид совпадения и признак наличия марки в таблице `materials`.
+- `get_brand_index()`: Возвращает общий индекс, построенный при первом обращении.
+- `search_brands(query, limit, min_similarity)`: Возвращает упорядоченный список кандидатов.
+- `resolve_brand(query)`: Возвращает бренд таблицы `materials`, совпадающий со строкой после нормализации.
+
+Использование:
+    from materials.brand_search import resolve_brand, search_brands
+
+    print(resolve_brand("30xma"))  # '30ХМА'
+    for match in search_brands("12Х18Н10", limit=5):
+        print(match.brand, match.kind, match.score)
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from heapq import nsmallest
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from materials.database import get_write_generation, session_scope
+from materials.models import Material, Standard
+
+# Минимальное сходство по триграммам для нечетких совпадений (значение по умолчанию в pg_trgm)
+MIN_SIMILARITY = 0.3
+
+# Порядок видов совпадения в результате
+MATCH_KINDS = ("exact", "prefix", "fuzzy")
+
+_HOMOGLYPHS = str.maketrans({
+    "A": "А", "B": "В", "C": "С", "E": "Е", "H": "Н", "K": "К", "M": "М", "O": "О", "P": "Р", "T": "Т", "X": "Х",
+    "Y": "У", "Ё": "Е", ",": ".", " ": None, "-": None, "–": None, "—": None, "_": None, "\t": None,
+})
+
+
+# Функция для нормализации марки: верхний регистр, кириллические буквы вместо латинских двойников, без разделителей
+def normalize_brand(text: str) -> str:
+    return text.upper().translate(_HOMOGLYPHS)
+
+
+# Функция для получения множества триграмм нормализованной строки (с дополнением пробелами, как в pg_trgm)
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class BrandMatch(NamedTuple):
+    """Кандидат поиска марки: марка, оценка от 0 до 1, вид совпадения и признак наличия в таблице `materials`."""
+    brand: str
+    score: float
+    kind: str
+    is_material: bool
+
+
+class BrandIndex:
+    """Индекс марок для поиска по нормализованной строке, по началу марки и по сходству триграмм."""
+
+    def __init__(self, brands: Iterable[str], material_names: Iterable[str] = ()):
+        materials = list(dict.fromkeys(brands))
+        material_set = set(materials)
+        self.names: List[str] = materials + [name for name in dict.fromkeys(material_names)
+                                             if name and name not in material_set]
+        self.is_material: List[bool] = [index < len(materials) for index in range(len(self.names))]
+        self.keys: List[str] = [normalize_brand(name) for name in self.names]
+
+        # Нормализованная марка -> номера марок (материалы идут раньше наименований из стандартов)
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        for index, key in enumerate(self.keys):
+            self._exact[key].append(index)
+
+        order = sorted(range(len(self.names)), key=lambda index: (self.keys[index], index))
+        self._sorted_keys = [self.keys[index] for index in order]
+        self._sorted_ids = order
+
+        self._trigram_counts: List[int] = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for index, key in enumerate(self.keys):
+            trigrams = _trigrams(key)
+            self._trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                postings[trigram].append(index)
+        self._postings = dict(postings)
+
+    @classmethod
+    def load(cls, db: Optional[Session] = None) -> "BrandIndex":
+        """Строит индекс по брендам таблицы `materials` и наименованиям материалов таблицы `standards`."""
+        with session_scope(db) as db:
+            brands = db.execute(select(Material.brand).order_by(Material.id)).scalars().all()
+            names = db.execute(select(Standard.material_name).order_by(Standard.id)).scalars().all()
+        return cls(brands, names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _match(self, index: int, score: float, kind: str) -> BrandMatch:
+        return BrandMatch(self.names[index], score, kind, self.is_material[index])
+
+    def resolve(self, query: str) -> Optional[str]:
+        """Возвращает бренд таблицы `materials`, совпадающий со строкой после нормализации."""
+        for index in self._exact.get(normalize_brand(query), ()):
+            if self.is_material[index]:
+                return self.names[index]
+        return None
+
+    def prefix(self, query: str, limit: Optional[int] = 10) -> List[BrandMatch]:
+        """Возвращает марки, начинающиеся со строки `query`, от коротких к длинным."""
+        key = normalize_brand(query)
+        if not key:
+            return []
+        start = bisect_left(self._sorted_keys, key)
+        stop = bisect_left(self._sorted_keys, key + "\uffff", start)
+        ids = self._sorted_ids[start:stop]
+        ids = sorted(ids, key=lambda index: (len(self.keys[index]), self.keys[index], index)) if limit is None \
+            else nsmallest(limit, ids, key=lambda index: (len(self.keys[index]), self.keys[index], index))
+        return [self._match(index, len(key) / len(self.keys[index]), "exact" if self.keys[index] == key else "prefix")
+                for index in ids]
+
+    def similar(self, query: str, limit: Optional[int] = 10,
+                min_similarity: float = MIN_SIMILARITY) -> List[BrandMatch]:
+        """Возвращает марки, сходство которых со строкой `query` по триграммам не меньше `min_similarity`."""
+        trigrams = _trigrams(normalize_brand(query))
+        common: Dict[int, int] = defaultdict(int)
+        for trigram in trigrams:
+            for index in self._postings.get(trigram, ()):
+                common[index] += 1
+        scored = []
+        for index, count in common.items():
+            score = count / (len(trigrams) + self._trigram_counts[index] - count)
+            if score >= min_similarity:
+                scored.append((-score, index))
+        scored = sorted(scored) if limit is None else nsmallest(limit, scored)
+        return [self._match(index, -score, "fuzzy") for score, index in scored]
+
+    def search(self, query: str, limit: int = 10, min_similarity: float = MIN_SIMILARITY) -> List[BrandMatch]:
+        """Возвращает не более `limit` кандидатов: точные совпадения, совпадения по началу, затем нечеткие."""
+        matches = self.prefix(query, limit)
+        if len(matches) < limit:
+            found = {match.brand for match in matches}
+            matches += [match for match in self.similar(query, limit + len(found), min_similarity)
+                        if match.brand not in found][:limit - len(matches)]
+        return sorted(matches, key=lambda match: (MATCH_KINDS.index(match.kind), -match.score, not match.is_material))
+
+
+_index: Optional[BrandIndex] = None
+_index_generation: Optional[int] = None
+_index_lock = threading.Lock()
+
+
+# Функция для получения общего индекса марок (строится при первом обращении и после изменения данных)
+def get_brand_index() -> BrandIndex:
+    global _index, _index_generation
+    generation = get_write_generation()
+    if _index is None or _index_generation != generation:
+        with _index_lock:
+            if _index is None or _index_generation != generation:
+                _index = BrandIndex.load()
+                _index_generation = generation
+    return _index
+
+
+# Функция для поиска марок по неточному написанию: совпадения после нормализации, по началу марки и по триграммам
+def search_brands(query: str, limit: int = 10, min_similarity: float = MIN_SIMILARITY) -> List[BrandMatch]:
+    return get_brand_index().search(query, limit=limit, min_similarity=min_similarity)
+
+
+# Функция для получения бренда таблицы materials по написанию с латинскими буквами, в другом регистре или с пробелами
+def resolve_brand(query: str) -> Optional[str]:
+    return get_brand_index().resolve(query)
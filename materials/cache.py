@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль реализует кэш для функций модуля `crud`. Кэш хранит результаты последних запросов в памяти и ограничен по
+количеству записей (вытесняются давно не использованные записи, LRU) и по времени жизни записи (TTL).
+
+Кэшированные значения не являются объектами ORM: функции `crud` возвращают записи только для чтения из модуля
+`materials.records`, а перед сохранением списки преобразуются в кортежи. Поэтому значения из кэша отсоединены от
+сессии, не изменяются и могут использоваться несколькими потоками одновременно.
+
+Кэш сбрасывается автоматически:
+- после подтверждения транзакции, изменившей данные моделей пакета (см. `database.get_write_generation`). Результат
+  запроса, во время выполнения которого была подтверждена такая транзакция, в кэш не сохраняется;
+- при смене ревизии Alembic базы данных. Ревизия проверяется только при промахе кэша (попадание не обращается к базе
+  данных) и не чаще одного раза в `revision_check_interval` секунд.
+
+Основные компоненты:
+- `TTLCache`: Потокобезопасный LRU-кэш с ограничением времени жизни записей и статистикой обращений.
+- `CacheStats`: Статистика кэша (попадания, промахи, вытеснения, устаревшие записи, размер).
+- `CachedCrud`: Функции `crud` (без параметра `db`), результаты которых кэшируются.
+- `crud_cache`: Общий экземпляр `CachedCrud`, настроенный переменными окружения `MATERIALS_CACHE_SIZE` (по умолчанию
+1024 записи) и `MATERIALS_CACHE_TTL` (по умолчанию 300 секунд).
+
+Использование:
+    from materials.cache import crud_cache
+
+    composition = crud_cache.get_chemical_composition_by_brand("30ХМА")
+    print(crud_cache.stats())
+
+    # Явный сброс кэша
+    crud_cache.invalidate()
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, NamedTuple, Optional
+
+from materials import crud
+from materials.database import get_alembic_revision, get_write_generation
+
+# Признак отсутствия значения в кэше
+_MISSING = object()
+
+
+class CacheStats(NamedTuple):
+    """Статистика обращений к кэшу."""
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLCache:
+    """Потокобезопасный LRU-кэш с ограничением времени жизни записей (`ttl` в секундах; `None` - без ограничения)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300.0):
+        if maxsize <= 0:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = self._expirations = self._invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self._misses += 1
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._invalidations += 1
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = self._misses = self._evictions = self._expirations = self._invalidations = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._expirations, self._invalidations,
+                              len(self._data), self.maxsize)
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Функция для преобразования результата функции crud в неизменяемое значение: записи и кортежи возвращаются как есть,
+# список - кортежем из тех же элементов
+def freeze(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+class CachedCrud:
+    """Функции `crud` с кэшированием результатов. Методы повторяют функции `crud` без параметра `db`."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300.0, revision_check_interval: float = 5.0):
+        self._cache = TTLCache(maxsize, ttl)
+        self.revision_check_interval = revision_check_interval
+        self._lock = threading.Lock()
+        self._write_generation = get_write_generation()
+        self._revision: Any = _MISSING
+        self._revision_checked_at = float("-inf")
+
+    def configure(self, maxsize: Optional[int] = None, ttl: Optional[float] = _MISSING,
+                  revision_check_interval: Optional[float] = None) -> None:
+        """Изменяет параметры кэша; текущее содержимое сбрасывается."""
+        self._cache = TTLCache(maxsize or self._cache.maxsize, self._cache.ttl if ttl is _MISSING else ttl)
+        if revision_check_interval is not None:
+            self.revision_check_interval = revision_check_interval
+
+    def invalidate(self) -> None:
+        """Сбрасывает содержимое кэша."""
+        self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+    # Функция для сброса кэша после изменения данных. Возвращает текущее значение счетчика изменений
+    def _validate(self) -> int:
+        generation = get_write_generation()
+        if generation != self._write_generation:
+            with self._lock:
+                if generation != self._write_generation:
+                    self._write_generation = generation
+                    self._cache.clear()
+        return generation
+
+    # Функция для сброса кэша при смене ревизии Alembic (вызывается при промахе кэша)
+    def _check_revision(self) -> None:
+        now = time.monotonic()
+        if now - self._revision_checked_at < self.revision_check_interval:
+            return
+        with self._lock:
+            if now - self._revision_checked_at < self.revision_check_interval:
+                return
+            self._revision_checked_at = now
+            revision = get_alembic_revision()
+            if self._revision is not _MISSING and revision != self._revision:
+                self._cache.clear()
+            self._revision = revision
+
+    def _call(self, function: Callable, *args) -> Any:
+        generation = self._validate()
+        key = (function.__name__,) + args
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            self._check_revision()
+            value = freeze(function(*args))
+            # Если во время запроса были подтверждены изменения, результат может быть устаревшим
+            if get_write_generation() == generation:
+                self._cache.put(key, value)
+        return value
+
+    def get_material_by_brand(self, brand: str):
+        return self._call(crud.get_material_by_brand, brand)
+
+    def get_material_class_index_by_id(self, index_id: int):
+        return self._call(crud.get_material_class_index_by_id, index_id)
+
+    def get_hardness_by_brand(self, brand: str):
+        return self._call(crud.get_hardness_by_brand, brand)
+
+    def get_chemical_composition_by_brand(self, brand: str):
+        return self._call(crud.get_chemical_composition_by_brand, brand)
+
+    def get_technological_properties_by_brand(self, brand: str):
+        return self._call(crud.get_technological_properties_by_brand, brand)
+
+    def get_mechanical_properties_by_brand(self, brand: str):
+        return self._call(crud.get_mechanical_properties_by_brand, brand)
+
+    def get_characteristics_by_brand(self, brand: str):
+        return self._call(crud.get_characteristics_by_brand, brand)
+
+    def get_all_brands(self) -> List[str]:
+        return list(self._call(crud.get_all_brands))
+
+    def get_brands_by_material_class_index(self, index_of_material_class: int) -> List[str]:
+        return list(self._call(crud.get_brands_by_material_class_index, index_of_material_class))
+
+    def get_standard_of_chemical_composition_by_brand(self, brand: str) -> Optional[str]:
+        return self._call(crud.get_standard_of_chemical_composition_by_brand, brand)
+
+
+crud_cache = CachedCrud(
+    maxsize=int(os.getenv("MATERIALS_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("MATERIALS_CACHE_TTL", "300")) or None,
+)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль содержит проверки производительности пакета `materials`.
+
+Проверка планов запросов вызывает каждую функцию `crud`, перехватывает выполненные ею SQL-запросы и получает для них
+`EXPLAIN QUERY PLAN`. Если SQLite выполняет полный просмотр таблицы (`SCAN`) вместо поиска по индексу (`SEARCH`),
+проверка завершается с ошибкой. Просмотр виртуальной таблицы FTS5 с условием `MATCH` является поиском по
+полнотекстовому индексу и ошибкой не считается. Функции, которые по своему назначению читают всю таблицу (например,
+`get_all_brands`), перечислены в `FULL_SCAN_ALLOWED` и не проверяются.
+
+Проверка времени импорта запускает `import materials` в отдельном процессе Python. Импорт пакета не должен подключаться
+к базе данных (движок создается при первом запросе) и изменять переменные окружения, а время импорта не должно
+превышать `IMPORT_TIME_BUDGET` секунд (переменная окружения `MATERIALS_IMPORT_TIME_BUDGET`, по умолчанию 0.75 - около
+двух измеренных времен импорта поставляемой версии пакета; основную часть занимает импорт SQLAlchemy).
+
+Основные функции:
+- `collect_query_plans(brand, db)`: Возвращает планы всех запросов для каждой функции `crud`.
+- `find_full_scans(brand, db)`: Возвращает строки планов с полным просмотром таблиц для каждой функции `crud`.
+- `check_query_plans(brand, db)`: Вызывает `AssertionError`, если какая-либо функция выполняет полный просмотр таблицы.
+- `measure_import_time(repeat)`: Возвращает минимальное время импорта пакета в отдельном процессе, признак создания
+  движка и признак изменения переменных окружения.
+- `check_import_time(budget, repeat)`: Вызывает `AssertionError`, если импорт пакета подключается к базе данных,
+  изменяет переменные окружения или превышает бюджет времени.
+- `measure_brand_search_time(queries, repeat)`: Возвращает медианное время поиска марки для каждой строки поиска.
+- `check_brand_search_time(budget, queries)`: Вызывает `AssertionError`, если поиск марки по индексу
+  (`brand_search.search_brands`) дольше `BRAND_SEARCH_BUDGET` секунд (по умолчанию 1 мс).
+
+Использование:
+Проверки можно запустить из командной строки; если какая-либо проверка не пройдена, код возврата равен 1:
+
+    python -m materials.checks
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from materials import brand_search, crud
+from materials.database import get_engine, session_scope
+
+# Функции, которые по назначению читают всю таблицу
+FULL_SCAN_ALLOWED = {"get_all_brands", "iter_materials", "iter_chemical_compositions", "iter_mechanical_properties",
+                     "iter_brands"}
+
+# Просмотр виртуальной таблицы FTS5 с условием MATCH - поиск по полнотекстовому индексу, а не полный просмотр
+_FTS_MATCH = re.compile(r"^SCAN \S+ VIRTUAL TABLE INDEX \d+:M")
+
+# Допустимое время импорта пакета, секунды
+IMPORT_TIME_BUDGET = float(os.getenv("MATERIALS_IMPORT_TIME_BUDGET", "0.75"))
+
+# Допустимое время поиска марки по индексу, секунды
+BRAND_SEARCH_BUDGET = float(os.getenv("MATERIALS_BRAND_SEARCH_BUDGET", "0.001"))
+
+# Строки поиска марок: латинские двойники, начало марки, опечатки, короткие строки с большим числом кандидатов
+BRAND_SEARCH_QUERIES = ("30XMA", "30ХМ", "12X18H10", "12Х18Н1ОТ", "40ХНМ А", "AlMg", "1", "Л6З", "бражн")
+
+# Программа, которая импортирует пакет в отдельном процессе и выводит время импорта, признак создания движка и
+# признак изменения переменных окружения
+_IMPORT_PROBE = """
+import os, time
+environ = dict(os.environ)
+start = time.perf_counter()
+import materials
+elapsed = time.perf_counter() - start
+print(elapsed, materials.database._engine is not None, dict(os.environ) != environ)
+"""
+
+
+# Функция для формирования вызовов всех функций crud с тестовыми аргументами
+def _crud_calls(brand: str) -> List[Tuple[str, Callable[[Session], object]]]:
+    return [
+        ("get_material_by_brand", lambda db: crud.get_material_by_brand(brand, db)),
+        ("get_material_class_index_by_id", lambda db: crud.get_material_class_index_by_id(1, db)),
+        ("get_hardness_by_brand", lambda db: crud.get_hardness_by_brand(brand, db)),
+        ("get_chemical_composition_by_brand", lambda db: crud.get_chemical_composition_by_brand(brand, db)),
+        ("get_technological_properties_by_brand", lambda db: crud.get_technological_properties_by_brand(brand, db)),
+        ("get_mechanical_properties_by_brand", lambda db: crud.get_mechanical_properties_by_brand(brand, db)),
+        ("get_characteristics_by_brand", lambda db: crud.get_characteristics_by_brand(brand, db)),
+        ("get_chemical_element_ranges_by_brand", lambda db: crud.get_chemical_element_ranges_by_brand(brand, db)),
+        ("find_by_mechanical_property",
+         lambda db: crud.find_by_mechanical_property("yield_strength", min_value=600, product_form="Отливки", db=db)),
+        ("find_by_hardness", lambda db: crud.find_by_hardness(200, 250, db=db)),
+        ("find_by_foreign_analog", lambda db: crud.find_by_foreign_analog("AISI 4130", db=db)),
+        ("get_foreign_analogs_by_brand", lambda db: crud.get_foreign_analogs_by_brand(brand, db=db)),
+        ("search_characteristics", lambda db: crud.search_characteristics("лопатки турбин", db=db)),
+        ("get_all_brands", lambda db: crud.get_all_brands(db)),
+        ("get_brands_by_material_class_index", lambda db: crud.get_brands_by_material_class_index(4, db)),
+        ("get_standard_of_chemical_composition_by_brand",
+         lambda db: crud.get_standard_of_chemical_composition_by_brand(brand, db)),
+        ("get_brands_by_standard", lambda db: crud.get_brands_by_standard("ГОСТ 977 - 88", db)),
+        ("get_standards", lambda db: crud.get_standards([brand, "Л63"], db)),
+        ("get_materials_by_brands", lambda db: crud.get_materials_by_brands([brand], db)),
+        ("get_hardness_by_brands", lambda db: crud.get_hardness_by_brands([brand], db)),
+        ("get_chemical_composition_by_brands", lambda db: crud.get_chemical_composition_by_brands([brand], db)),
+        ("get_technological_properties_by_brands",
+         lambda db: crud.get_technological_properties_by_brands([brand], db)),
+        ("get_mechanical_properties_by_brands", lambda db: crud.get_mechanical_properties_by_brands([brand], db)),
+        ("get_characteristics_by_brands", lambda db: crud.get_characteristics_by_brands([brand], db)),
+        ("get_materials_bulk", lambda db: crud.get_materials_bulk([brand], db=db)),
+        ("get_material_profile", lambda db: crud.get_material_profile(brand, db)),
+        ("get_material_profiles", lambda db: crud.get_material_profiles([brand], db)),
+        ("iter_materials", lambda db: sum(1 for _ in crud.iter_materials(("id", "brand"), db=db))),
+        ("iter_chemical_compositions",
+         lambda db: sum(1 for _ in crud.iter_chemical_compositions(("brand", "C"), db=db))),
+        ("iter_mechanical_properties", lambda db: sum(1 for _ in crud.iter_mechanical_properties(db=db))),
+        ("iter_brands", lambda db: sum(1 for _ in crud.iter_brands(db=db))),
+    ]
+
+
+# Функция для получения планов всех запросов, выполняемых каждой функцией crud
+def collect_query_plans(brand: str = "30ХМА", db: Optional[Session] = None) -> Dict[str, List[str]]:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    plans = {}
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with session_scope(db) as db:
+            for name, call in _crud_calls(brand):
+                statements.clear()
+                call(db)
+                captured = list(statements)
+                plans[name] = []
+                for statement, parameters in captured:
+                    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                    plans[name].extend(row[-1] for row in rows)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return plans
+
+
+# Функция для поиска полных просмотров таблиц в планах запросов функций crud
+def find_full_scans(brand: str = "30ХМА", db: Optional[Session] = None) -> Dict[str, List[str]]:
+    scans = {}
+    for name, plan in collect_query_plans(brand, db).items():
+        if name in FULL_SCAN_ALLOWED:
+            continue
+        details = [detail for detail in plan if detail.startswith("SCAN") and not _FTS_MATCH.match(detail)]
+        if details:
+            scans[name] = details
+    return scans
+
+
+# Функция для проверки, что ни одна функция crud не выполняет полный просмотр таблицы
+def check_query_plans(brand: str = "30ХМА", db: Optional[Session] = None) -> None:
+    scans = find_full_scans(brand, db)
+    if scans:
+        lines = [f"{name}: {'; '.join(details)}" for name, details in scans.items()]
+        raise AssertionError("Полный просмотр таблиц в функциях crud:\n" + "\n".join(lines))
+
+
+# Функция для измерения времени импорта пакета в отдельном процессе (минимум из `repeat` запусков)
+def measure_import_time(repeat: int = 3) -> Tuple[float, bool, bool]:
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [package_dir, os.getenv("PYTHONPATH")])))
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _IMPORT_PROBE], env=env, capture_output=True, text=True,
+                                check=True).stdout.split()
+        results.append((float(output[0]), output[1] == "True", output[2] == "True"))
+    return min(results)
+
+
+# Функция для проверки, что импорт пакета не подключается к базе данных и укладывается в бюджет времени
+def check_import_time(budget: Optional[float] = None, repeat: int = 3) -> float:
+    budget = IMPORT_TIME_BUDGET if budget is None else budget
+    elapsed, engine_created, environ_changed = measure_import_time(repeat)
+    errors = []
+    if engine_created:
+        errors.append("импорт пакета создает движок базы данных")
+    if environ_changed:
+        errors.append("импорт пакета изменяет переменные окружения")
+    if elapsed > budget:
+        errors.append(f"время импорта {elapsed:.3f} с превышает бюджет {budget:.3f} с")
+    if errors:
+        raise AssertionError("Импорт пакета materials: " + "; ".join(errors))
+    return elapsed
+
+
+# Функция для измерения медианного времени поиска марки по индексу для каждой строки поиска
+def measure_brand_search_time(queries=BRAND_SEARCH_QUERIES, repeat: int = 50) -> Dict[str, float]:
+    brand_search.get_brand_index()
+    timings = {}
+    for query in queries:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            brand_search.search_brands(query)
+            samples.append(time.perf_counter() - start)
+        timings[query] = statistics.median(samples)
+    return timings
+
+
+# Функция для проверки, что поиск марки по индексу укладывается в бюджет времени для каждой строки поиска
+def check_brand_search_time(budget: Optional[float] = None, queries=BRAND_SEARCH_QUERIES) -> Dict[str, float]:
+    budget = BRAND_SEARCH_BUDGET if budget is None else budget
+    timings = measure_brand_search_time(queries)
+    slow = {query: elapsed for query, elapsed in timings.items() if elapsed > budget}
+    if slow:
+        details = ", ".join(f"'{query}': {elapsed * 1000:.2f} мс" for query, elapsed in slow.items())
+        raise AssertionError(f"Поиск марок превышает бюджет {budget * 1000:.2f} мс: {details}")
+    return timings
+
+
+def main() -> int:
+    failed = False
+    try:
+        elapsed = check_import_time()
+        print(f"Импорт пакета: {elapsed:.3f} с (бюджет {IMPORT_TIME_BUDGET:.3f} с), база данных не открывается.")
+    except AssertionError as error:
+        print(error)
+        failed = True
+    try:
+        check_query_plans()
+        print("Планы запросов функций crud используют индексы.")
+    except AssertionError as error:
+        print(error)
+        failed = True
+    try:
+        timings = check_brand_search_time()
+        print(f"Поиск марок: не более {max(timings.values()) * 1000:.3f} мс "
+              f"(бюджет {BRAND_SEARCH_BUDGET * 1000:.3f} мс).")
+    except AssertionError as error:
+        print(error)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
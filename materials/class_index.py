@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль реализует индекс классов материалов: списки брендов для каждого индекса класса
+(`MaterialIndices.index_of_material_class`), класса (`Material.class_of_material`) и подкласса
+(`Material.subclass_of_material`) и количество брендов по классам для фильтров пользовательского интерфейса.
+
+Индекс строится одним запросом при первом обращении и перестраивается после изменения данных через модели пакета (см.
+`database.get_write_generation`). Списки брендов хранятся в виде упорядоченных кортежей и возвращаются без копирования
+и без обращения к базе данных, т.е. за O(1).
+
+Количество брендов (фасеты) считается по трем измерениям: `index_of_material_class`, `class_of_material` и
+`subclass_of_material`. Без фильтров фасеты вычисляются при построении индекса; с фильтрами (например, количество
+брендов по подклассам внутри класса 'Бронза') - по брендам, удовлетворяющим фильтрам.
+
+Основные компоненты:
+- `FACETS`: Измерения индекса классов.
+- `ClassIndex`: Индекс классов материалов.
+- `get_class_index()`: Возвращает общий индекс, построенный при первом обращении.
+- `get_brands_by_class_index(index_of_material_class)`: Бренды индекса класса.
+- `get_brands_by_class(class_of_material, subclass_of_material)`: Бренды класса (и подкласса).
+- `get_class_facets(**filters)`: Количество брендов по каждому измерению с учетом фильтров.
+
+Использование:
+    from materials.class_index import get_brands_by_class, get_class_facets
+
+    print(get_brands_by_class("Бронза", "Гетерогенный сплав")[:5])
+    print(get_class_facets(class_of_material="Бронза")["subclass_of_material"])
+"""
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from materials.database import get_write_generation, session_scope
+from materials.models import Material, MaterialIndices
+
+# Измерения индекса классов (имена совпадают с именами столбцов моделей)
+FACETS = ("index_of_material_class", "class_of_material", "subclass_of_material")
+
+FacetValue = Union[int, str, None]
+
+
+class ClassEntry(NamedTuple):
+    """Бренд и его значения по измерениям индекса классов."""
+    brand: str
+    index_of_material_class: Optional[int]
+    class_of_material: Optional[str]
+    subclass_of_material: Optional[str]
+
+
+class ClassIndex:
+    """Упорядоченные кортежи брендов для каждого значения каждого измерения и количество брендов по значениям."""
+
+    def __init__(self, entries: Iterable[ClassEntry]):
+        self._entries: Dict[str, ClassEntry] = {}
+        for entry in entries:
+            self._entries.setdefault(entry.brand, entry)
+
+        brands: Dict[str, Dict[FacetValue, List[str]]] = {facet: defaultdict(list) for facet in FACETS}
+        by_class_and_subclass: Dict[Tuple[Optional[str], Optional[str]], List[str]] = defaultdict(list)
+        for brand in sorted(self._entries):
+            entry = self._entries[brand]
+            for facet in FACETS:
+                brands[facet][getattr(entry, facet)].append(brand)
+            by_class_and_subclass[entry.class_of_material, entry.subclass_of_material].append(brand)
+
+        self._brands: Dict[str, Dict[FacetValue, Tuple[str, ...]]] = {
+            facet: {value: tuple(items) for value, items in values.items()} for facet, values in brands.items()}
+        self._brands_by_class_and_subclass = {key: tuple(items) for key, items in by_class_and_subclass.items()}
+        self._facets = {facet: {value: len(items) for value, items in values.items()}
+                        for facet, values in self._brands.items()}
+
+    @classmethod
+    def load(cls, db: Optional[Session] = None) -> "ClassIndex":
+        """Строит индекс одним запросом по таблицам `materials` и `material_indices`."""
+        query = select(Material.brand, MaterialIndices.index_of_material_class, Material.class_of_material,
+                       Material.subclass_of_material) \
+            .outerjoin(MaterialIndices, MaterialIndices.material_id == Material.id) \
+            .order_by(Material.id, MaterialIndices.id)
+        with session_scope(db) as db:
+            rows = db.execute(query).all()
+        return cls(ClassEntry(*row) for row in rows)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        sizes = ", ".join(f"{facet}={len(values)}" for facet, values in self._brands.items())
+        return f"<ClassIndex(brands={len(self)}, {sizes})>"
+
+    def values(self, facet: str) -> List[FacetValue]:
+        """Возвращает все значения измерения `facet`."""
+        return list(self._facet(facet))
+
+    def brands(self, facet: str, value: FacetValue) -> Tuple[str, ...]:
+        """Возвращает упорядоченный кортеж брендов со значением `value` измерения `facet`."""
+        return self._facet(facet).get(value, ())
+
+    def brands_by_class_index(self, index_of_material_class: int) -> Tuple[str, ...]:
+        return self._brands["index_of_material_class"].get(index_of_material_class, ())
+
+    def brands_by_class(self, class_of_material: str, subclass_of_material: Optional[str] = None) -> Tuple[str, ...]:
+        if subclass_of_material is None:
+            return self._brands["class_of_material"].get(class_of_material, ())
+        return self._brands_by_class_and_subclass.get((class_of_material, subclass_of_material), ())
+
+    def entry(self, brand: str) -> Optional[ClassEntry]:
+        """Возвращает значения измерений бренда."""
+        return self._entries.get(brand)
+
+    def facets(self, **filters: FacetValue) -> Dict[str, Dict[FacetValue, int]]:
+        """Возвращает количество брендов по значениям каждого измерения среди брендов, удовлетворяющих фильтрам."""
+        for facet in filters:
+            self._facet(facet)
+        if not filters:
+            return {facet: dict(counts) for facet, counts in self._facets.items()}
+        # Перебираются бренды самого узкого фильтра
+        facet, value = min(filters.items(), key=lambda item: len(self.brands(*item)))
+        entries = [self._entries[brand] for brand in self.brands(facet, value)]
+        entries = [entry for entry in entries if all(getattr(entry, name) == item for name, item in filters.items())]
+        return {facet: dict(Counter(getattr(entry, facet) for entry in entries)) for facet in FACETS}
+
+    def _facet(self, facet: str) -> Dict[FacetValue, Tuple[str, ...]]:
+        if facet not in self._brands:
+            raise ValueError(f"Неизвестное измерение '{facet}'. Доступны: {list(FACETS)}")
+        return self._brands[facet]
+
+
+_index: Optional[ClassIndex] = None
+_index_generation: Optional[int] = None
+_index_lock = threading.Lock()
+
+
+# Функция для получения общего индекса классов (строится при первом обращении и после изменения данных)
+def get_class_index() -> ClassIndex:
+    global _index, _index_generation
+    generation = get_write_generation()
+    if _index is None or _index_generation != generation:
+        with _index_lock:
+            if _index is None or _index_generation != generation:
+                _index = ClassIndex.load()
+                _index_generation = generation
+    return _index
+
+
+# Функция для получения упорядоченного кортежа брендов по index_of_material_class
+def get_brands_by_class_index(index_of_material_class: int) -> Tuple[str, ...]:
+    return get_class_index().brands_by_class_index(index_of_material_class)
+
+
+# Функция для получения упорядоченного кортежа брендов класса материала (и подкласса, если он указан)
+def get_brands_by_class(class_of_material: str, subclass_of_material: Optional[str] = None) -> Tuple[str, ...]:
+    return get_class_index().brands_by_class(class_of_material, subclass_of_material)
+
+
+# Функция для получения количества брендов по значениям каждого измерения с учетом фильтров
+# (например, get_class_facets(class_of_material="Бронза"))
+def get_class_facets(**filters: FacetValue) -> Dict[str, Dict[FacetValue, int]]:
+    return get_class_index().facets(**filters)
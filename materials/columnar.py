@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль выгружает всю базу данных материалов в колоночные файлы и загружает их обратно без SQLite и ORM. Выгрузка
+предназначена для аналитических задач, которые обрабатывают весь каталог векторно (NumPy, pandas, Arrow).
+
+Выгружаются все таблицы моделей пакета (включая производные таблицы с числовыми значениями) и дополнительная таблица
+`chemical_composition_ranges`: разобранный химический состав в широком формате, по два столбца `<элемент>_min` и
+`<элемент>_max` (NaN - содержание элемента не указано) на каждый элемент из `parsers.ELEMENT_COLUMNS`.
+
+Форматы выгрузки:
+- `npy` (по умолчанию): каталог на каждую таблицу, файл `.npy` на каждый столбец. Числовые столбцы хранятся массивами
+  `int64`/`float64`, строковые - в виде байтов UTF-8 (`<столбец>.data.npy`) и смещений начала строк
+  (`<столбец>.offsets.npy`), как в Arrow. Если в столбце есть NULL, дополнительно сохраняется маска
+  `<столбец>.valid.npy`. Загрузчик отображает файлы в память (`mmap_mode='r'`), поэтому загрузка не читает данные, а
+  занимает миллисекунды.
+- `npz`: один файл `<таблица>.npz` на таблицу с теми же массивами (без отображения в память).
+- `parquet`: один файл `<таблица>.parquet` на таблицу; требуется пакет `pyarrow`. Загрузчик возвращает `pyarrow.Table`,
+  прочитанные с отображением файлов в память.
+
+В каталоге выгрузки создается файл `manifest.json` со списком таблиц, типами столбцов, количеством строк и ревизией
+Alembic базы данных.
+
+Основные компоненты:
+- `export_catalogue(directory, format, db)`: Выгружает все таблицы в каталог `directory`.
+- `load_catalogue(directory)`: Загружает выгрузку; возвращает `Catalogue` - словарь таблиц.
+- `ColumnarTable`: Таблица выгрузки - словарь столбец -> массив NumPy или `StringColumn`.
+- `StringColumn`: Строковый столбец поверх массивов байтов и смещений; строки декодируются при обращении.
+
+Использование:
+Выгрузка из командной строки:
+
+    python -m materials.columnar export catalogue
+    python -m materials.columnar export catalogue.parquet --format parquet
+
+Загрузка:
+
+    from materials.columnar import load_catalogue
+
+    catalogue = load_catalogue("catalogue")
+    ranges = catalogue["chemical_composition_ranges"]
+    print(ranges["Cr_max"].mean(), catalogue["materials"]["brand"][0])
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from sqlalchemy import Float, Integer, select
+from sqlalchemy.orm import Session
+
+from materials.database import get_alembic_revision, session_scope
+from materials.models import Base, ChemicalComposition, ChemicalElementRange
+from materials.parsers import ELEMENT_COLUMNS
+
+FORMATS = ("npy", "npz", "parquet")
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Таблица с разобранным химическим составом в широком формате
+COMPOSITION_RANGES_TABLE = "chemical_composition_ranges"
+
+# Таблицы, которые не выгружаются
+_SKIPPED_TABLES = {"alembic_version"}
+
+
+class StringColumn:
+    """Строковый столбец: байты UTF-8 всех строк, смещения начала каждой строки и необязательная маска NULL."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, valid: Optional[np.ndarray] = None):
+        self.data = data
+        self.offsets = offsets
+        self.valid = valid
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> "StringColumn":
+        encoded = [value.encode("utf-8") if value is not None else b"" for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        valid = np.array([value is not None for value in values], dtype=bool)
+        return cls(data, offsets, None if valid.all() else valid)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        if self.valid is not None and not self.valid[index]:
+            return None
+        return bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode("utf-8")
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def __repr__(self):
+        return f"<StringColumn(rows={len(self)}, bytes={len(self.data)})>"
+
+    def to_list(self) -> List[Optional[str]]:
+        return list(self)
+
+    def to_numpy(self) -> np.ndarray:
+        """Возвращает строки в виде массива объектов NumPy (с копированием)."""
+        return np.array(self.to_list(), dtype=object)
+
+
+Column = Union[np.ndarray, StringColumn]
+
+
+class ColumnarTable(dict):
+    """Таблица выгрузки: словарь столбец -> массив NumPy или `StringColumn`. Количество строк - свойство `rows`."""
+
+    def __init__(self, name: str, columns: Dict[str, Column]):
+        super().__init__(columns)
+        self.name = name
+
+    def __repr__(self):
+        return f"<ColumnarTable({self.name}, rows={self.rows}, columns={len(self)})>"
+
+    @property
+    def rows(self) -> int:
+        """Количество строк таблицы."""
+        return len(next(iter(self.values()))) if dict.__len__(self) else 0
+
+    def to_pandas(self):
+        """Возвращает таблицу в виде `pandas.DataFrame` (с копированием строковых столбцов)."""
+        import pandas as pd
+        return pd.DataFrame({name: column.to_numpy() if isinstance(column, StringColumn) else column
+                             for name, column in self.items()})
+
+
+class Catalogue(dict):
+    """Загруженная выгрузка: словарь имя таблицы -> `ColumnarTable` (или `pyarrow.Table` для формата parquet)."""
+
+    def __init__(self, tables: dict, manifest: dict):
+        super().__init__(tables)
+        self.manifest = manifest
+        self.revision = manifest.get("revision")
+        self.format = manifest.get("format")
+
+    def __repr__(self):
+        return f"<Catalogue(format={self.format}, revision={self.revision}, tables={list(self)})>"
+
+
+# Функция для преобразования значений столбца таблицы базы данных в массив NumPy или StringColumn
+def _to_column(column, values: list) -> Column:
+    if isinstance(column.type, (Integer, Float)):
+        dtype = np.int64 if isinstance(column.type, Integer) else np.float64
+        valid = np.array([value is not None for value in values], dtype=bool)
+        filler = 0 if dtype is np.int64 else np.nan
+        array = np.array([filler if value is None else value for value in values], dtype=dtype)
+        return array if valid.all() else (array, valid)
+    return StringColumn.from_values([None if value is None else str(value) for value in values])
+
+
+# Функция для чтения всех таблиц моделей пакета в колоночном виде
+def read_tables(db: Optional[Session] = None) -> Dict[str, Dict[str, object]]:
+    tables = {}
+    with session_scope(db) as db:
+        for table in Base.metadata.sorted_tables:
+            if table.name in _SKIPPED_TABLES:
+                continue
+            rows = db.execute(select(table).order_by(*table.primary_key.columns)).all()
+            tables[table.name] = {column.key: _to_column(column, [row[index] for row in rows])
+                                  for index, column in enumerate(table.columns)}
+        tables[COMPOSITION_RANGES_TABLE] = _composition_ranges(db)
+    return tables
+
+
+# Функция для построения таблицы химического состава в широком формате по таблице chemical_element_ranges
+def _composition_ranges(db: Session) -> Dict[str, np.ndarray]:
+    compositions = db.execute(select(ChemicalComposition.id, ChemicalComposition.material_id)
+                              .order_by(ChemicalComposition.id)).all()
+    row_index = {composition_id: index for index, (composition_id, _) in enumerate(compositions)}
+    element_index = {element: index for index, element in enumerate(ELEMENT_COLUMNS)}
+    mins = np.full((len(compositions), len(ELEMENT_COLUMNS)), np.nan)
+    maxs = np.full((len(compositions), len(ELEMENT_COLUMNS)), np.nan)
+    source = ChemicalElementRange.__table__
+    for composition_id, element, min_value, max_value in db.execute(
+            select(source.c.chemical_composition_id, source.c.element, source.c.min_value, source.c.max_value)):
+        if composition_id in row_index and element in element_index:
+            mins[row_index[composition_id], element_index[element]] = min_value
+            maxs[row_index[composition_id], element_index[element]] = max_value
+
+    columns = {"chemical_composition_id": np.array([row[0] for row in compositions], dtype=np.int64),
+               "material_id": np.array([row[1] for row in compositions], dtype=np.int64)}
+    for element, index in element_index.items():
+        columns[f"{element}_min"] = np.ascontiguousarray(mins[:, index])
+        columns[f"{element}_max"] = np.ascontiguousarray(maxs[:, index])
+    return columns
+
+
+# Функция для разложения столбца на именованные массивы для сохранения
+def _column_arrays(name: str, column: object) -> Dict[str, np.ndarray]:
+    if isinstance(column, StringColumn):
+        arrays = {f"{name}.data": column.data, f"{name}.offsets": column.offsets}
+        if column.valid is not None:
+            arrays[f"{name}.valid"] = column.valid
+        return arrays
+    if isinstance(column, tuple):
+        return {name: column[0], f"{name}.valid": column[1]}
+    return {name: column}
+
+
+def _column_kind(column: object) -> str:
+    if isinstance(column, StringColumn):
+        return "string"
+    array = column[0] if isinstance(column, tuple) else column
+    return str(array.dtype)
+
+
+# Функция для сборки столбца из именованных массивов
+def _column_from_arrays(name: str, kind: str, arrays) -> Column:
+    valid = arrays.get(f"{name}.valid")
+    if kind == "string":
+        return StringColumn(arrays[f"{name}.data"], arrays[f"{name}.offsets"], valid)
+    array = arrays[name]
+    if valid is not None and array.dtype.kind == "f":
+        # Маска NULL для вещественных столбцов уже отражена значениями NaN
+        return array
+    return np.ma.MaskedArray(array, mask=~valid) if valid is not None else array
+
+
+# Функция для импорта необязательного пакета pyarrow
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Для формата parquet требуется пакет pyarrow: pip install materials[arrow]") from error
+    return pyarrow, pyarrow.parquet
+
+
+# Функция для выгрузки таблицы в формате parquet
+def _write_parquet(path: str, columns: Dict[str, object]) -> None:
+    pa, pq = _import_pyarrow()
+    arrays = {}
+    for name, column in columns.items():
+        if isinstance(column, StringColumn):
+            arrays[name] = pa.array(column.to_list(), type=pa.string())
+        elif isinstance(column, tuple):
+            arrays[name] = pa.array(column[0], mask=~column[1])
+        else:
+            arrays[name] = pa.array(column)
+    pq.write_table(pa.table(arrays), path)
+
+
+# Функция для выгрузки всех таблиц в каталог directory в формате format. Возвращает содержимое manifest.json
+def export_catalogue(directory: str, format: str = "npy", db: Optional[Session] = None) -> dict:
+    if format not in FORMATS:
+        raise ValueError(f"Неизвестный формат выгрузки '{format}'. Доступны: {list(FORMATS)}")
+    if format == "parquet":
+        _import_pyarrow()
+    with session_scope(db) as db:
+        tables = read_tables(db)
+        revision = get_alembic_revision(db)
+
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"version": MANIFEST_VERSION, "format": format, "revision": revision, "tables": {}}
+    for table_name, columns in tables.items():
+        first = next(iter(columns.values()))
+        manifest["tables"][table_name] = {
+            "rows": len(first[0] if isinstance(first, tuple) else first),
+            "columns": {name: _column_kind(column) for name, column in columns.items()},
+        }
+        if format == "parquet":
+            _write_parquet(os.path.join(directory, f"{table_name}.parquet"), columns)
+            continue
+        arrays = {}
+        for name, column in columns.items():
+            arrays.update(_column_arrays(name, column))
+        if format == "npz":
+            np.savez(os.path.join(directory, f"{table_name}.npz"), **arrays)
+        else:
+            table_directory = os.path.join(directory, table_name)
+            os.makedirs(table_directory, exist_ok=True)
+            for name, array in arrays.items():
+                np.save(os.path.join(table_directory, f"{name}.npy"), array)
+
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    return manifest
+
+
+# Функция для загрузки выгрузки из каталога directory. Файлы формата npy отображаются в память без чтения данных
+def load_catalogue(directory: str, tables: Optional[Sequence[str]] = None) -> Catalogue:
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Неподдерживаемая версия выгрузки: {manifest.get('version')}")
+    names = list(manifest["tables"]) if tables is None else list(tables)
+    unknown = [name for name in names if name not in manifest["tables"]]
+    if unknown:
+        raise KeyError(f"Таблицы отсутствуют в выгрузке: {unknown}")
+
+    result = {}
+    for table_name in names:
+        kinds = manifest["tables"][table_name]["columns"]
+        if manifest["format"] == "parquet":
+            _, pq = _import_pyarrow()
+            result[table_name] = pq.read_table(os.path.join(directory, f"{table_name}.parquet"), memory_map=True)
+            continue
+        if manifest["format"] == "npz":
+            arrays = np.load(os.path.join(directory, f"{table_name}.npz"))
+        else:
+            table_directory = os.path.join(directory, table_name)
+            arrays = {file_name[:-len(".npy")]: np.load(os.path.join(table_directory, file_name), mmap_mode="r")
+                      for file_name in os.listdir(table_directory) if file_name.endswith(".npy")}
+        result[table_name] = ColumnarTable(table_name, {name: _column_from_arrays(name, kind, arrays)
+                                                        for name, kind in kinds.items()})
+    return Catalogue(result, manifest)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m materials.columnar",
+                                     description="Выгрузка базы данных материалов в колоночные файлы")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="выгрузить все таблицы")
+    export.add_argument("directory", help="каталог выгрузки")
+    export.add_argument("--format", choices=FORMATS, default="npy", help="формат файлов (по умолчанию npy)")
+    args = parser.parse_args(argv)
+
+    manifest = export_catalogue(args.directory, args.format)
+    for table_name, table in manifest["tables"].items():
+        print(f"{table_name}: {table['rows']} строк, {len(table['columns'])} столбцов")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
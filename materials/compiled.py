@@ -0,0 +1,566 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль компилирует базу данных материалов в двоичный файл только для чтения и открывает его через `mmap`. При
+запуске процесса не нужно открывать SQLite, выполнять запросы и создавать объекты ORM: файл отображается в память, а
+данные читаются при обращении. Страницы файла находятся в общем кэше операционной системы, поэтому несколько рабочих
+процессов на одном узле используют одну копию данных.
+
+Формат файла (порядок байтов little-endian, секции выровнены по 8 байт):
+- сигнатура `MATCAT01`, длина заголовка (uint32) и заголовок в JSON: ревизия Alembic, размер и время изменения
+  исходного файла базы данных, смещения и типы секций;
+- `strings.offsets`, `strings.data`: все строки базы данных (без повторов) в кодировке UTF-8 и смещения их начала;
+- `table.<таблица>`: записи таблицы фиксированной ширины (структурный тип NumPy) в порядке id. Целые числа хранятся
+  как int64 (`INT_NULL` - NULL), вещественные как float64 (NaN - NULL), строки как номер строки int32 (-1 - NULL);
+- `brands`: номера записей `materials`, упорядоченные по бренду (индекс бренд -> запись для двоичного поиска);
+- `links`: для каждого материала номер первой (по id) записи каждой таблицы `crud.BULK_TABLES` (-1 - записи нет);
+- `standards`: для каждого материала номер строки стандарта химического состава (-1 - стандарт не найден);
+- `standard_names`: номера первых (по id) записей `standards` для каждого наименования материала, упорядоченные по
+  наименованию (стандарт наименований, которых нет в `materials`);
+- `composition`: числовые диапазоны химического состава: массив (материал, элемент `ELEMENT_COLUMNS`, min/max) с NaN
+  для неуказанных элементов.
+
+Механические свойства и твердость в числовом виде доступны как секции производных таблиц
+`table.mechanical_property_values` и `table.hardness_values`.
+
+Основные компоненты:
+- `COMPILED_PATH`: Путь к скомпилированному файлу по умолчанию (рядом с `materials.db`, не хранится в репозитории).
+  Переопределяется переменной окружения `MATERIALS_COMPILED_PATH`.
+- `compile_catalogue(path, db)`: Компилирует базу данных в файл `path`.
+- `CompiledCatalogue`: Открытый скомпилированный файл. Методы повторяют методы `MaterialsSnapshot` и возвращают
+  записи из модуля `materials.records`.
+- `get_compiled_catalogue(path)`: Возвращает общий открытый файл; если файла нет или он устарел (база данных изменена
+  после компиляции), файл компилируется при первом обращении. Если каталог `COMPILED_PATH` недоступен для записи
+  (пакет установлен в site-packages), файл компилируется в каталог кэша пользователя (`$XDG_CACHE_HOME/materials` или
+  `~/.cache/materials`), а если не удалось и это - возвращается снимок базы данных SQLite (`snapshot.get_snapshot()`)
+  с теми же методами.
+
+Использование:
+Компиляция при сборке образа:
+
+    python -m materials.compiled
+
+Работа с файлом:
+
+    from materials.compiled import get_compiled_catalogue
+
+    catalogue = get_compiled_catalogue()
+    composition = catalogue.get_chemical_composition_by_brand("30ХМА")
+    print(composition.C, catalogue.get_chemical_element_ranges_by_brand("30ХМА")["C"])
+"""
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import Float, Integer, select
+from sqlalchemy.orm import Session
+
+from materials.crud import BULK_TABLES, BulkResult, _unique
+from materials.database import DATABASE_PATH, get_alembic_revision, session_scope
+from materials.models import Base, ChemicalComposition, ChemicalElementRange, Material, Standard
+from materials.parsers import ELEMENT_COLUMNS
+from materials.records import RECORD_CLASSES, Record, MaterialRecord, MaterialIndicesRecord, MaterialProfile
+from materials.snapshot import MaterialsSnapshot, get_snapshot
+
+COMPILED_PATH = os.getenv("MATERIALS_COMPILED_PATH",
+                          os.path.join(os.path.dirname(DATABASE_PATH), "materials.catalogue"))
+MAGIC = b"MATCAT01"
+FORMAT_VERSION = 2
+
+# Значение NULL для целочисленных столбцов
+INT_NULL = np.iinfo(np.int64).min
+
+# Таблицы, которые не компилируются
+_SKIPPED_TABLES = {"alembic_version"}
+
+_ALIGNMENT = 8
+_PREFIX = struct.Struct("<8sI")
+
+# Соответствие имен таблиц и классов записей
+_RECORD_CLASSES_BY_TABLE = {model.__tablename__: record_class for model, record_class in RECORD_CLASSES.items()}
+
+
+# Функция для получения типа поля записи фиксированной ширины по типу столбца
+def _field_type(column) -> str:
+    if isinstance(column.type, Integer):
+        return "<i8"
+    if isinstance(column.type, Float):
+        return "<f8"
+    return "<i4"
+
+
+class _StringPool:
+    """Набор строк без повторов для компиляции: строка -> номер."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def add(self, value) -> int:
+        if value is None:
+            return -1
+        value = str(value)
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.ids)
+        return index
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        encoded = [value.encode("utf-8") for value in self.ids]
+        offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+# Функция для преобразования строк таблицы в массив записей фиксированной ширины
+def _table_array(table, rows: list, strings: _StringPool) -> np.ndarray:
+    dtype = np.dtype([(column.key, _field_type(column)) for column in table.columns])
+    array = np.zeros(len(rows), dtype=dtype)
+    for index, column in enumerate(table.columns):
+        values = [row[index] for row in rows]
+        if dtype[column.key].kind == "f":
+            array[column.key] = [np.nan if value is None else value for value in values]
+        elif isinstance(column.type, Integer):
+            array[column.key] = [INT_NULL if value is None else value for value in values]
+        else:
+            array[column.key] = [strings.add(value) for value in values]
+    return array
+
+
+# Функция для построения всех секций скомпилированного файла
+def _build_sections(db: Session) -> Dict[str, np.ndarray]:
+    strings = _StringPool()
+    sections = {}
+    rows_by_table = {}
+    for table in Base.metadata.sorted_tables:
+        if table.name in _SKIPPED_TABLES:
+            continue
+        rows = db.execute(select(table).order_by(*table.primary_key.columns)).all()
+        rows_by_table[table.name] = rows
+        sections[f"table.{table.name}"] = _table_array(table, rows, strings)
+
+    materials = sections[f"table.{Material.__tablename__}"]
+    brands = [row.brand for row in rows_by_table[Material.__tablename__]]
+    sections["brands"] = np.array(sorted(range(len(brands)), key=lambda index: (brands[index], index)), dtype="<i4")
+    row_by_material_id = {int(material_id): index for index, material_id in enumerate(materials["id"])}
+
+    # Первые по id записи таблиц свойств для каждого материала
+    links = np.full((len(materials), len(BULK_TABLES)), -1, dtype="<i4")
+    first_composition_ids = {}
+    for column, model in enumerate(BULK_TABLES.values()):
+        for index, row in enumerate(rows_by_table[model.__tablename__]):
+            material_row = row_by_material_id.get(row.material_id)
+            if material_row is not None and links[material_row, column] < 0:
+                links[material_row, column] = index
+                if model.__tablename__ == "chemical_composition":
+                    first_composition_ids[row.id] = material_row
+    sections["links"] = links
+
+    # Стандарт химического состава, как в `crud`: стандарт первого по id состава со standard_id, иначе первая по id
+    # запись standards с material_name, равным бренду
+    standard_by_id = {}
+    standard_by_name = {}
+    for row in rows_by_table[Standard.__tablename__]:
+        standard_by_id[row.id] = row.standard
+        standard_by_name.setdefault(row.material_name, row.standard)
+    standard_by_row = {}
+    for row in rows_by_table[ChemicalComposition.__tablename__]:
+        material_row = row_by_material_id.get(row.material_id)
+        if material_row is not None and row.standard_id in standard_by_id:
+            standard_by_row.setdefault(material_row, standard_by_id[row.standard_id])
+    sections["standards"] = np.array([strings.add(standard_by_row.get(index, standard_by_name.get(brand)))
+                                      for index, brand in enumerate(brands)], dtype="<i4")
+    first_standard_rows = {}
+    for index, row in enumerate(rows_by_table[Standard.__tablename__]):
+        first_standard_rows.setdefault(row.material_name, index)
+    sections["standard_names"] = np.array([first_standard_rows[name] for name in sorted(first_standard_rows)],
+                                          dtype="<i4")
+
+    composition = np.full((len(materials), len(ELEMENT_COLUMNS), 2), np.nan, dtype="<f8")
+    element_index = {element: index for index, element in enumerate(ELEMENT_COLUMNS)}
+    for row in rows_by_table[ChemicalElementRange.__tablename__]:
+        material_row = first_composition_ids.get(row.chemical_composition_id)
+        if material_row is not None and row.element in element_index:
+            composition[material_row, element_index[row.element]] = (row.min_value, row.max_value)
+    sections["composition"] = composition
+
+    sections["strings.offsets"], sections["strings.data"] = strings.arrays()
+    return sections
+
+
+# Функция для записи секций в файл path (через временный файл, чтобы открытые процессы не видели частичной записи)
+def _write_sections(path: str, sections: Dict[str, np.ndarray], header: dict) -> None:
+    def align(position: int) -> int:
+        return (position + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+    # Смещения секций зависят от длины заголовка, поэтому заголовок вычисляется, пока его длина не перестанет меняться
+    header["sections"] = {}
+    header_size = -1
+    while True:
+        encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if len(encoded) == header_size:
+            break
+        header_size = len(encoded)
+        position = align(_PREFIX.size + header_size)
+        for name, array in sections.items():
+            header["sections"][name] = {"offset": position, "dtype": array.dtype.descr, "shape": list(array.shape)}
+            position = align(position + array.nbytes)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".materials-", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(_PREFIX.pack(MAGIC, header_size))
+            file.write(encoded)
+            for name, array in sections.items():
+                file.write(b"\0" * (header["sections"][name]["offset"] - file.tell()))
+                file.write(np.ascontiguousarray(array).tobytes())
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+# Функция для получения размера и времени изменения файла базы данных (для проверки актуальности компиляции)
+def _source_stamp(source: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+# Функция для компиляции базы данных в файл path. Возвращает заголовок файла
+def compile_catalogue(path: str = COMPILED_PATH, db: Optional[Session] = None) -> dict:
+    with session_scope(db) as db:
+        sections = _build_sections(db)
+        header = {
+            "version": FORMAT_VERSION,
+            "revision": get_alembic_revision(db),
+            "source": _source_stamp(DATABASE_PATH),
+            "elements": list(ELEMENT_COLUMNS),
+            "bulk_tables": list(BULK_TABLES),
+        }
+    _write_sections(path, sections, header)
+    return header
+
+
+class _StringTable:
+    """Строки скомпилированного файла: номер строки -> str (декодируется при обращении)."""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self._offsets = offsets
+        self._data = data
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if index < 0:
+            return None
+        return bytes(self._data[self._offsets[index]:self._offsets[index + 1]]).decode("utf-8")
+
+
+class _SortedBrands(Sequence):
+    """
+    Строки в порядке возрастания (представление секций `brands` и `standard_names` для двоичного поиска): order -
+    номера записей таблицы по порядку, brand_ids - номера строк столбца таблицы.
+    """
+
+    def __init__(self, order: np.ndarray, brand_ids: np.ndarray, strings: _StringTable):
+        self._order = order
+        self._brand_ids = brand_ids
+        self._strings = strings
+
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, index: int) -> str:
+        return self._strings[int(self._brand_ids[self._order[index]])]
+
+
+class CompiledCatalogue:
+    """Скомпилированный файл базы данных, отображенный в память. Методы повторяют методы `MaterialsSnapshot`."""
+
+    def __init__(self, path: str = COMPILED_PATH):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_size = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Файл '{path}' не является скомпилированной базой данных материалов")
+        self.header = json.loads(bytes(self._mmap[_PREFIX.size:_PREFIX.size + header_size]).decode("utf-8"))
+        if self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия скомпилированного файла: {self.header.get('version')}")
+        self.revision = self.header["revision"]
+
+        self._sections = {}
+        for name, section in self.header["sections"].items():
+            dtype = np.dtype([tuple(field) for field in section["dtype"]]) if name.startswith("table.") \
+                else np.dtype(section["dtype"][0][1])
+            count = int(np.prod(section["shape"]))
+            self._sections[name] = np.frombuffer(self._mmap, dtype=dtype, count=count,
+                                                 offset=section["offset"]).reshape(section["shape"])
+        self._strings = _StringTable(self._sections["strings.offsets"], self._sections["strings.data"])
+        self._materials = self.table(Material.__tablename__)
+        self._brands = _SortedBrands(self._sections["brands"], self._materials["brand"], self._strings)
+        self._standards = self.table(Standard.__tablename__)
+        self._standard_names = _SortedBrands(self._sections["standard_names"], self._standards["material_name"],
+                                             self._strings)
+        self._link_columns = {name: index for index, name in enumerate(self.header["bulk_tables"])}
+        self._elements = self.header["elements"]
+
+    def __len__(self):
+        return len(self._materials)
+
+    def __contains__(self, brand: str):
+        return self._material_row(brand) is not None
+
+    def __repr__(self):
+        return f"<CompiledCatalogue(path={self.path}, revision={self.revision}, materials={len(self)})>"
+
+    def close(self) -> None:
+        # Отображение можно закрыть только после освобождения всех массивов, ссылающихся на него
+        self._sections.clear()
+        self._strings = self._materials = self._brands = self._standards = self._standard_names = None
+        self._mmap.close()
+
+    def table(self, name: str) -> np.ndarray:
+        """Возвращает секцию таблицы - массив записей фиксированной ширины (строки - номера в наборе строк)."""
+        return self._sections[f"table.{name}"]
+
+    def string(self, index: int) -> Optional[str]:
+        """Возвращает строку по номеру из секции таблицы (None для -1)."""
+        return self._strings[int(index)]
+
+    def is_stale(self, source: str = DATABASE_PATH) -> bool:
+        """Проверяет, изменялся ли файл базы данных после компиляции."""
+        stamp = _source_stamp(source)
+        return stamp is not None and stamp != self.header.get("source")
+
+    # Функция для поиска номера записи materials по бренду двоичным поиском
+    def _material_row(self, brand: str) -> Optional[int]:
+        position = bisect_left(self._brands, brand)
+        if position < len(self._brands) and self._brands[position] == brand:
+            return int(self._sections["brands"][position])
+        return None
+
+    # Функция для поиска номера первой записи standards по наименованию материала двоичным поиском
+    def _standard_row(self, name: str) -> Optional[int]:
+        position = bisect_left(self._standard_names, name)
+        if position < len(self._standard_names) and self._standard_names[position] == name:
+            return int(self._sections["standard_names"][position])
+        return None
+
+    def _record(self, table_name: str, row: int) -> Record:
+        table = self.table(table_name)
+        values = []
+        for name in table.dtype.names:
+            value = table[row][name]
+            kind = table.dtype[name].kind
+            if kind == "f":
+                values.append(None if np.isnan(value) else float(value))
+            elif table.dtype[name].itemsize == 8:
+                values.append(None if value == INT_NULL else int(value))
+            else:
+                values.append(self._strings[int(value)])
+        return _RECORD_CLASSES_BY_TABLE[table_name](*values)
+
+    def _related_record(self, name: str, material_row: int) -> Optional[Record]:
+        row = int(self._sections["links"][material_row, self._link_columns[name]])
+        return self._record(BULK_TABLES[name].__tablename__, row) if row >= 0 else None
+
+    def _related_by_brand(self, name: str, brand: str) -> Optional[Record]:
+        material_row = self._material_row(brand)
+        return self._related_record(name, material_row) if material_row is not None else None
+
+    def _by_brands(self, function, brands: Iterable[str]) -> BulkResult:
+        brands = _unique(brands)
+        found = {brand: function(brand) for brand in brands if brand in self}
+        return BulkResult(found, [brand for brand in brands if brand not in found])
+
+    def get_material_by_brand(self, brand: str) -> Optional[MaterialRecord]:
+        material_row = self._material_row(brand)
+        return self._record(Material.__tablename__, material_row) if material_row is not None else None
+
+    def get_material_class_index_by_id(self, index_id: int) -> Optional[MaterialIndicesRecord]:
+        indices = self.table("material_indices")
+        row = int(np.searchsorted(indices["id"], index_id))
+        if row < len(indices) and indices["id"][row] == index_id:
+            return self._record("material_indices", row)
+        return None
+
+    def get_hardness_by_brand(self, brand: str):
+        return self._related_by_brand("hardness", brand)
+
+    def get_chemical_composition_by_brand(self, brand: str):
+        return self._related_by_brand("chemical_composition", brand)
+
+    def get_technological_properties_by_brand(self, brand: str):
+        return self._related_by_brand("technological_properties", brand)
+
+    def get_mechanical_properties_by_brand(self, brand: str):
+        return self._related_by_brand("mechanical_properties", brand)
+
+    def get_characteristics_by_brand(self, brand: str):
+        return self._related_by_brand("characteristics", brand)
+
+    def get_chemical_element_ranges_by_brand(self, brand: str) -> Optional[Dict[str, Tuple[float, float]]]:
+        material_row = self._material_row(brand)
+        if material_row is None:
+            return None
+        ranges = self._sections["composition"][material_row]
+        return {element: (float(ranges[index, 0]), float(ranges[index, 1]))
+                for index, element in enumerate(self._elements) if not np.isnan(ranges[index, 0])}
+
+    def composition_matrix(self) -> np.ndarray:
+        """Возвращает диапазоны химического состава всех материалов: массив (материал, элемент, min/max)."""
+        return self._sections["composition"]
+
+    def get_all_brands(self) -> List[str]:
+        brands = self._materials["brand"]
+        return list(dict.fromkeys(self._strings[int(index)] for index in brands))
+
+    def get_brands_by_material_class_index(self, index_of_material_class: int) -> List[str]:
+        indices = self.table("material_indices")
+        material_ids = indices["material_id"][indices["index_of_material_class"] == index_of_material_class]
+        rows = np.searchsorted(self._materials["id"], material_ids)
+        return [self._strings[int(self._materials["brand"][row])] for row, material_id in zip(rows, material_ids)
+                if row < len(self._materials) and self._materials["id"][row] == material_id]
+
+    def get_standard_of_chemical_composition_by_brand(self, brand: str) -> Optional[str]:
+        material_row = self._material_row(brand)
+        if material_row is not None:
+            return self._strings[int(self._sections["standards"][material_row])]
+        standard_row = self._standard_row(brand)
+        return self._strings[int(self._standards["standard"][standard_row])] if standard_row is not None else None
+
+    def get_brands_by_standard(self, standard: str) -> List[str]:
+        standards = self._standards
+        matches = np.isin(standards["standard"], [index for index in np.unique(standards["standard"])
+                                                  if self._strings[int(index)] == standard])
+        compositions = self.table(ChemicalComposition.__tablename__)
+        material_ids = compositions["material_id"][np.isin(compositions["standard_id"], standards["id"][matches])]
+        brands = set(map(self.string, self._materials["brand"][np.isin(self._materials["id"], material_ids)]))
+        brands.update(name for name in map(self.string, standards["material_name"][matches]) if name in self)
+        return sorted(brands)
+
+    def get_materials_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._by_brands(self.get_material_by_brand, brands)
+
+    def get_hardness_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._by_brands(self.get_hardness_by_brand, brands)
+
+    def get_chemical_composition_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._by_brands(self.get_chemical_composition_by_brand, brands)
+
+    def get_technological_properties_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._by_brands(self.get_technological_properties_by_brand, brands)
+
+    def get_mechanical_properties_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._by_brands(self.get_mechanical_properties_by_brand, brands)
+
+    def get_characteristics_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._by_brands(self.get_characteristics_by_brand, brands)
+
+    def get_standards(self, brands: Iterable[str]) -> BulkResult:
+        brands = _unique(brands)
+        found = {brand: self.get_standard_of_chemical_composition_by_brand(brand) for brand in brands
+                 if brand in self or self._standard_row(brand) is not None}
+        return BulkResult(found, [brand for brand in brands if brand not in found])
+
+    def get_materials_bulk(self, brands: Iterable[str], include: Optional[Iterable[str]] = None) -> BulkResult:
+        include = list(BULK_TABLES) if include is None else _unique(include)
+        unknown = [name for name in include if name not in BULK_TABLES]
+        if unknown:
+            raise ValueError(f"Неизвестные таблицы для пакетной загрузки: {unknown}. Доступны: {list(BULK_TABLES)}")
+
+        def bulk(brand):
+            material_row = self._material_row(brand)
+            result = {"material": self._record(Material.__tablename__, material_row)}
+            result.update({name: self._related_record(name, material_row) for name in include})
+            return result
+
+        return self._by_brands(bulk, brands)
+
+    def get_material_profile(self, brand: str) -> Optional[MaterialProfile]:
+        material_row = self._material_row(brand)
+        if material_row is None:
+            return None
+        return MaterialProfile(brand=brand, material=self._record(Material.__tablename__, material_row),
+                               standard=self._strings[int(self._sections["standards"][material_row])],
+                               **{name: self._related_record(name, material_row) for name in BULK_TABLES})
+
+    def get_material_profiles(self, brands: Iterable[str]) -> BulkResult:
+        return self._by_brands(self.get_material_profile, brands)
+
+
+logger = logging.getLogger("materials.compiled")
+
+_catalogue: Optional[Union[CompiledCatalogue, MaterialsSnapshot]] = None
+_catalogue_path: Optional[str] = None
+_catalogue_lock = threading.Lock()
+
+
+# Функция для получения пути к скомпилированному файлу в каталоге кэша пользователя
+def _cache_path() -> str:
+    cache_dir = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "materials", "materials.catalogue")
+
+
+# Функция для открытия файла path. Отсутствующий или устаревший файл компилируется заново (OSError - файл не удалось
+# записать)
+def _open_catalogue(path: str) -> CompiledCatalogue:
+    try:
+        catalogue = CompiledCatalogue(path) if os.path.exists(path) else None
+    except ValueError:
+        # Файл другой версии формата компилируется заново
+        catalogue = None
+    if catalogue is None or catalogue.is_stale():
+        if catalogue is not None:
+            catalogue.close()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        compile_catalogue(path)
+        catalogue = CompiledCatalogue(path)
+    return catalogue
+
+
+# Функция для получения общего скомпилированного файла. Без path файл ищется по пути COMPILED_PATH, затем в каталоге
+# кэша пользователя; если файл не удалось записать ни туда, ни по явно заданному пути, возвращается снимок базы данных
+def get_compiled_catalogue(path: Optional[str] = None) -> Union[CompiledCatalogue, MaterialsSnapshot]:
+    global _catalogue, _catalogue_path
+    if _catalogue is None or _catalogue_path != path:
+        with _catalogue_lock:
+            if _catalogue is None or _catalogue_path != path:
+                catalogue = None
+                for candidate in [path] if path is not None else [COMPILED_PATH, _cache_path()]:
+                    try:
+                        catalogue = _open_catalogue(candidate)
+                        break
+                    except OSError as error:
+                        logger.warning("Не удалось записать скомпилированный файл '%s': %s", candidate, error)
+                _catalogue = catalogue if catalogue is not None else get_snapshot()
+                _catalogue_path = path
+    return _catalogue
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m materials.compiled",
+                                     description="Компиляция базы данных материалов в файл для отображения в память")
+    parser.add_argument("path", nargs="?", default=COMPILED_PATH, help=f"путь к файлу (по умолчанию {COMPILED_PATH})")
+    args = parser.parse_args(argv)
+
+    header = compile_catalogue(args.path)
+    print(f"{args.path}: ревизия {header['revision']}, {os.path.getsize(args.path)} байт")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль реализует поиск марок материалов по ограничениям на химический состав.
+
+Диапазоны содержания элементов всех материалов (таблица `chemical_element_ranges`) один раз загружаются в матрицы NumPy
+`mins` и `maxs` размером (материалы x элементы). Проверка ограничений выполняется векторно над всеми материалами сразу,
+без цикла по объектам ORM. Матрица строится при первом поиске и перестраивается после подтверждения транзакции,
+изменившей данные через сессии пакета (см. `database.get_write_generation`): таблица `chemical_element_ranges` к этому
+моменту уже обновлена обработчиком записи (`derived.DERIVED_TABLES`). После изменения `chemical_composition` в обход
+ORM нужно перестроить таблицу диапазонов (`derived.rebuild_chemical_element_ranges`); матрица перестроится при
+следующем изменении данных через сессии пакета.
+
+Ограничения задаются именованными аргументами, имена которых совпадают со столбцами модели `ChemicalComposition`:
+- `C=(0.2, 0.35)`: содержание углерода в диапазоне от 0.2 до 0.35%;
+- `Ni_max=0.3`: содержание никеля не более 0.3% (то же, что `Ni=(0, 0.3)`);
+- `Mo_min=0.15`: содержание молибдена не менее 0.15%;
+- `Cr=1.0`: содержание хрома 1.0%.
+
+Материал удовлетворяет ограничению, если диапазон содержания элемента по стандарту пересекается с заданным диапазоном.
+Элементы, содержание которых для материала не указано, считаются отсутствующими (0%). Оценка совпадения по элементу -
+доля диапазона материала, попадающая в заданный диапазон (1.0 - диапазон материала целиком внутри ограничения); общая
+оценка - среднее оценок по всем ограничениям.
+
+Основные компоненты:
+- `CompositionMatrix`: Матрицы диапазонов содержания элементов всех материалов.
+- `CompositionMatch`: Результат поиска: бренд и оценка совпадения.
+- `get_composition_matrix()`: Возвращает общую матрицу, построенную при первом обращении.
+- `find_by_composition(min_score, limit, **constraints)`: Возвращает материалы, удовлетворяющие ограничениям.
+
+Использование:
+    from materials.composition_search import find_by_composition
+
+    for match in find_by_composition(C=(0.2, 0.35), Cr=(0.8, 1.1), Ni_max=0.3, limit=10):
+        print(match.brand, match.score)
+"""
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from materials.database import get_write_generation, session_scope
+from materials.models import ChemicalElementRange, Material
+from materials.parsers.composition import ELEMENT_COLUMNS, MAX_CONTENT
+
+Bound = Union[float, Tuple[float, float]]
+
+
+class CompositionMatch(NamedTuple):
+    """Материал, удовлетворяющий ограничениям на химический состав, и оценка совпадения от 0 до 1."""
+    brand: str
+    score: float
+
+
+class CompositionMatrix:
+    """Диапазоны содержания элементов всех материалов в виде матриц NumPy (материалы x элементы)."""
+
+    def __init__(self, brands: List[str], classes: List[str], elements: Tuple[str, ...], mins: np.ndarray,
+                 maxs: np.ndarray):
+        self.brands = np.asarray(brands, dtype=object)
+        self.classes = np.asarray(classes, dtype=object)
+        self.elements = elements
+        self.element_index = {element: index for index, element in enumerate(elements)}
+        self.brand_index = {brand: index for index, brand in enumerate(brands)}
+        self.mins = mins
+        self.maxs = maxs
+
+    @classmethod
+    def load(cls, db: Optional[Session] = None) -> "CompositionMatrix":
+        """Строит матрицы по таблице `chemical_element_ranges` одним запросом."""
+        elements = ELEMENT_COLUMNS
+        element_index = {element: index for index, element in enumerate(elements)}
+        query = select(Material.brand, Material.class_of_material, ChemicalElementRange.element,
+                       ChemicalElementRange.min_value, ChemicalElementRange.max_value) \
+            .join(Material, Material.id == ChemicalElementRange.material_id) \
+            .order_by(Material.brand)
+        with session_scope(db) as db:
+            rows = db.execute(query).all()
+
+        row_index: Dict[str, int] = {}
+        classes: List[str] = []
+        for brand, class_of_material, *_ in rows:
+            if brand not in row_index:
+                row_index[brand] = len(row_index)
+                classes.append(class_of_material)
+        mins = np.zeros((len(row_index), len(elements)))
+        maxs = np.zeros((len(row_index), len(elements)))
+        for brand, _, element, min_value, max_value in rows:
+            column = element_index.get(element)
+            if column is not None:
+                mins[row_index[brand], column] = min_value
+                maxs[row_index[brand], column] = max_value
+        return cls(list(row_index), classes, elements, mins, maxs)
+
+    def __len__(self):
+        return len(self.brands)
+
+    def _parse_constraints(self, constraints: Dict[str, Bound]) -> List[Tuple[int, float, float]]:
+        parsed = []
+        for name, bound in constraints.items():
+            element, suffix = name, None
+            if name not in self.element_index and name.rsplit("_", 1)[-1] in ("min", "max"):
+                element, suffix = name.rsplit("_", 1)
+            if element not in self.element_index:
+                raise ValueError(f"Неизвестный элемент '{element}'. Доступны: {list(self.elements)}")
+            if suffix == "max":
+                low, high = 0.0, float(bound)
+            elif suffix == "min":
+                low, high = float(bound), MAX_CONTENT
+            elif isinstance(bound, (tuple, list)):
+                low, high = (float(value) for value in bound)
+            else:
+                low = high = float(bound)
+            if low > high:
+                raise ValueError(f"Нижняя граница больше верхней для '{name}': {bound}")
+            parsed.append((self.element_index[element], low, high))
+        return parsed
+
+    def scores(self, **constraints: Bound) -> np.ndarray:
+        """Возвращает оценку совпадения для каждого материала (NaN - ограничения не выполнены)."""
+        total = np.zeros(len(self))
+        matched = np.ones(len(self), dtype=bool)
+        for column, low, high in self._parse_constraints(constraints):
+            mins, maxs = self.mins[:, column], self.maxs[:, column]
+            overlap = np.minimum(maxs, high) - np.maximum(mins, low)
+            matched &= overlap >= 0
+            width = maxs - mins
+            with np.errstate(divide="ignore", invalid="ignore"):
+                total += np.where(width > 0, np.clip(overlap, 0, None) / width, 1.0)
+        scores = total / max(len(constraints), 1)
+        scores[~matched] = np.nan
+        return scores
+
+    def find(self, min_score: float = 0.0, limit: Optional[int] = None, **constraints: Bound) -> List[CompositionMatch]:
+        """Возвращает материалы, удовлетворяющие ограничениям, в порядке убывания оценки."""
+        scores = self.scores(**constraints)
+        candidates = np.flatnonzero(scores >= min_score)
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        if limit is not None:
+            order = order[:limit]
+        return [CompositionMatch(self.brands[index], float(scores[index])) for index in order]
+
+
+_matrix: Optional[CompositionMatrix] = None
+_matrix_generation: Optional[int] = None
+_matrix_lock = threading.Lock()
+
+
+# Функция для получения общей матрицы состава (строится при первом обращении и после изменения данных)
+def get_composition_matrix() -> CompositionMatrix:
+    global _matrix, _matrix_generation
+    generation = get_write_generation()
+    if _matrix is None or _matrix_generation != generation:
+        with _matrix_lock:
+            if _matrix is None or _matrix_generation != generation:
+                _matrix = CompositionMatrix.load()
+                _matrix_generation = generation
+    return _matrix
+
+
+# Функция для поиска материалов по ограничениям на химический состав
+def find_by_composition(min_score: float = 0.0, limit: Optional[int] = None,
+                        **constraints: Bound) -> List[CompositionMatch]:
+    return get_composition_matrix().find(min_score=min_score, limit=limit, **constraints)
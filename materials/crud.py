@@ -8,29 +8,127 @@
 технологические и механические свойства.
 
 Основные функции:
-- `get_material_by_brand(brand, db)`: Проверяет существование материала по бренду и возвращает объект `Material`.
+- `get_material_by_brand(brand, db)`: Проверяет существование материала по бренду и возвращает запись `MaterialRecord`.
 - `get_material_class_index_by_id(index_id, db)`: Получает индекс класса материала по идентификатору.
 - `get_hardness_by_brand(brand, db)`: Возвращает информацию о твердости материала по бренду.
 - `get_chemical_composition_by_brand(brand, db)`: Возвращает химический состав материала по бренду.
 - `get_technological_properties_by_brand(brand, db)`: Возвращает технологические свойства материала по бренду.
 - `get_mechanical_properties_by_brand(brand, db)`: Возвращает механические свойства материала по бренду.
 - `get_characteristics_by_brand(brand, db)`: Возвращает дополнительные характеристики материала по бренду.
+- `get_chemical_element_ranges_by_brand(brand, db)`: Возвращает числовые диапазоны содержания элементов по бренду.
+- `find_by_mechanical_property(property_name, min_value, max_value, product_form, db)`: Возвращает значения
+  механического свойства в заданных пределах (например, отливки с пределом текучести не менее 600 МПа).
+- `find_by_hardness(min_value, max_value, scale, db)`: Возвращает значения твердости, пересекающиеся с заданным
+  диапазоном; значения в других шкалах учитываются после перевода диапазона в их шкалу.
+- `find_by_foreign_analog(grade, standard_system, db)`: Возвращает материалы, зарубежным аналогом которых является
+  марка `grade` (например, 'AISI 4130' или '1.7218').
+- `get_foreign_analogs_by_brand(brand, standard_system, db)`: Возвращает зарубежные аналоги материала по бренду.
+- `search_characteristics(query, limit, db)`: Возвращает характеристики материалов, найденные полнотекстовым поиском
+  по классификации, применению, зарубежным аналогам и дополнительной информации, в порядке релевантности.
 - `query_data_example(brand, db)`: Пример вызова функций для запроса данных по бренду.
 
+Пакетные функции (один `IN`-запрос на таблицу вместо двух запросов на каждый бренд):
+- `get_materials_by_brands(brands, db)`: Возвращает записи `MaterialRecord` для списка брендов.
+- `get_hardness_by_brands(brands, db)`, `get_chemical_composition_by_brands(brands, db)`,
+  `get_technological_properties_by_brands(brands, db)`, `get_mechanical_properties_by_brands(brands, db)`,
+  `get_characteristics_by_brands(brands, db)`: Возвращают записи соответствующей таблицы для списка брендов.
+- `get_materials_bulk(brands, include, db)`: Возвращает материал и выбранные таблицы свойств для списка брендов.
+- `get_standards(brands, db)`: Возвращает стандарты химического состава для списка брендов.
+
+Стандарт химического состава определяется через внешний ключ `ChemicalComposition.standard_id`; для составов без
+`standard_id` и для наименований, которых нет в таблице `materials`, стандарт ищется по наименованию материала
+(`Standard.material_name`). Обратный поиск
+`get_brands_by_standard(standard, db)` возвращает все бренды, химический состав которых соответствует стандарту.
+
+Профиль материала (материал и стандарт одним запросом, таблицы свойств - по одному запросу `selectinload` на таблицу):
+- `get_material_profile(brand, db)`: Возвращает `MaterialProfile` - неизменяемый профиль материала из записей только
+  для чтения, не связанный с сессией.
+- `get_material_profiles(brands, db)`: Возвращает профили для списка брендов (те же запросы на каждые
+  `BULK_CHUNK_SIZE` брендов).
+
+Потоковое чтение таблиц (строки читаются из курсора частями по `ITER_BATCH_SIZE` с `yield_per`, расход памяти не
+зависит от размера таблицы):
+- `iter_rows(table, fields, batch_size, db)`: Возвращает генератор строк таблицы (именованных кортежей `Row`) с
+  полями `fields` в порядке id. Для таблиц со столбцом `material_id` доступно поле 'brand'.
+- `iter_materials(fields, batch_size, db)`, `iter_chemical_compositions(fields, batch_size, db)`,
+  `iter_mechanical_properties(fields, batch_size, db)`: То же для таблиц materials, chemical_composition и
+  mechanical_properties.
+- `iter_brands(batch_size, db)`: Возвращает генератор всех брендов.
+
+Параметр `db` во всех функциях необязателен: если сессия не передана, функция получает сессию текущего потока через
+`session_scope` и закрывает ее по завершении вызова.
+
+Функции возвращают не объекты ORM, а неизменяемые записи модуля `materials.records` (`MaterialRecord`,
+`ChemicalCompositionRecord` и т.д.), построенные прямо из строк запросов Core. Атрибуты записей совпадают со столбцами
+моделей; записи не связаны с сессией, не загружают связи (relationship) и занимают в несколько раз меньше памяти.
+Химический состав хранится разреженно - только заполненные элементы (`ChemicalCompositionRecord.items()`).
+
+Пакетные функции возвращают `BulkResult` - словарь, ключами которого являются бренды. Бренды, отсутствующие в базе
+данных, не печатаются, а перечисляются в атрибуте `missing` результата.
+
 Использование этих функций помогает упростить работу с базой данных и предоставляет удобные методы для доступа к
 различным свойствам материалов.
 """
 
-from sqlalchemy.orm import Session
-from typing import Optional, List
+import re
+
+from sqlalchemy import Row, Select, bindparam, inspect, literal_column, or_, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import Optional, List, Dict, Iterable, Iterator, Sequence, Tuple
 from materials.models import Material, MaterialIndices, Hardness, ChemicalComposition, TechnologicalProperties, \
-    MechanicalProperties, CharacteristicsOfMaterial, Standard
-from materials.database import SessionLocal
+    MechanicalProperties, CharacteristicsOfMaterial, Standard, ChemicalElementRange, MechanicalPropertyValue, \
+    HardnessValue, ForeignAnalog
+from materials.database import session_scope
+from materials.derived import characteristics_fts
+from materials.parsers import MECHANICAL_PROPERTY_COLUMNS, HARDNESS_SCALES, convert_hardness_range, normalize_grade, \
+    parse_foreign_grade
+from materials.records import RECORD_CLASSES, ChemicalCompositionRecord, CharacteristicsRecord, \
+    ForeignAnalogRecord, HardnessRecord, HardnessValueRecord, MaterialIndicesRecord, MaterialProfile, MaterialRecord, \
+    MechanicalPropertiesRecord, MechanicalPropertyValueRecord, Record, TechnologicalPropertiesRecord, to_record
+
+
+# Функция для построения запроса строк таблицы модели (столбцы в порядке атрибутов записи) с условиями `criteria`
+def _records_statement(model, *criteria) -> Select:
+    return select(model.__table__).where(*criteria).order_by(model.id)
+
+
+# Функция для построения записи только для чтения модели из строки запроса Core (None - строка не найдена или все
+# столбцы записи пусты, как при внешнем соединении без совпадения)
+def _to_record(model, row: Optional[Sequence]) -> Optional[Record]:
+    if row is None or row[0] is None:
+        return None
+    return RECORD_CLASSES[model](*row)
+
+
+# Функция для построения пар (бренд, запись) по строкам запроса (бренд, столбцы таблицы модели...)
+def _brand_records(model, rows: Iterable[Sequence]) -> List[Tuple[str, Optional[Record]]]:
+    return [(row[0], _to_record(model, row[1:])) for row in rows]
+
+
+# Запросы первой записи таблицы по значению столбца, построенные один раз (SQLAlchemy запоминает ключ кэша
+# скомпилированного запроса в объекте запроса): (модель, столбец) -> запрос с параметром `value`
+_FIRST_RECORD_STATEMENTS: Dict[Tuple[type, str], Select] = {}
+
+
+# Функция для получения запроса первой (по id) записи таблицы модели со значением столбца `column`
+def _first_record_statement(model, column) -> Select:
+    statement = _FIRST_RECORD_STATEMENTS.get((model, column.key))
+    if statement is None:
+        statement = _records_statement(model, column == bindparam("value")).limit(1)
+        statement = _FIRST_RECORD_STATEMENTS.setdefault((model, column.key), statement)
+    return statement
+
+
+# Функция для получения первой (по id) записи таблицы модели со значением столбца `column`. Запрос выполняется через
+# соединение сессии: строки Core не проходят через загрузку ORM
+def _first_record(model, db: Session, column, value) -> Optional[Record]:
+    return _to_record(model, db.connection().execute(_first_record_statement(model, column), {"value": value}).first())
 
 
 # Функция для проверки существования материала по бренду
-def get_material_by_brand(brand: str, db: Session = SessionLocal()) -> Optional[Material]:
-    material = db.query(Material).filter(Material.brand == brand).first()
+def get_material_by_brand(brand: str, db: Optional[Session] = None) -> Optional[MaterialRecord]:
+    with session_scope(db) as db:
+        material = _first_record(Material, db, Material.brand, brand)
     if not material:
         print(f"Материал с брендом '{brand}' не найден.")
         return None
@@ -38,8 +136,9 @@ def get_material_by_brand(brand: str, db: Session = SessionLocal()) -> Optional[
 
 
 # Функция для получения индекса класса материала по идентификатору
-def get_material_class_index_by_id(index_id: int, db: Session = SessionLocal()) -> Optional[MaterialIndices]:
-    material_class_index = db.query(MaterialIndices).filter(MaterialIndices.id == index_id).first()
+def get_material_class_index_by_id(index_id: int, db: Optional[Session] = None) -> Optional[MaterialIndicesRecord]:
+    with session_scope(db) as db:
+        material_class_index = _first_record(MaterialIndices, db, MaterialIndices.id, index_id)
     if not material_class_index:
         print(f"Индекс класса материала с id '{index_id}' не найден.")
         return None
@@ -47,69 +146,566 @@ def get_material_class_index_by_id(index_id: int, db: Session = SessionLocal())
 
 
 # Функция для запроса данных из таблицы Hardness
-def get_hardness_by_brand(brand: str, db: Session = SessionLocal()):
-    material = get_material_by_brand(brand, db)
-    if not material:
-        return None
-    hardness = db.query(Hardness).filter(Hardness.material_id == material.id).first()
+def get_hardness_by_brand(brand: str, db: Optional[Session] = None) -> Optional[HardnessRecord]:
+    with session_scope(db) as db:
+        material = get_material_by_brand(brand, db)
+        if not material:
+            return None
+        hardness = _first_record(Hardness, db, Hardness.material_id, material.id)
     return hardness
 
 
 # Функция для запроса данных из таблицы ChemicalComposition
-def get_chemical_composition_by_brand(brand: str, db: Session = SessionLocal()):
-    material = get_material_by_brand(brand, db)
-    if not material:
-        return None
-    chemical_composition = db.query(ChemicalComposition).filter(ChemicalComposition.material_id == material.id).first()
+def get_chemical_composition_by_brand(brand: str,
+                                      db: Optional[Session] = None) -> Optional[ChemicalCompositionRecord]:
+    with session_scope(db) as db:
+        material = get_material_by_brand(brand, db)
+        if not material:
+            return None
+        chemical_composition = _first_record(ChemicalComposition, db, ChemicalComposition.material_id, material.id)
     return chemical_composition
 
 
 # Функция для запроса данных из таблицы TechnologicalProperties
-def get_technological_properties_by_brand(brand: str, db: Session = SessionLocal()):
-    material = get_material_by_brand(brand, db)
-    if not material:
-        return None
-    technological_properties = db.query(TechnologicalProperties).filter(
-        TechnologicalProperties.material_id == material.id).first()
+def get_technological_properties_by_brand(brand: str,
+                                          db: Optional[Session] = None) -> Optional[TechnologicalPropertiesRecord]:
+    with session_scope(db) as db:
+        material = get_material_by_brand(brand, db)
+        if not material:
+            return None
+        technological_properties = _first_record(TechnologicalProperties, db,
+                                                 TechnologicalProperties.material_id, material.id)
     return technological_properties
 
 
 # Функция для запроса данных из таблицы MechanicalProperties
-def get_mechanical_properties_by_brand(brand: str, db: Session = SessionLocal()):
-    material = get_material_by_brand(brand, db)
-    if not material:
-        return None
-    mechanical_properties = db.query(MechanicalProperties).filter(
-        MechanicalProperties.material_id == material.id).first()
+def get_mechanical_properties_by_brand(brand: str,
+                                       db: Optional[Session] = None) -> Optional[MechanicalPropertiesRecord]:
+    with session_scope(db) as db:
+        material = get_material_by_brand(brand, db)
+        if not material:
+            return None
+        mechanical_properties = _first_record(MechanicalProperties, db, MechanicalProperties.material_id, material.id)
     return mechanical_properties
 
 
 # Функция для запроса данных из таблицы CharacteristicsOfMaterial
-def get_characteristics_by_brand(brand: str, db: Session = SessionLocal()):
-    material = get_material_by_brand(brand, db)
-    if not material:
-        return None
-    characteristics = db.query(CharacteristicsOfMaterial).filter(
-        CharacteristicsOfMaterial.material_id == material.id).first()
+def get_characteristics_by_brand(brand: str, db: Optional[Session] = None) -> Optional[CharacteristicsRecord]:
+    with session_scope(db) as db:
+        material = get_material_by_brand(brand, db)
+        if not material:
+            return None
+        characteristics = _first_record(CharacteristicsOfMaterial, db,
+                                        CharacteristicsOfMaterial.material_id, material.id)
     return characteristics
 
 
+# Функция для получения числовых диапазонов содержания химических элементов по бренду: элемент -> (min, max)
+def get_chemical_element_ranges_by_brand(brand: str,
+                                         db: Optional[Session] = None) -> Optional[Dict[str, Tuple[float, float]]]:
+    with session_scope(db) as db:
+        material = get_material_by_brand(brand, db)
+        if not material:
+            return None
+        rows = db.query(ChemicalElementRange.element, ChemicalElementRange.min_value, ChemicalElementRange.max_value) \
+            .filter(ChemicalElementRange.material_id == material.id).order_by(ChemicalElementRange.id).all()
+    return {element: (min_value, max_value) for element, min_value, max_value in rows}
+
+
+# Функция для построения запроса значений механического свойства (используется также модулем `materials.aio`)
+def _mechanical_property_statement(property_name: str, min_value: Optional[float], max_value: Optional[float],
+                                   product_form: Optional[str]) -> Select:
+    if property_name not in MECHANICAL_PROPERTY_COLUMNS:
+        raise ValueError(f"Неизвестное свойство '{property_name}'. Доступны: {list(MECHANICAL_PROPERTY_COLUMNS)}")
+    statement = select(Material.brand, MechanicalPropertyValue.__table__) \
+        .join(Material, Material.id == MechanicalPropertyValue.material_id) \
+        .where(MechanicalPropertyValue.property == property_name)
+    if product_form is not None:
+        # Сравнение по диапазону строк вместо LIKE позволяет SQLite использовать индекс
+        statement = statement.where(MechanicalPropertyValue.product_form >= product_form,
+                                    MechanicalPropertyValue.product_form < product_form + "\uffff")
+    if min_value is not None:
+        statement = statement.where(MechanicalPropertyValue.min_value >= min_value)
+    if max_value is not None:
+        statement = statement.where(MechanicalPropertyValue.max_value <= max_value)
+    return statement.order_by(Material.brand, MechanicalPropertyValue.id)
+
+
+# Функция для поиска значений механического свойства по пределам и виду проката.
+# `min_value` - значение свойства гарантированно не меньше заданного (нижняя граница по стандарту), `max_value` - не
+# больше заданного (верхняя граница); `product_form` - начало названия вида проката ('Лист' найдет и 'Лист тонкий').
+# Возвращает пары (бренд, MechanicalPropertyValueRecord), упорядоченные по бренду
+def find_by_mechanical_property(property_name: str, min_value: Optional[float] = None,
+                                max_value: Optional[float] = None, product_form: Optional[str] = None,
+                                db: Optional[Session] = None) -> List[Tuple[str, MechanicalPropertyValueRecord]]:
+    statement = _mechanical_property_statement(property_name, min_value, max_value, product_form)
+    with session_scope(db) as db:
+        rows = db.execute(statement).all()
+    return _brand_records(MechanicalPropertyValue, rows)
+
+
+# Функция для построения запросов значений твердости по одному на каждую шкалу, в которую переводится диапазон
+# (используется также модулем `materials.aio`)
+def _hardness_statements(min_value: Optional[float], max_value: Optional[float], scale: str,
+                         convert: bool) -> List[Select]:
+    if scale not in HARDNESS_SCALES:
+        raise ValueError(f"Неизвестная шкала твердости '{scale}'. Доступны: {list(HARDNESS_SCALES)}")
+    low = float("-inf") if min_value is None else min_value
+    high = float("inf") if max_value is None else max_value
+    statements = []
+    for target in (HARDNESS_SCALES if convert else (scale,)):
+        window = convert_hardness_range(low, high, scale, target)
+        if window is None:
+            continue
+        statement = select(Material.brand, HardnessValue.__table__) \
+            .join(Material, Material.id == HardnessValue.material_id) \
+            .where(HardnessValue.scale == target)
+        if window[1] != float("inf"):
+            statement = statement.where(HardnessValue.min_value <= window[1])
+        if window[0] != float("-inf"):
+            statement = statement.where(HardnessValue.max_value >= window[0])
+        statements.append(statement)
+    return statements
+
+
+# Функция для поиска значений твердости, пересекающихся с диапазоном [min_value, max_value] шкалы `scale`.
+# Значения в других шкалах отбираются по диапазону, переведенному в их шкалу (`parsers.convert_hardness_range`);
+# при `convert=False` учитываются только значения в шкале `scale`.
+# Возвращает пары (бренд, HardnessValueRecord), упорядоченные по бренду
+def find_by_hardness(min_value: Optional[float] = None, max_value: Optional[float] = None, scale: str = "HB",
+                     convert: bool = True, db: Optional[Session] = None) -> List[Tuple[str, HardnessValueRecord]]:
+    rows = []
+    with session_scope(db) as db:
+        for statement in _hardness_statements(min_value, max_value, scale, convert):
+            rows.extend(_brand_records(HardnessValue, db.execute(statement)))
+    rows.sort(key=lambda row: (row[0], row[1].id))
+    return rows
+
+
+# Функция для построения запроса материалов по зарубежной марке (используется также модулем `materials.aio`).
+# Система стандартов берется из параметра или из обозначения перед маркой ('AISI 4130'); аналоги с неопределенной
+# системой подходят для любой системы. Возвращает None для пустой марки
+def _foreign_analog_statement(grade: str, standard_system: Optional[str]) -> Optional[Select]:
+    entry = parse_foreign_grade(grade)
+    if entry is None:
+        return None
+    standard_system = standard_system or entry.standard_system
+    statement = select(Material.brand, ForeignAnalog.__table__) \
+        .join(Material, Material.id == ForeignAnalog.material_id) \
+        .where(ForeignAnalog.normalized_grade == normalize_grade(entry.foreign_grade))
+    if standard_system is not None:
+        statement = statement.where(or_(ForeignAnalog.standard_system == standard_system,
+                                        ForeignAnalog.standard_system.is_(None)))
+    return statement.order_by(Material.brand, ForeignAnalog.id)
+
+
+# Функция для поиска материалов по зарубежному аналогу. Марка сравнивается без учета регистра, пробелов, дефисов и
+# точек ('aisi4130' найдет 'AISI 4130'). Возвращает пары (бренд, ForeignAnalogRecord), упорядоченные по бренду
+def find_by_foreign_analog(grade: str, standard_system: Optional[str] = None,
+                           db: Optional[Session] = None) -> List[Tuple[str, ForeignAnalogRecord]]:
+    statement = _foreign_analog_statement(grade, standard_system)
+    if statement is None:
+        return []
+    with session_scope(db) as db:
+        rows = db.execute(statement).all()
+    return _brand_records(ForeignAnalog, rows)
+
+
+# Функция для получения зарубежных аналогов материала по бренду (всех или только системы standard_system)
+def get_foreign_analogs_by_brand(brand: str, standard_system: Optional[str] = None,
+                                 db: Optional[Session] = None) -> List[ForeignAnalogRecord]:
+    statement = select(ForeignAnalog.__table__).join(Material, Material.id == ForeignAnalog.material_id) \
+        .where(Material.brand == brand)
+    if standard_system is not None:
+        statement = statement.where(ForeignAnalog.standard_system == standard_system)
+    with session_scope(db) as db:
+        return [ForeignAnalogRecord(*row) for row in db.execute(statement.order_by(ForeignAnalog.id))]
+
+
+# Окончания, отбрасываемые у русских слов поискового запроса ('турбины' -> 'турбин*' найдет 'турбин', 'турбинных')
+_RUSSIAN_ENDING = re.compile(r"[аеиоуыэюяйь]+$")
+
+
+# Функция для преобразования строки поиска в запрос FTS5: все слова обязательны, русские слова длиннее четырех букв
+# ищутся по основе без окончания как префиксы, остальные (марки, числа, латинские обозначения) - целиком
+def _fts_query(query: str) -> str:
+    terms = []
+    for word in re.findall(r"\w+", query.lower()):
+        stem = _RUSSIAN_ENDING.sub("", word) if len(word) > 4 and re.fullmatch(r"[а-яё]+", word) else word
+        terms.append(f'"{stem}"*' if stem != word else f'"{word}"')
+    return " ".join(terms)
+
+
+# Функция для построения запроса полнотекстового поиска по характеристикам (используется также модулем
+# `materials.aio`). Возвращает None для строки поиска без слов
+def _characteristics_search_statement(query: str, limit: Optional[int]) -> Optional[Select]:
+    match = _fts_query(query)
+    if not match:
+        return None
+    statement = select(Material.brand, CharacteristicsOfMaterial.__table__) \
+        .join(characteristics_fts, characteristics_fts.c.rowid == CharacteristicsOfMaterial.id) \
+        .join(Material, Material.id == CharacteristicsOfMaterial.material_id) \
+        .where(literal_column("characteristics_fts").op("MATCH")(match)) \
+        .order_by(literal_column("characteristics_fts.rank"), CharacteristicsOfMaterial.id)
+    return statement.limit(limit) if limit is not None else statement
+
+
+# Функция для полнотекстового поиска по классификации, применению, зарубежным аналогам и дополнительной информации.
+# Поиск выполняется по индексу FTS5 `characteristics_fts` (см. `derived.create_characteristics_fts`); результаты
+# упорядочены по релевантности (bm25). Возвращает пары (бренд, CharacteristicsRecord)
+def search_characteristics(query: str, limit: Optional[int] = 20,
+                           db: Optional[Session] = None) -> List[Tuple[str, CharacteristicsRecord]]:
+    statement = _characteristics_search_statement(query, limit)
+    if statement is None:
+        return []
+    with session_scope(db) as db:
+        rows = db.execute(statement).all()
+    return _brand_records(CharacteristicsOfMaterial, rows)
+
+
 # Функция для получения списка всех брендов
-def get_all_brands(db: Session = SessionLocal()) -> List[str]:
-    brands = db.query(Material.brand).all()
+def get_all_brands(db: Optional[Session] = None) -> List[str]:
+    with session_scope(db) as db:
+        brands = db.query(Material.brand).all()
     return [brand[0] for brand in brands]
 
 
 # Функция для получения всех брендов по index_of_material_class
-def get_brands_by_material_class_index(index_of_material_class: int, db: Session = SessionLocal()) -> List[str]:
-    material_ids = db.query(MaterialIndices.material_id).filter(
-        MaterialIndices.index_of_material_class == index_of_material_class).all()
-    material_ids = [material_id[0] for material_id in material_ids]
-    brands = db.query(Material.brand).filter(Material.id.in_(material_ids)).all()
-    return [brand[0] for brand in brands]
+def get_brands_by_material_class_index(index_of_material_class: int, db: Optional[Session] = None) -> List[str]:
+    material_ids = select(MaterialIndices.material_id) \
+        .where(MaterialIndices.index_of_material_class == index_of_material_class)
+    with session_scope(db) as db:
+        brands = db.execute(select(Material.brand).where(Material.id.in_(material_ids)).order_by(Material.id))
+        return list(brands.scalars())
+
+
+# Функция для построения запроса стандартов химического состава по брендам через ChemicalComposition.standard_id
+# (используется также модулем `materials.aio`). Строки (бренд, стандарт или None) упорядочены по составу
+def _standards_statement(brands: Sequence[str]) -> Select:
+    return select(Material.brand, Standard.standard) \
+        .outerjoin(ChemicalComposition, ChemicalComposition.material_id == Material.id) \
+        .outerjoin(Standard, Standard.id == ChemicalComposition.standard_id) \
+        .where(Material.brand.in_(brands)) \
+        .order_by(Material.id, ChemicalComposition.id)
+
+
+# Функция для построения запроса стандартов по наименованию материала - для составов без standard_id
+# (используется также модулем `materials.aio`)
+def _standards_by_name_statement(brands: Sequence[str]) -> Select:
+    return select(Standard.material_name, Standard.standard) \
+        .where(Standard.material_name.in_(brands)) \
+        .order_by(Standard.id)
+
+
+# Функция для выбора стандарта каждого найденного бренда: первый стандарт, связанный через standard_id. Возвращает
+# словарь бренд -> стандарт (None - стандарт не связан) и наименования, стандарт которых нужно искать по
+# наименованию: бренды без связанного стандарта и наименования, которых нет в таблице materials
+def _resolve_standards(brands: Sequence[str],
+                       rows: Iterable[Tuple[str, Optional[str]]]) -> Tuple[Dict[str, Optional[str]], List[str]]:
+    standards: Dict[str, Optional[str]] = {}
+    for brand, standard in rows:
+        if standards.get(brand) is None:
+            standards[brand] = standard
+    return standards, [brand for brand in brands if standards.get(brand) is None]
+
+
+# Функция для дополнения стандартов найденными по наименованию (первый по id стандарт для каждого наименования)
+def _add_standards_by_name(standards: Dict[str, Optional[str]], rows: Iterable[Tuple[str, str]]) -> None:
+    for name, standard in rows:
+        if standards.get(name) is None:
+            standards[name] = standard
+
+
+# Функция для получения стандартов химического состава (индексированные соединения по standard_id, затем поиск по
+# наименованию материала). Словарь содержит все бренды из таблицы materials (None - стандарт не найден) и наименования,
+# которых нет в materials, но которые есть в standards
+def _get_standards(brands: Sequence[str], db: Session) -> Dict[str, Optional[str]]:
+    standards: Dict[str, Optional[str]] = {}
+    for chunk in _chunks(brands):
+        resolved, unresolved = _resolve_standards(chunk, db.execute(_standards_statement(chunk)))
+        if unresolved:
+            _add_standards_by_name(resolved, db.execute(_standards_by_name_statement(unresolved)))
+        standards.update(resolved)
+    return standards
+
+
+# Функция для получения стандарта химического состава по бренду
+def get_standard_of_chemical_composition_by_brand(brand: str, db: Optional[Session] = None) -> Optional[str]:
+    with session_scope(db) as db:
+        return _get_standards([brand], db).get(brand)
+
+
+# Функция для построения запроса брендов по стандарту (используется также модулем `materials.aio`). Бренды
+# связываются со стандартом через ChemicalComposition.standard_id и через наименование материала
+def _brands_by_standard_statement(standard: str):
+    by_id = select(Material.brand) \
+        .join(ChemicalComposition, ChemicalComposition.material_id == Material.id) \
+        .join(Standard, Standard.id == ChemicalComposition.standard_id) \
+        .where(Standard.standard == standard)
+    by_name = select(Material.brand) \
+        .join(Standard, Standard.material_name == Material.brand) \
+        .where(Standard.standard == standard)
+    return by_id.union(by_name)
+
+
+# Функция для получения брендов, химический состав которых соответствует стандарту (например, 'ГОСТ 977 - 88'),
+# в порядке возрастания
+def get_brands_by_standard(standard: str, db: Optional[Session] = None) -> List[str]:
+    with session_scope(db) as db:
+        brands = db.execute(_brands_by_standard_statement(standard)).scalars().all()
+    return sorted(brands)
+
+
+# Максимальное количество брендов в одном IN-запросе (SQLite ограничивает число параметров запроса)
+BULK_CHUNK_SIZE = 500
+
+# Таблицы свойств, доступные для пакетной загрузки: имя в параметре `include` -> модель
+BULK_TABLES = {
+    "hardness": Hardness,
+    "chemical_composition": ChemicalComposition,
+    "technological_properties": TechnologicalProperties,
+    "mechanical_properties": MechanicalProperties,
+    "characteristics": CharacteristicsOfMaterial,
+    "material_indices": MaterialIndices,
+}
+
+
+class BulkResult(dict):
+    """Результат пакетного запроса: словарь бренд -> данные. Ненайденные бренды перечислены в атрибуте `missing`."""
+
+    def __init__(self, found: Optional[dict] = None, missing: Optional[List[str]] = None):
+        super().__init__(found or {})
+        self.missing = list(missing or [])
+
+    def __repr__(self):
+        return f"<BulkResult(found={len(self)}, missing={self.missing})>"
+
+
+# Функция для удаления повторов из списка брендов с сохранением порядка
+def _unique(items: Iterable) -> list:
+    return list(dict.fromkeys(items))
+
+
+# Функция для разбиения списка на части, помещающиеся в один IN-запрос
+def _chunks(items: Sequence, size: int = BULK_CHUNK_SIZE) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# Функция для построения запроса строк (бренд, столбцы таблицы свойств...) для части списка брендов (используется
+# также модулем `materials.aio`)
+def _get_related_statement(model, brands: Sequence[str]) -> Select:
+    return select(Material.brand, model.__table__).outerjoin(model, model.material_id == Material.id) \
+        .where(Material.brand.in_(brands)).order_by(model.id)
+
+
+# Функция для отбора первой (по id) записи таблицы свойств каждого бренда по парам (бренд, запись или None)
+def _first_by_brand(pairs: Iterable[Tuple[str, Optional[Record]]], found: Dict[str, Optional[Record]]) -> None:
+    for brand, record in pairs:
+        if found.get(brand) is None:
+            found[brand] = record
+
+
+# Функция для пакетного получения записей таблицы свойств по списку брендов (один запрос на каждые BULK_CHUNK_SIZE)
+def _get_related_by_brands(model, brands: Iterable[str], db: Session) -> BulkResult:
+    brands = _unique(brands)
+    found = {}
+    for chunk in _chunks(brands):
+        _first_by_brand(_brand_records(model, db.execute(_get_related_statement(model, chunk))), found)
+    return BulkResult({brand: found[brand] for brand in brands if brand in found},
+                      [brand for brand in brands if brand not in found])
+
+
+# Функция для пакетного получения материалов по списку брендов
+def get_materials_by_brands(brands: Iterable[str], db: Optional[Session] = None) -> BulkResult:
+    brands = _unique(brands)
+    found = {}
+    with session_scope(db) as db:
+        for chunk in _chunks(brands):
+            for row in db.execute(select(Material.__table__).where(Material.brand.in_(chunk))):
+                material = MaterialRecord(*row)
+                found[material.brand] = material
+    return BulkResult({brand: found[brand] for brand in brands if brand in found},
+                      [brand for brand in brands if brand not in found])
+
+
+# Функция для пакетного запроса данных из таблицы Hardness
+def get_hardness_by_brands(brands: Iterable[str], db: Optional[Session] = None) -> BulkResult:
+    with session_scope(db) as db:
+        return _get_related_by_brands(Hardness, brands, db)
+
+
+# Функция для пакетного запроса данных из таблицы ChemicalComposition
+def get_chemical_composition_by_brands(brands: Iterable[str], db: Optional[Session] = None) -> BulkResult:
+    with session_scope(db) as db:
+        return _get_related_by_brands(ChemicalComposition, brands, db)
+
+
+# Функция для пакетного запроса данных из таблицы TechnologicalProperties
+def get_technological_properties_by_brands(brands: Iterable[str], db: Optional[Session] = None) -> BulkResult:
+    with session_scope(db) as db:
+        return _get_related_by_brands(TechnologicalProperties, brands, db)
+
+
+# Функция для пакетного запроса данных из таблицы MechanicalProperties
+def get_mechanical_properties_by_brands(brands: Iterable[str], db: Optional[Session] = None) -> BulkResult:
+    with session_scope(db) as db:
+        return _get_related_by_brands(MechanicalProperties, brands, db)
+
+
+# Функция для пакетного запроса данных из таблицы CharacteristicsOfMaterial
+def get_characteristics_by_brands(brands: Iterable[str], db: Optional[Session] = None) -> BulkResult:
+    with session_scope(db) as db:
+        return _get_related_by_brands(CharacteristicsOfMaterial, brands, db)
+
+
+# Функция для пакетного получения материалов вместе с выбранными таблицами свойств.
+# Для каждого найденного бренда возвращается словарь {"material": MaterialRecord, <имя таблицы>: запись или None, ...}.
+# Выполняется один запрос к таблице materials и по одному IN-запросу на каждую таблицу из `include`.
+def get_materials_bulk(brands: Iterable[str], include: Optional[Iterable[str]] = None,
+                       db: Optional[Session] = None) -> BulkResult:
+    include = list(BULK_TABLES) if include is None else _unique(include)
+    unknown = [name for name in include if name not in BULK_TABLES]
+    if unknown:
+        raise ValueError(f"Неизвестные таблицы для пакетной загрузки: {unknown}. Доступны: {list(BULK_TABLES)}")
+
+    with session_scope(db) as db:
+        materials = get_materials_by_brands(brands, db)
+        result = BulkResult({brand: {"material": material} for brand, material in materials.items()},
+                            materials.missing)
+        brand_by_id = {material.id: brand for brand, material in materials.items()}
+        material_ids = list(brand_by_id)
+
+        for name in include:
+            model = BULK_TABLES[name]
+            found = {}
+            for chunk in _chunks(material_ids):
+                for row in db.execute(_records_statement(model, model.material_id.in_(chunk))):
+                    record = RECORD_CLASSES[model](*row)
+                    found.setdefault(record.material_id, record)
+            for material_id, brand in brand_by_id.items():
+                result[brand][name] = found.get(material_id)
+    return result
+
+
+# Функция для пакетного получения стандартов химического состава по списку брендов: бренд -> стандарт (None - стандарт
+# не найден). Наименования, которых нет ни в таблице materials, ни в standards, перечислены в атрибуте `missing`
+def get_standards(brands: Iterable[str], db: Optional[Session] = None) -> BulkResult:
+    brands = _unique(brands)
+    with session_scope(db) as db:
+        standards = _get_standards(brands, db)
+    return BulkResult({brand: standards[brand] for brand in brands if brand in standards},
+                      [brand for brand in brands if brand not in standards])
+
+
+# Функция для построения запроса материалов со всеми таблицами свойств и стандартом (используется также модулем
+# `materials.aio`). Связи один-ко-многим загружаются отдельными запросами `selectinload` (соединение нескольких таких
+# связей в одном запросе дало бы декартово произведение строк), связь многие-к-одному со стандартом - соединением.
+# Стандарт по названию материала (первый по id) - дополнительный столбец
+def _profile_statement(brands: Sequence[str]) -> Select:
+    options = [selectinload(getattr(Material, name)) for name in BULK_TABLES]
+    options.append(selectinload(Material.chemical_composition).joinedload(ChemicalComposition.standard))
+    standard_by_name = select(Standard.standard).where(Standard.material_name == Material.brand) \
+        .order_by(Standard.id).limit(1).scalar_subquery()
+    return select(Material, standard_by_name).where(Material.brand.in_(brands)).options(*options)
+
+
+# Функция для построения профиля материала из объекта Material с загруженными связями
+def _build_profile(material: Material, standard_by_name: Optional[str]) -> MaterialProfile:
+    related = {name: min(getattr(material, name), key=lambda record: record.id, default=None) for name in BULK_TABLES}
+    composition = related["chemical_composition"]
+    standard = composition.standard.standard if composition is not None and composition.standard is not None \
+        else standard_by_name
+    return MaterialProfile(brand=material.brand, material=to_record(material), standard=standard,
+                           **{name: to_record(record) for name, record in related.items()})
+
+
+# Функция для построения профилей по строкам (Material, стандарт) результата `_profile_statement`
+def _build_profiles(rows: Iterable[Tuple[Material, Optional[str]]]) -> Dict[str, MaterialProfile]:
+    profiles = {}
+    for material, standard in rows:
+        if material.brand not in profiles:
+            profiles[material.brand] = _build_profile(material, standard)
+    return profiles
+
+
+# Функция для получения профиля материала: материал, все таблицы свойств и стандарт
+def get_material_profile(brand: str, db: Optional[Session] = None) -> Optional[MaterialProfile]:
+    with session_scope(db) as db:
+        profiles = _build_profiles(db.execute(_profile_statement([brand])).unique())
+    if brand not in profiles:
+        print(f"Материал с брендом '{brand}' не найден.")
+        return None
+    return profiles[brand]
+
+
+# Функция для пакетного получения профилей материалов по списку брендов
+def get_material_profiles(brands: Iterable[str], db: Optional[Session] = None) -> BulkResult:
+    brands = _unique(brands)
+    profiles = {}
+    with session_scope(db) as db:
+        for chunk in _chunks(brands):
+            profiles.update(_build_profiles(db.execute(_profile_statement(chunk)).unique()))
+    return BulkResult({brand: profiles[brand] for brand in brands if brand in profiles},
+                      [brand for brand in brands if brand not in profiles])
+
+
+# Количество строк, читаемых из курсора за один раз при потоковом чтении таблиц
+ITER_BATCH_SIZE = 1000
+
+# Таблицы, доступные для потокового чтения: имя таблицы -> модель
+ITER_TABLES = {model.__tablename__: model for model in (
+    Material, MaterialIndices, Hardness, ChemicalComposition, TechnologicalProperties, MechanicalProperties,
+    CharacteristicsOfMaterial, Standard, ChemicalElementRange, MechanicalPropertyValue, HardnessValue, ForeignAnalog)}
+
+
+# Функция для построения запроса потокового чтения полей `fields` таблицы в порядке id (используется также модулем
+# `materials.aio`). Поле 'brand' таблиц со столбцом material_id берется из таблицы materials
+def _iter_statement(table, fields: Optional[Sequence[str]] = None) -> Select:
+    model = ITER_TABLES[table] if isinstance(table, str) else table
+    columns = {attribute.key: getattr(model, attribute.key) for attribute in inspect(model).column_attrs}
+    joins_material = model is not Material and "material_id" in columns
+    if joins_material:
+        columns.setdefault("brand", Material.brand)
+    fields = list(columns) if fields is None else list(fields)
+    unknown = [field for field in fields if field not in columns]
+    if unknown:
+        raise ValueError(f"Неизвестные поля таблицы {model.__tablename__}: {unknown}. Доступны: {list(columns)}")
+    statement = select(*(columns[field] for field in fields)).select_from(model)
+    if joins_material and "brand" in fields:
+        statement = statement.outerjoin(Material, Material.id == model.material_id)
+    return statement.order_by(model.id)
+
+
+# Функция для потокового чтения таблицы: строки (именованные кортежи `Row`) с полями `fields` читаются из курсора
+# частями по `batch_size`, поэтому расход памяти не зависит от размера таблицы. Сессия открыта, пока генератор не
+# исчерпан или не закрыт
+def iter_rows(table, fields: Optional[Sequence[str]] = None, batch_size: int = ITER_BATCH_SIZE,
+              db: Optional[Session] = None) -> Iterator[Row]:
+    statement = _iter_statement(table, fields).execution_options(yield_per=batch_size)
+    with session_scope(db) as db:
+        yield from db.execute(statement)
+
+
+# Функция для потокового чтения таблицы materials
+def iter_materials(fields: Optional[Sequence[str]] = None, batch_size: int = ITER_BATCH_SIZE,
+                   db: Optional[Session] = None) -> Iterator[Row]:
+    return iter_rows(Material, fields, batch_size, db)
+
+
+# Функция для потокового чтения таблицы chemical_composition (поле 'brand' - бренд материала)
+def iter_chemical_compositions(fields: Optional[Sequence[str]] = None, batch_size: int = ITER_BATCH_SIZE,
+                               db: Optional[Session] = None) -> Iterator[Row]:
+    return iter_rows(ChemicalComposition, fields, batch_size, db)
+
+
+# Функция для потокового чтения таблицы mechanical_properties (поле 'brand' - бренд материала)
+def iter_mechanical_properties(fields: Optional[Sequence[str]] = None, batch_size: int = ITER_BATCH_SIZE,
+                               db: Optional[Session] = None) -> Iterator[Row]:
+    return iter_rows(MechanicalProperties, fields, batch_size, db)
 
 
-# Функция для получения стандарта по бренду
-def get_standard_of_chemical_composition_by_brand(brand: str, db: Session = SessionLocal()):
-    standard = db.query(Standard).filter(Standard.material_name == brand).first()
-    return standard.standard if standard else None
+# Функция для потокового чтения всех брендов (в порядке get_all_brands)
+def iter_brands(batch_size: int = ITER_BATCH_SIZE, db: Optional[Session] = None) -> Iterator[str]:
+    for row in iter_rows(Material, ("brand",), batch_size, db):
+        yield row.brand
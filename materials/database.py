@@ -8,12 +8,41 @@
 
 Компоненты модуля:
 - `DATABASE_URL` (str): Строка подключения к базе данных. В данном случае используется SQLite, файл базы данных
-называется `materials1.db`.
+называется `materials1.db`. Путь к файлу можно переопределить переменной окружения `MATERIALS_DATABASE_PATH` (например,
+для замеров на синтетическом каталоге, см. `benchmarks`).
 - `engine` (Engine): Движок базы данных, создающий подключение к базе данных и позволяющий выполнять SQL-запросы.
+Движок создается при первом обращении (см. `get_engine()`).
+- `get_engine()`: Возвращает движок, создавая его и недостающие таблицы при первом вызове.
+- `MaterialsSession`: Класс сессий пакета. Обработчики событий, обновляющие производные таблицы (`materials.derived`),
+подключены только к сессиям этого класса.
 - `SessionLocal` (sessionmaker): Фабрика сессий, которая используется для создания объектов сессии, позволяющих
-взаимодействовать с базой данных.
+взаимодействовать с базой данных. Первая созданная сессия инициализирует движок.
+- `ScopedSession` (scoped_session): Реестр сессий, хранящий не более одной сессии на поток.
+- `session_scope(db)`: Контекстный менеджер, выдающий сессию на время одного вызова и закрывающий ее по завершении.
+- `get_write_generation()`: Счетчик подтвержденных транзакций, изменивших данные моделей пакета. Используется кэшами
+для сброса устаревших данных.
+- `get_alembic_revision(db)`: Возвращает текущую ревизию Alembic базы данных.
 - `Base` (declarative_base): Базовый класс для всех моделей базы данных. Все модели проекта наследуют этот класс.
 
+Режим только для чтения и параметры SQLite задаются переменными окружения:
+- `MATERIALS_READ_ONLY`: Открывать файл только для чтения как неизменяемый (`file:...?mode=ro&immutable=1`, без
+блокировок файла и без создания таблиц; запись запрещена `PRAGMA query_only`). Используется, когда один файл читают
+несколько процессов (например, рабочие процессы gunicorn), а обновление файла выполняется заменой файла и перезапуском.
+- `MATERIALS_MMAP_SIZE`: Размер отображения файла в память в байтах (по умолчанию 256 МиБ; 0 - без отображения).
+- `MATERIALS_SQLITE_CACHE_SIZE`: Размер кэша страниц соединения в КиБ (по умолчанию 16 МиБ).
+- `MATERIALS_JOURNAL_MODE`: Режим журнала, устанавливаемый при открытии соединения, например `WAL` (по умолчанию не
+изменяется; не используется в режиме только для чтения).
+Параметры устанавливаются обработчиком события `connect` для каждого соединения.
+
+После `fork()` (например, при запуске рабочих процессов gunicorn с `preload_app`) пул соединений движка в дочернем
+процессе отбрасывается без закрытия соединений родителя (`engine.dispose(close=False)`), и дочерний процесс открывает
+собственные соединения.
+
+Размер пула соединений задается переменными окружения:
+- `MATERIALS_POOL_SIZE`: Количество постоянно открытых соединений (по умолчанию 5).
+- `MATERIALS_MAX_OVERFLOW`: Количество дополнительных соединений сверх `MATERIALS_POOL_SIZE` (по умолчанию 10).
+- `MATERIALS_POOL_TIMEOUT`: Время ожидания свободного соединения в секундах (по умолчанию 30).
+
 Использование:
 Модуль `database.py` предоставляет все необходимые компоненты для подключения и работы с базой данных. Пример
 использования для создания новой сессии:
@@ -29,6 +58,22 @@
         # Закрытие сессии после использования
         db.close()
 
+Функции `crud` получают сессию через `session_scope`: если сессия передана явно, используется она, иначе на время
+вызова создается сессия текущего потока, которая закрывается по завершении вызова. Вложенные вызовы в том же потоке
+используют одну и ту же сессию:
+
+    from materials.database import session_scope
+
+    with session_scope() as db:
+        material = db.query(Material).filter(Material.brand == "30ХМА").first()
+
+Вместо вывода всех запросов (`SQLALCHEMY_ECHO`) можно включить сбор статистики запросов по функциям пакета
+переменной окружения `MATERIALS_INSTRUMENTATION=1` (см. `materials.instrumentation`).
+
+Импорт модуля не подключается к базе данных: движок создается, а недостающие таблицы создаются вызовом
+`Base.metadata.create_all` только при первом обращении к `engine`, `get_engine()` или при создании первой сессии.
+Поэтому импорт пакета в утилитах, которые не выполняют запросов, не обращается к файлу базы данных.
+
 Также модуль определяет движок `engine`, который может быть использован для создания всех таблиц, определенных в
  моделях, например:
 
@@ -41,9 +86,17 @@
 Эта команда создаст все таблицы, определенные в моделях, если они еще не существуют в базе данных.
 """
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from urllib.parse import quote
 
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, object_session, scoped_session, sessionmaker
+
+from materials import instrumentation
 from materials.models import Base
 
 # Чтение значения для echo из переменной окружения
@@ -51,12 +104,191 @@ ECHO = os.getenv("SQLALCHEMY_ECHO", "False").lower() in ["true", "1"]
 
 # Определяем путь к базе данных относительно расположения этого файла
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATABASE_PATH = os.path.join(BASE_DIR, "materials.db")
-DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+DATABASE_PATH = os.getenv("MATERIALS_DATABASE_PATH", os.path.join(BASE_DIR, "materials.db"))
+
+# Режим только для чтения: файл открывается как неизменяемый (`mode=ro&immutable=1`), без блокировок и без создания
+# таблиц. Подходит для нескольких процессов, читающих один файл, который не изменяется во время их работы
+READ_ONLY = os.getenv("MATERIALS_READ_ONLY", "False").lower() in ["true", "1"]
+
+# Параметры SQLite, устанавливаемые для каждого соединения: размер отображения файла в память (байты), размер кэша
+# страниц (КиБ) и режим журнала (например, WAL; пустая строка - режим файла не изменяется, только без READ_ONLY)
+MMAP_SIZE = int(os.getenv("MATERIALS_MMAP_SIZE", str(256 * 2 ** 20)))
+SQLITE_CACHE_SIZE = int(os.getenv("MATERIALS_SQLITE_CACHE_SIZE", str(16 * 2 ** 10)))
+JOURNAL_MODE = os.getenv("MATERIALS_JOURNAL_MODE", "")
+
+
+# Функция для получения строки подключения к файлу базы данных для драйвера `driver` (в режиме только для чтения -
+# URI SQLite с параметрами mode=ro и immutable=1)
+def sqlite_url(path: str = DATABASE_PATH, driver: str = "sqlite", read_only: bool = READ_ONLY) -> str:
+    if read_only:
+        return f"{driver}:///file:{quote(os.path.abspath(path))}?mode=ro&immutable=1&uri=true"
+    return f"{driver}:///{path}"
+
+
+DATABASE_URL = sqlite_url()
+
+# Параметры пула соединений
+POOL_SIZE = int(os.getenv("MATERIALS_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("MATERIALS_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("MATERIALS_POOL_TIMEOUT", "30"))
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+# Функция для установки параметров SQLite при открытии каждого соединения
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size = {-SQLITE_CACHE_SIZE}")
+        if READ_ONLY:
+            cursor.execute("PRAGMA query_only = ON")
+        elif JOURNAL_MODE:
+            cursor.execute(f"PRAGMA journal_mode = {JOURNAL_MODE}")
+    finally:
+        cursor.close()
+
+
+# Функция для подключения установки параметров SQLite к движку (используется также модулем `materials.aio`)
+def configure_sqlite_engine(engine: Engine) -> Engine:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+# Функция для получения движка базы данных. При первом вызове создается подключение к базе данных и все таблицы на
+# основе моделей, если они еще не существуют
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                # Соединения SQLite выдаются пулом разным потокам поочередно, поэтому проверка потока-создателя
+                # отключена
+                engine = create_engine(
+                    DATABASE_URL,
+                    echo=ECHO,
+                    pool_size=POOL_SIZE,
+                    max_overflow=MAX_OVERFLOW,
+                    pool_timeout=POOL_TIMEOUT,
+                    connect_args={"check_same_thread": False},
+                )
+                configure_sqlite_engine(engine)
+                if not READ_ONLY:
+                    Base.metadata.create_all(bind=engine)
+                if instrumentation.ENABLED:
+                    instrumentation.enable(engine)
+                SessionLocal.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+
+# Функция, вызываемая в дочернем процессе после fork(): соединения пула родительского процесса не закрываются (они
+# принадлежат родителю), а отбрасываются, и дочерний процесс открывает свои соединения при первом запросе
+def _reset_engine_after_fork() -> None:
+    global _engine_lock
+    _engine_lock = threading.Lock()
+    ScopedSession.registry.clear()
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+class MaterialsSession(Session):
+    """Сессия пакета: к ней, а не ко всем сессиям SQLAlchemy процесса, подключены обработчики `materials.derived`."""
+
+
+class _LazySessionMaker(sessionmaker):
+    """Фабрика сессий, которая создает движок базы данных при создании первой сессии."""
+
+    def __call__(self, **local_kw) -> Session:
+        if "bind" not in local_kw:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionMaker(class_=MaterialsSession, autocommit=False, autoflush=False)
+ScopedSession = scoped_session(SessionLocal)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_engine_after_fork)
+
+
+# Движок доступен как атрибут модуля `engine`, но создается только при первом обращении к нему
+def __getattr__(name: str):
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@contextmanager
+def session_scope(db: Optional[Session] = None) -> Iterator[Session]:
+    """Выдает сессию на время вызова: переданную явно, уже открытую в текущем потоке или новую сессию потока,
+    которая закрывается при выходе из блока."""
+    if db is not None:
+        yield db
+        return
+    if ScopedSession.registry.has():
+        yield ScopedSession()
+        return
+    session = ScopedSession()
+    try:
+        yield session
+    finally:
+        ScopedSession.remove()
+
+
+# Счетчик подтвержденных транзакций, изменивших данные моделей пакета
+_write_generation = 0
+
+
+# Функция для получения счетчика изменений данных: значение увеличивается после каждой подтвержденной транзакции,
+# которая добавила, изменила или удалила записи моделей пакета
+def get_write_generation() -> int:
+    return _write_generation
+
+
+# Функция для получения текущей ревизии Alembic базы данных (None, если таблица alembic_version отсутствует)
+def get_alembic_revision(db: Optional[Session] = None) -> Optional[str]:
+    with session_scope(db) as db:
+        try:
+            return db.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except OperationalError:
+            return None
+
+
+def _mark_session_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info["materials_changed"] = True
+
+
+def _mark_bulk_changed(update_context):
+    update_context.session.info["materials_changed"] = True
+
+
+# Массовые `insert`/`update`/`delete` моделей через `session.execute()` (стиль SQLAlchemy 2.0) не вызывают события
+# `after_bulk_*`, поэтому отмечаются по событию `do_orm_execute`
+def _mark_orm_statement_changed(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["materials_changed"] = True
+
+
+def _count_committed_write(session):
+    global _write_generation
+    if session.info.pop("materials_changed", False):
+        _write_generation += 1
+
+
+def _discard_rolled_back_write(session, previous_transaction):
+    session.info.pop("materials_changed", None)
 
-# Создание подключения к базе данных
-engine = create_engine(DATABASE_URL, echo=ECHO)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Создание всех таблиц на основе моделей
-Base.metadata.create_all(bind=engine)
+# Отслеживание изменений, выполненных через модели пакета в любой сессии
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Base, _event_name, _mark_session_changed, propagate=True)
+event.listen(Session, "after_bulk_update", _mark_bulk_changed)
+event.listen(Session, "after_bulk_delete", _mark_bulk_changed)
+event.listen(Session, "do_orm_execute", _mark_orm_statement_changed)
+event.listen(Session, "after_commit", _count_committed_write)
+event.listen(Session, "after_soft_rollback", _discard_rolled_back_write)
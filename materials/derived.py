@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль заполняет производные таблицы, которые содержат числовые значения, полученные разбором строковых полей
+базы данных. Функции используются миграциями Alembic при создании таблиц и могут вызываться повторно после изменения
+исходных данных.
+
+Основные функции:
+- `rebuild_chemical_element_ranges(connection)`: Заполняет таблицу `chemical_element_ranges` по таблице
+  `chemical_composition`.
+- `rebuild_mechanical_property_values(connection)`: Заполняет таблицу `mechanical_property_values` по таблице
+  `mechanical_properties`.
+- `rebuild_hardness_values(connection)`: Заполняет таблицу `hardness_values` по таблице `hardness`.
+- `rebuild_foreign_analogs(connection)`: Заполняет таблицу `foreign_analogs` по полю `foreign_analogs` таблицы
+  `characteristics_of_material`.
+
+Полнотекстовый индекс характеристик:
+- `characteristics_fts`: Виртуальная таблица FTS5 по текстовым полям `CHARACTERISTICS_FTS_COLUMNS` таблицы
+  `characteristics_of_material` (внешнее содержимое, `rowid` равен `characteristics_of_material.id`). Таблица
+  синхронизируется с исходной триггерами на вставку, изменение и удаление.
+- `create_characteristics_fts(connection)`: Создает виртуальную таблицу и триггеры и заполняет индекс.
+- `drop_characteristics_fts(connection)`: Удаляет триггеры и виртуальную таблицу.
+- `rebuild_characteristics_fts(connection)`: Перестраивает индекс по содержимому исходной таблицы.
+
+Обновление при записи:
+- `DERIVED_TABLES`: Исходные модели, производные таблицы которых обновляются при записи через сессии пакета
+  (`database.MaterialsSession`: `SessionLocal`, `session_scope`, сессии `materials.aio`); другие сессии SQLAlchemy
+  процесса обработчики не затрагивают. Обработчик события `after_flush` после каждого сброса сессии перестраивает
+  производные строки материалов, записи исходных моделей которых добавлены, изменены или удалены (в той же
+  транзакции). Массовые `insert`/`update`/`delete` через сессию перестраивают производную таблицу целиком. Изменения,
+  выполненные в обход ORM (SQL, Core), требуют явного вызова функции заполнения.
+
+Функции работают с соединением SQLAlchemy Core (`Connection`) и не управляют транзакцией: подтверждение изменений
+выполняет вызывающий код. Пример:
+
+    from materials.database import engine
+    from materials.derived import rebuild_chemical_element_ranges
+
+    with engine.begin() as connection:
+        rebuild_chemical_element_ranges(connection)
+"""
+from itertools import chain
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import column, delete, event, insert, inspect, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from materials.database import MaterialsSession
+from materials.models import ChemicalComposition, ChemicalElementRange, MechanicalProperties, MechanicalPropertyValue, \
+    Hardness, HardnessValue, CharacteristicsOfMaterial, ForeignAnalog
+from materials.parsers import ELEMENT_COLUMNS, MECHANICAL_PROPERTY_COLUMNS, parse_range, parse_mechanical_property, \
+    parse_hardness, parse_foreign_analogs, normalize_grade
+
+
+# Функция для заполнения таблицы chemical_element_ranges (для всех материалов или только для material_ids).
+# Возвращает количество добавленных строк
+def rebuild_chemical_element_ranges(connection: Connection, material_ids: Optional[Iterable[int]] = None) -> int:
+    source = ChemicalComposition.__table__
+    target = ChemicalElementRange.__table__
+    query = select(source.c.id, source.c.material_id, *(source.c[element] for element in ELEMENT_COLUMNS))
+    cleanup = delete(target)
+    if material_ids is not None:
+        material_ids = list(material_ids)
+        query = query.where(source.c.material_id.in_(material_ids))
+        cleanup = cleanup.where(target.c.material_id.in_(material_ids))
+
+    rows = []
+    for composition_id, material_id, *values in connection.execute(query):
+        for element, value in zip(ELEMENT_COLUMNS, values):
+            parsed = parse_range(value)
+            if parsed is not None:
+                rows.append({"material_id": material_id, "chemical_composition_id": composition_id,
+                             "element": element, "min_value": parsed[0], "max_value": parsed[1]})
+
+    connection.execute(cleanup)
+    if rows:
+        connection.execute(insert(target), rows)
+    return len(rows)
+
+
+# Функция для заполнения таблицы mechanical_property_values (для всех материалов или только для material_ids).
+# Возвращает количество добавленных строк
+def rebuild_mechanical_property_values(connection: Connection, material_ids: Optional[Iterable[int]] = None) -> int:
+    source = MechanicalProperties.__table__
+    target = MechanicalPropertyValue.__table__
+    query = select(source.c.id, source.c.material_id, *(source.c[name] for name in MECHANICAL_PROPERTY_COLUMNS))
+    cleanup = delete(target)
+    if material_ids is not None:
+        material_ids = list(material_ids)
+        query = query.where(source.c.material_id.in_(material_ids))
+        cleanup = cleanup.where(target.c.material_id.in_(material_ids))
+
+    rows = []
+    for properties_id, material_id, *values in connection.execute(query):
+        for name, value in zip(MECHANICAL_PROPERTY_COLUMNS, values):
+            for entry in parse_mechanical_property(name, value):
+                rows.append({"material_id": material_id, "mechanical_properties_id": properties_id, **entry._asdict()})
+
+    connection.execute(cleanup)
+    if rows:
+        connection.execute(insert(target), rows)
+    return len(rows)
+
+
+# Функция для заполнения таблицы hardness_values (для всех материалов или только для material_ids).
+# Возвращает количество добавленных строк
+def rebuild_hardness_values(connection: Connection, material_ids: Optional[Iterable[int]] = None) -> int:
+    source = Hardness.__table__
+    target = HardnessValue.__table__
+    query = select(source.c.id, source.c.material_id, source.c.hardness_value)
+    cleanup = delete(target)
+    if material_ids is not None:
+        material_ids = list(material_ids)
+        query = query.where(source.c.material_id.in_(material_ids))
+        cleanup = cleanup.where(target.c.material_id.in_(material_ids))
+
+    rows = []
+    for hardness_id, material_id, value in connection.execute(query):
+        for entry in parse_hardness(value):
+            rows.append({"material_id": material_id, "hardness_id": hardness_id, **entry._asdict()})
+
+    connection.execute(cleanup)
+    if rows:
+        connection.execute(insert(target), rows)
+    return len(rows)
+
+
+# Функция для заполнения таблицы foreign_analogs (для всех материалов или только для material_ids).
+# Возвращает количество добавленных строк
+def rebuild_foreign_analogs(connection: Connection, material_ids: Optional[Iterable[int]] = None) -> int:
+    source = CharacteristicsOfMaterial.__table__
+    target = ForeignAnalog.__table__
+    query = select(source.c.id, source.c.material_id, source.c.foreign_analogs)
+    cleanup = delete(target)
+    if material_ids is not None:
+        material_ids = list(material_ids)
+        query = query.where(source.c.material_id.in_(material_ids))
+        cleanup = cleanup.where(target.c.material_id.in_(material_ids))
+
+    rows = []
+    for characteristics_id, material_id, value in connection.execute(query):
+        for entry in parse_foreign_analogs(value):
+            rows.append({"material_id": material_id, "characteristics_id": characteristics_id, **entry._asdict(),
+                         "normalized_grade": normalize_grade(entry.foreign_grade)})
+
+    connection.execute(cleanup)
+    if rows:
+        connection.execute(insert(target), rows)
+    return len(rows)
+
+
+# Текстовые поля characteristics_of_material, входящие в полнотекстовый индекс
+CHARACTERISTICS_FTS_COLUMNS = ("classification", "application", "foreign_analogs", "additional_info")
+
+# Веса полей при ранжировании bm25 (в порядке CHARACTERISTICS_FTS_COLUMNS): совпадение в зарубежных аналогах и
+# классификации важнее совпадения в длинном тексте дополнительной информации
+CHARACTERISTICS_FTS_WEIGHTS = (2.0, 1.0, 4.0, 0.5)
+
+# Виртуальная таблица FTS5 для запросов SQLAlchemy Core (не входит в Base.metadata: создается миграцией)
+characteristics_fts = table("characteristics_fts", column("rowid"),
+                            *(column(name) for name in CHARACTERISTICS_FTS_COLUMNS))
+
+
+# Функция для получения DDL виртуальной таблицы characteristics_fts и триггеров синхронизации
+def _characteristics_fts_ddl() -> list:
+    source = CharacteristicsOfMaterial.__tablename__
+    columns = ", ".join(CHARACTERISTICS_FTS_COLUMNS)
+    new_values = ", ".join(f"new.{name}" for name in CHARACTERISTICS_FTS_COLUMNS)
+    old_values = ", ".join(f"old.{name}" for name in CHARACTERISTICS_FTS_COLUMNS)
+    delete_old = f"INSERT INTO characteristics_fts(characteristics_fts, rowid, {columns}) " \
+                 f"VALUES ('delete', old.id, {old_values});"
+    insert_new = f"INSERT INTO characteristics_fts(rowid, {columns}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS characteristics_fts USING fts5({columns}, content='{source}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS characteristics_fts_insert AFTER INSERT ON {source} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS characteristics_fts_delete AFTER DELETE ON {source} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS characteristics_fts_update AFTER UPDATE ON {source} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+# Функция для создания полнотекстового индекса characteristics_fts с триггерами синхронизации и его заполнения
+def create_characteristics_fts(connection: Connection) -> None:
+    for statement in _characteristics_fts_ddl():
+        connection.execute(text(statement))
+    # Ранжирование по умолчанию (столбец rank) - bm25 с весами полей
+    weights = ", ".join(str(weight) for weight in CHARACTERISTICS_FTS_WEIGHTS)
+    connection.execute(text("INSERT INTO characteristics_fts(characteristics_fts, rank) VALUES ('rank', :rank)"),
+                       {"rank": f"bm25({weights})"})
+    rebuild_characteristics_fts(connection)
+
+
+# Функция для удаления полнотекстового индекса characteristics_fts и триггеров синхронизации
+def drop_characteristics_fts(connection: Connection) -> None:
+    for name in ("characteristics_fts_insert", "characteristics_fts_delete", "characteristics_fts_update"):
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    connection.execute(text("DROP TABLE IF EXISTS characteristics_fts"))
+
+
+# Функция для перестройки полнотекстового индекса по содержимому таблицы characteristics_of_material
+def rebuild_characteristics_fts(connection: Connection) -> None:
+    connection.execute(text("INSERT INTO characteristics_fts(characteristics_fts) VALUES ('rebuild')"))
+
+
+# Производные таблицы, обновляемые при записи через сессии SQLAlchemy: исходная модель -> (столбец производной таблицы,
+# ссылающийся на исходную запись; функция заполнения)
+DERIVED_TABLES = {
+    ChemicalComposition: (ChemicalElementRange.__table__.c.chemical_composition_id, rebuild_chemical_element_ranges),
+    MechanicalProperties: (MechanicalPropertyValue.__table__.c.mechanical_properties_id,
+                           rebuild_mechanical_property_values),
+    Hardness: (HardnessValue.__table__.c.hardness_id, rebuild_hardness_values),
+    CharacteristicsOfMaterial: (ForeignAnalog.__table__.c.characteristics_id, rebuild_foreign_analogs),
+}
+
+
+# Функция для получения идентификаторов исходных записей и материалов, затронутых сбросом сессии: модель -> (id
+# записей, id материалов). Для записей с измененным material_id учитываются старое и новое значения
+def _changed_records(session: Session) -> Dict[type, tuple]:
+    changed: Dict[type, tuple] = {}
+    dirty = session.dirty
+    for instance in chain(session.new, dirty, session.deleted):
+        if type(instance) not in DERIVED_TABLES or (instance in dirty and not session.is_modified(instance)):
+            continue
+        state = inspect(instance)
+        record_ids, material_ids = changed.setdefault(type(instance), (set(), set()))
+        if state.dict.get("id") is not None:
+            record_ids.add(state.dict["id"])
+        history = state.attrs.material_id.history
+        material_ids.update(value for value in chain(*history) if value is not None)
+    return changed
+
+
+# Функция для перестройки производных таблиц после сброса сессии (обработчик события `after_flush`). Материалы
+# затронутых записей дополняются по исходной таблице (текущие) и по производной (прежние, в том числе удаленных записей)
+def _refresh_derived_tables(session: Session, flush_context) -> None:
+    changed = _changed_records(session)
+    if not changed:
+        return
+    connection = session.connection()
+    for model, (record_ids, material_ids) in changed.items():
+        reference, rebuild = DERIVED_TABLES[model]
+        if record_ids:
+            source = model.__table__
+            material_ids.update(connection.execute(
+                select(source.c.material_id).where(source.c.id.in_(record_ids))).scalars())
+            material_ids.update(connection.execute(
+                select(reference.table.c.material_id).where(reference.in_(record_ids))).scalars())
+        rebuild(connection, material_ids)
+
+
+# Функция для полной перестройки производной таблицы после массового изменения исходной модели через сессию
+# (`session.execute(insert/update/delete(...))`, `Query.update()`, `Query.delete()`; обработчик события
+# `do_orm_execute`). `invoke_statement()` выполняет запрос вместе с обработчиками `do_orm_execute`, подключенными после
+# этого, поэтому они не пропускаются
+def _refresh_derived_tables_bulk(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete) \
+            or orm_execute_state.bind_mapper is None:
+        return None
+    derived = DERIVED_TABLES.get(orm_execute_state.bind_mapper.class_)
+    if derived is None:
+        return None
+    result = orm_execute_state.invoke_statement()
+    derived[1](orm_execute_state.session.connection())
+    return result
+
+
+event.listen(MaterialsSession, "after_flush", _refresh_derived_tables)
+event.listen(MaterialsSession, "do_orm_execute", _refresh_derived_tables_bulk)
@@ -9,14 +9,7 @@ import os
 # Настройка логирования
 os.environ["SQLALCHEMY_ECHO"] = "False"
 
-from materials import ( 
-    get_chemical_composition_by_brand, 
-    get_standard_of_chemical_composition_by_brand, 
-    get_material_by_brand, 
-    get_mechanical_properties_by_brand, 
-    get_technological_properties_by_brand, 
-    get_hardness_by_brand
-)
+from materials import get_material_profile
 
 
 def print_material_info(brand: str):
@@ -24,14 +17,14 @@ def print_material_info(brand: str):
     print(f"\nПолная информация о материале {brand}:")
     print("-" * 50)
 
-    # Основная информация
-    material = get_material_by_brand(brand)
-    if not material:
+    # Материал, все таблицы свойств и стандарт загружаются одним запросом
+    profile = get_material_profile(brand)
+    if not profile:
         print(f"Материал {brand} не найден")
         return
 
     # Химический состав
-    chemical = get_chemical_composition_by_brand(brand)
+    chemical = profile.chemical_composition
     if chemical:
         print(f"\nХимический состав: {chemical}")
         print(f"Cu = {chemical.Cu}")
@@ -45,7 +38,7 @@ def print_material_info(brand: str):
         print(f"Cr = {chemical.Cr}")
 
         # Механические свойства
-    mechanical = get_mechanical_properties_by_brand(brand)
+    mechanical = profile.mechanical_properties
     if mechanical:
         print("\nМеханические свойства:")
         print(f"Механические свойства {brand}:")
@@ -55,7 +48,7 @@ def print_material_info(brand: str):
         print(f"Ударная вязкость: {mechanical.impact_strength} Дж/см²")
 
     # Технологические свойства
-    tech = get_technological_properties_by_brand(brand)
+    tech = profile.technological_properties
     if tech:
         print("\nТехнологические свойства:")
         print(f"Свариваемость: {tech.weldability}")
@@ -63,13 +56,13 @@ def print_material_info(brand: str):
         print(f"Температурная хрупкость: {tech.temper_brittleness}")
 
     # Твердость
-    hardness = get_hardness_by_brand(brand)
+    hardness = profile.hardness
     if hardness:
         print("\nТвердость:")
         print(f"Твердость: {hardness.hardness_value}")
 
     # Стандарт
-    standard = get_standard_of_chemical_composition_by_brand(brand)
+    standard = profile.standard
     if standard:
         print(f"\nСтандарт: {standard}")
 
@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль реализует необязательный сбор статистики SQL-запросов по функциям пакета: количество вызовов и запросов,
+количество прочитанных строк, время выполнения запросов и признаки проблемы N+1. В отличие от `SQLALCHEMY_ECHO`,
+который выводит все запросы, статистика собирается без вывода, а в журнал (`logging`, логгер `materials.sql`)
+записываются только запросы дольше `slow_query_threshold` секунд.
+
+Сбор статистики включается функцией `enable()` или переменной окружения `MATERIALS_INSTRUMENTATION=1` (тогда он
+включается при создании движка). Обработчики событий SQLAlchemy `before_cursor_execute` и `after_cursor_execute`
+подключаются к движку `database.engine`; асинхронный движок `aio` не отслеживается.
+
+Запрос относится к функции по стеку вызовов: к самой внешней открытой функции модуля `crud` (например, запросы
+`get_material_by_brand` внутри `get_hardness_by_brand` относятся к `crud.get_hardness_by_brand`), а если запрос
+выполнен не из `crud` - к самой внешней функции пакета (`class_index.load`). Вызовом функции считается непрерывная
+последовательность ее запросов из одного кадра стека. Строки считаются при чтении результата запроса.
+
+Проблема N+1: если одна и та же функция (код вызывающей функции, например цикл по брендам или `print_material_info` с
+шестью вызовами `crud`) выполняет один и тот же SQL-запрос не менее `n_plus_one_threshold` раз, запрос отмечается как
+N+1. В отчете указываются место вызова, текст запроса, количество повторов и функции `crud`, выполнившие запрос
+(самые внутренние, например `crud.get_material_by_brand`). Вызывающая функция указывается файлом и строкой ее
+определения.
+
+Основные компоненты:
+- `FunctionStats`: Статистика запросов функции.
+- `NPlusOne`: Повторяющийся запрос (проблема N+1).
+- `InstrumentationStats`: Снимок статистики: функции, повторяющиеся запросы, общие итоги.
+- `QueryInstrumentation`: Сборщик статистики, подключаемый к движку.
+- `enable(engine, slow_query_threshold, n_plus_one_threshold)`, `disable()`, `reset()`: Управление общим сборщиком.
+- `instrumented(...)`: Контекстный менеджер: сбор статистики внутри блока.
+- `get_stats()`: Снимок статистики общего сборщика.
+- `prometheus_text(stats)`: Статистика в текстовом формате Prometheus.
+
+Использование:
+    from materials import instrumentation
+    from materials.example import print_material_info
+
+    with instrumentation.instrumented():
+        print_material_info("30ХМА")
+    stats = instrumentation.get_stats()
+    for name, function in stats.functions.items():
+        print(name, function.calls, function.queries, function.rows, f"{function.total_time * 1000:.1f} мс")
+    print(stats.n_plus_one)
+    print(instrumentation.prometheus_text())
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Сбор статистики при создании движка
+ENABLED = os.getenv("MATERIALS_INSTRUMENTATION", "False").lower() in ["true", "1"]
+
+# Запросы дольше этого времени (в секундах) записываются в журнал; None - не записываются
+SLOW_QUERY_THRESHOLD = float(os.getenv("MATERIALS_SLOW_QUERY_THRESHOLD", "0")) or None
+
+# Количество повторов одного запроса из одной вызывающей функции, после которого запрос отмечается как N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("MATERIALS_N_PLUS_ONE_THRESHOLD", "5"))
+
+# Границы интервалов гистограммы времени выполнения запросов, секунды
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+logger = logging.getLogger("materials.sql")
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_CRUD_FILE = os.path.join(_PACKAGE_DIR, "crud.py")
+_IGNORED_FILES = {os.path.join(_PACKAGE_DIR, name) for name in ("database.py", "instrumentation.py")}
+_EXTERNAL = "<external>"
+
+
+class FunctionStats(NamedTuple):
+    """Статистика запросов функции. Время в секундах."""
+    calls: int
+    queries: int
+    rows: int
+    total_time: float
+    max_time: float
+    n_plus_one: int
+    buckets: Tuple[int, ...]
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.queries if self.queries else 0.0
+
+
+class NPlusOne(NamedTuple):
+    """Запрос, повторенный не менее `n_plus_one_threshold` раз из одной вызывающей функции."""
+    caller: str
+    statement: str
+    count: int
+    functions: Tuple[str, ...]
+
+
+class InstrumentationStats(NamedTuple):
+    """Снимок статистики: функции, повторяющиеся запросы (N+1) и общие итоги."""
+    functions: Dict[str, FunctionStats]
+    n_plus_one: List[NPlusOne]
+
+    @property
+    def queries(self) -> int:
+        return sum(function.queries for function in self.functions.values())
+
+    @property
+    def total_time(self) -> float:
+        return sum(function.total_time for function in self.functions.values())
+
+
+class _FunctionCounters:
+    """Изменяемые счетчики функции (изменяются под блокировкой сборщика)."""
+    __slots__ = ("calls", "queries", "rows", "total_time", "max_time", "n_plus_one", "buckets")
+
+    def __init__(self):
+        self.calls = self.queries = self.rows = self.n_plus_one = 0
+        self.total_time = self.max_time = 0.0
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+
+    def freeze(self) -> FunctionStats:
+        return FunctionStats(self.calls, self.queries, self.rows, self.total_time, self.max_time, self.n_plus_one,
+                             tuple(self.buckets))
+
+
+class _CountingCursor:
+    """Курсор DBAPI, который считает строки, прочитанные результатом запроса."""
+
+    def __init__(self, cursor, instrumentation: "QueryInstrumentation", counters: _FunctionCounters):
+        self._cursor = cursor
+        self._instrumentation = instrumentation
+        self._counters = counters
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._instrumentation._add_rows(self._counters, 1)
+            yield row
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._instrumentation._add_rows(self._counters, 1)
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        self._instrumentation._add_rows(self._counters, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._instrumentation._add_rows(self._counters, len(rows))
+        return rows
+
+
+class _ThreadState(threading.local):
+    """Состояние потока: текущий вызов функции и вызывающая функция с количеством повторов ее запросов."""
+
+    def __init__(self):
+        self.frame = None
+        self.caller = None
+        self.repeats: Dict[str, int] = {}
+
+
+# Функция для получения имени функции по кадру стека: 'crud.get_hardness_by_brand'
+def _frame_name(frame) -> str:
+    module = os.path.splitext(os.path.relpath(frame.f_code.co_filename, _PACKAGE_DIR))[0].replace(os.sep, ".")
+    return f"{module}.{frame.f_code.co_name}"
+
+
+# Функция для получения вызывающей функции по кадру стека (файл и строка определения): 'example.py:15
+# (print_material_info)'
+def _frame_location(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno} ({code.co_name})"
+
+
+# Функция для поиска кадров стека, к которым относится запрос: самый внешний кадр (открытая функция crud или функция
+# пакета) и самый внутренний открытый кадр crud
+def _find_frames(frame) -> Tuple[Optional[object], Optional[object]]:
+    outer_crud = inner_crud = outer_package = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename == _CRUD_FILE:
+            if not frame.f_code.co_name.startswith("_"):
+                outer_crud = frame
+                inner_crud = inner_crud or frame
+        elif filename.startswith(_PACKAGE_DIR) and filename not in _IGNORED_FILES:
+            outer_package = frame
+        frame = frame.f_back
+    return outer_crud or outer_package, inner_crud
+
+
+class QueryInstrumentation:
+    """Сборщик статистики SQL-запросов по функциям пакета. Подключается к движку методом `attach(engine)`."""
+
+    def __init__(self, slow_query_threshold: Optional[float] = SLOW_QUERY_THRESHOLD,
+                 n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.slow_query_threshold = slow_query_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self._state = _ThreadState()
+        self._functions: Dict[str, _FunctionCounters] = {}
+        self._n_plus_one: Dict[Tuple[str, str], List] = {}
+        self._engines: List[Engine] = []
+
+    def attach(self, engine: Engine) -> None:
+        """Подключает обработчики событий к движку."""
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(engine)
+
+    def detach(self) -> None:
+        """Отключает обработчики событий от всех движков."""
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.clear()
+        self._state.frame = self._state.caller = None
+
+    @property
+    def attached(self) -> bool:
+        return bool(self._engines)
+
+    def reset(self) -> None:
+        """Сбрасывает накопленную статистику."""
+        with self._lock:
+            self._functions.clear()
+            self._n_plus_one.clear()
+
+    def stats(self) -> InstrumentationStats:
+        """Возвращает снимок статистики."""
+        with self._lock:
+            functions = {name: counters.freeze() for name, counters in sorted(self._functions.items())}
+            n_plus_one = [NPlusOne(caller, statement, count, tuple(sorted(functions_)))
+                          for (caller, statement), (count, functions_) in self._n_plus_one.items()]
+        return InstrumentationStats(functions, sorted(n_plus_one, key=lambda item: -item.count))
+
+    def _counters(self, name: str) -> _FunctionCounters:
+        counters = self._functions.get(name)
+        if counters is None:
+            counters = self._functions.setdefault(name, _FunctionCounters())
+        return counters
+
+    def _add_rows(self, counters: _FunctionCounters, rows: int) -> None:
+        with self._lock:
+            counters.rows += rows
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._materials_started_at = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - getattr(context, "_materials_started_at", time.perf_counter())
+        frame, inner_crud = _find_frames(sys._getframe(1))
+        name = _frame_name(frame) if frame is not None else _EXTERNAL
+        caller = frame.f_back if frame is not None else None
+
+        state = self._state
+        new_call = frame is None or frame is not state.frame
+        if caller is not state.caller or caller is None:
+            state.caller = caller
+            state.repeats = {}
+        state.frame = frame
+        repeats = state.repeats[statement] = state.repeats.get(statement, 0) + 1
+
+        with self._lock:
+            counters = self._counters(name)
+            counters.calls += new_call
+            counters.queries += 1
+            counters.total_time += elapsed
+            counters.max_time = max(counters.max_time, elapsed)
+            counters.buckets[bisect_left(DURATION_BUCKETS, elapsed)] += 1
+            if caller is not None and repeats >= self.n_plus_one_threshold:
+                if repeats == self.n_plus_one_threshold:
+                    counters.n_plus_one += 1
+                pattern = self._n_plus_one.setdefault((_frame_location(caller), statement), [0, set()])
+                pattern[0] = max(pattern[0], repeats)
+                pattern[1].add(_frame_name(inner_crud or frame))
+
+        if self.slow_query_threshold is not None and elapsed >= self.slow_query_threshold:
+            logger.warning("Медленный запрос %s (%.1f мс): %s %r", name, elapsed * 1000, statement, parameters)
+        if cursor is not None and cursor.description is not None and context is not None:
+            context.cursor = _CountingCursor(cursor, self, counters)
+
+
+# Общий сборщик статистики
+_instrumentation = QueryInstrumentation()
+
+
+# Функция для включения сбора статистики запросов движка (по умолчанию `database.engine`)
+def enable(engine: Optional[Engine] = None, slow_query_threshold: Optional[float] = SLOW_QUERY_THRESHOLD,
+           n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD) -> QueryInstrumentation:
+    if engine is None:
+        from materials.database import get_engine
+        engine = get_engine()
+    _instrumentation.slow_query_threshold = slow_query_threshold
+    _instrumentation.n_plus_one_threshold = n_plus_one_threshold
+    _instrumentation.attach(engine)
+    return _instrumentation
+
+
+# Функция для отключения сбора статистики (накопленная статистика сохраняется)
+def disable() -> None:
+    _instrumentation.detach()
+
+
+# Функция для сброса накопленной статистики
+def reset() -> None:
+    _instrumentation.reset()
+
+
+# Функция для получения снимка статистики общего сборщика
+def get_stats() -> InstrumentationStats:
+    return _instrumentation.stats()
+
+
+@contextmanager
+def instrumented(engine: Optional[Engine] = None, slow_query_threshold: Optional[float] = SLOW_QUERY_THRESHOLD,
+                 n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD) -> Iterator[QueryInstrumentation]:
+    """Собирает статистику запросов внутри блока; если сбор уже был включен, он не отключается по выходе."""
+    attached = _instrumentation.attached
+    instrumentation = enable(engine, slow_query_threshold, n_plus_one_threshold)
+    try:
+        yield instrumentation
+    finally:
+        if not attached:
+            disable()
+
+
+# Функция для экранирования значения метки в формате Prometheus
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Функция для получения статистики в текстовом формате Prometheus
+def prometheus_text(stats: Optional[InstrumentationStats] = None, prefix: str = "materials_db") -> str:
+    stats = stats or get_stats()
+    lines = []
+    counters = (
+        ("calls_total", "Количество вызовов функции, выполнивших запросы.", "calls"),
+        ("queries_total", "Количество SQL-запросов.", "queries"),
+        ("rows_total", "Количество прочитанных строк.", "rows"),
+        ("n_plus_one_total", "Количество повторяющихся запросов (N+1).", "n_plus_one"),
+    )
+    for metric, description, field in counters:
+        lines += [f"# HELP {prefix}_{metric} {description}", f"# TYPE {prefix}_{metric} counter"]
+        lines += [f'{prefix}_{metric}{{function="{_label(name)}"}} {getattr(function, field)}'
+                  for name, function in stats.functions.items()]
+
+    metric = f"{prefix}_query_duration_seconds"
+    lines += [f"# HELP {metric} Время выполнения SQL-запросов.", f"# TYPE {metric} histogram"]
+    for name, function in stats.functions.items():
+        label = _label(name)
+        total = 0
+        for bound, count in zip(DURATION_BUCKETS + (float("inf"),), function.buckets):
+            total += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{metric}_bucket{{function="{label}",le="{le}"}} {total}')
+        lines.append(f'{metric}_sum{{function="{label}"}} {function.total_time!r}')
+        lines.append(f'{metric}_count{{function="{label}"}} {function.queries}')
+
+    metric = f"{prefix}_query_duration_seconds_max"
+    lines += [f"# HELP {metric} Наибольшее время выполнения SQL-запроса.", f"# TYPE {metric} gauge"]
+    lines += [f'{metric}{{function="{_label(name)}"}} {function.max_time!r}'
+              for name, function in stats.functions.items()]
+    return "\n".join(lines) + "\n"
@@ -16,6 +16,13 @@
 - MechanicalProperties: Содержит механические свойства материала, включая предел прочности и относительное удлинение.
 - CharacteristicsOfMaterial: Содержит дополнительные характеристики материала, такие как применение, классификация и
     иностранные аналоги.
+- Standard: Содержит стандарты материалов.
+- ChemicalElementRange: Содержит числовые диапазоны содержания химических элементов, полученные разбором
+    `ChemicalComposition`.
+- MechanicalPropertyValue: Содержит числовые значения механических свойств, полученные разбором `MechanicalProperties`.
+- HardnessValue: Содержит шкалу и числовые значения твердости, полученные разбором `Hardness`.
+- ForeignAnalog: Содержит зарубежные аналоги (система стандартов и марка), полученные разбором
+    `CharacteristicsOfMaterial.foreign_analogs`.
 
 Использование:
 Этот модуль можно использовать для импорта всех моделей в других частях проекта. Пример:
@@ -32,4 +39,8 @@ from .chemical_composition import ChemicalComposition
 from .technological_properties import TechnologicalProperties
 from .mechanical_properties import MechanicalProperties
 from .characteristics import CharacteristicsOfMaterial
-from .standard import Standard
\ No newline at end of file
+from .standard import Standard
+from .chemical_element_range import ChemicalElementRange
+from .mechanical_property_value import MechanicalPropertyValue
+from .hardness_value import HardnessValue
+from .foreign_analog import ForeignAnalog
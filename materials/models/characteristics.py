@@ -17,6 +17,7 @@
 
 Связи:
 - `material`: Связь один-к-одному с моделью `Material`, которая указывает на соответствующий материал.
+- `analogs`: Связь один-ко-многим с моделью `ForeignAnalog`, содержащей разобранные зарубежные аналоги.
 
 Использование:
 Модель `CharacteristicsOfMaterial` используется для хранения дополнительных характеристик материалов. Пример создания
@@ -50,7 +51,7 @@ class CharacteristicsOfMaterial(Base):
     __tablename__ = 'characteristics_of_material'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False)
+    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False, index=True)
     classification = Column(String, nullable=True)
     application = Column(String, nullable=True)
     foreign_analogs = Column(String, nullable=True)
@@ -58,6 +59,9 @@ class CharacteristicsOfMaterial(Base):
     replacement = Column(String, nullable=True)
 
     material = relationship("Material", back_populates="characteristics")
+    # Аналоги удаляются обработчиком обновления производных таблиц (`derived.DERIVED_TABLES`), поэтому при удалении
+    # записи ORM не обнуляет их внешний ключ
+    analogs = relationship("ForeignAnalog", back_populates="characteristics", passive_deletes="all")
 
     def __repr__(self):
         return f"<CharacteristicsOfMaterial(id={self.id}, material_id={self.material_id}, " \
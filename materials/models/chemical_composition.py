@@ -15,6 +15,8 @@
 
 Связи:
 - `material`: Связь один-к-одному с моделью `Material`, которая указывает на соответствующий материал.
+- `element_ranges`: Связь один-ко-многим с моделью `ChemicalElementRange`, содержащей числовые диапазоны содержания
+  элементов.
 
 Использование:
 Модель `ChemicalComposition` используется для хранения химического состава материалов. Пример создания экземпляра и
@@ -46,8 +48,8 @@ class ChemicalComposition(Base):
     __tablename__ = 'chemical_composition'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False)
-    standard_id = Column(Integer, ForeignKey('standards.id'), nullable=True)
+    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False, index=True)
+    standard_id = Column(Integer, ForeignKey('standards.id'), nullable=True, index=True)
 
     Ag = Column(String)
     Al = Column(String)
@@ -104,6 +106,9 @@ class ChemicalComposition(Base):
 
     material = relationship("Material", back_populates="chemical_composition")
     standard = relationship("Standard", back_populates="chemical_compositions")
+    # Строки диапазонов удаляются обработчиком обновления производных таблиц (`derived.DERIVED_TABLES`), поэтому при
+    # удалении состава ORM не обнуляет их внешний ключ
+    element_ranges = relationship("ChemicalElementRange", back_populates="chemical_composition", passive_deletes="all")
 
     def __repr__(self):
         attrs = {key: value for key, value in self.__dict__.items() if
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль определяет модель `ChemicalElementRange`, представляющую производную таблицу с числовыми диапазонами
+содержания химических элементов. Таблица заполняется разбором строковых полей модели `ChemicalComposition` (см.
+`materials.parsers.composition`) и хранит данные в длинном формате: одна строка на каждый элемент каждого материала.
+Благодаря числовым столбцам и индексам запросы по диапазонам содержания выполняются в SQLite.
+
+Поля модели:
+- `id` (Integer): Первичный ключ, автоматически увеличивается.
+- `material_id` (Integer): Внешний ключ, ссылающийся на таблицу `materials`.
+- `chemical_composition_id` (Integer): Внешний ключ, ссылающийся на таблицу `chemical_composition`.
+- `element` (String): Название столбца элемента в модели `ChemicalComposition` (например, 'C' или 'Cr').
+- `min_value` (Float): Минимальное содержание элемента, %.
+- `max_value` (Float): Максимальное содержание элемента, %.
+
+Индексы:
+- `ix_chemical_element_ranges_element_min_max`: Поиск по элементу и диапазону содержания.
+- `ix_chemical_element_ranges_element_max`: Поиск по элементу и верхней границе содержания.
+
+Использование:
+Пример запроса материалов с содержанием хрома не менее 0.8%:
+
+    from materials.models import ChemicalElementRange
+
+    material_ids = db.query(ChemicalElementRange.material_id).filter(
+        ChemicalElementRange.element == "Cr", ChemicalElementRange.max_value >= 0.8).all()
+"""
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from .base import Base
+
+
+class ChemicalElementRange(Base):
+    __tablename__ = 'chemical_element_ranges'
+    __table_args__ = (
+        Index('ix_chemical_element_ranges_element_min_max', 'element', 'min_value', 'max_value'),
+        Index('ix_chemical_element_ranges_element_max', 'element', 'max_value'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False, index=True)
+    chemical_composition_id = Column(Integer, ForeignKey('chemical_composition.id'), nullable=False, index=True)
+    element = Column(String, nullable=False)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+
+    chemical_composition = relationship("ChemicalComposition", back_populates="element_ranges")
+
+    def __repr__(self):
+        return f"<ChemicalElementRange(material_id={self.material_id}, element={self.element}, " \
+               f"min_value={self.min_value}, max_value={self.max_value})>"
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль определяет модель `ForeignAnalog`, представляющую производную таблицу зарубежных аналогов материалов.
+Таблица заполняется разбором строкового поля `CharacteristicsOfMaterial.foreign_analogs` (см.
+`materials.parsers.foreign_analogs`) и хранит одну строку на каждую зарубежную марку каждого материала.
+
+Поля модели:
+- `id` (Integer): Первичный ключ, автоматически увеличивается.
+- `material_id` (Integer): Внешний ключ, ссылающийся на таблицу `materials`.
+- `characteristics_id` (Integer): Внешний ключ, ссылающийся на таблицу `characteristics_of_material`.
+- `standard_system` (String): Система стандартов ('AISI', 'DIN', 'EN', 'W.Nr.', 'JIS' и т.д.; NULL - не определена).
+- `foreign_grade` (String): Зарубежная марка в исходном написании (например, '4130', 'X6CrNiTi18-10').
+- `normalized_grade` (String): Марка для поиска: верхний регистр, без пробелов, дефисов и точек ('X6CRNITI1810').
+
+Индексы:
+- `ix_foreign_analogs_grade_system`: Поиск отечественных марок по зарубежной марке (и системе стандартов).
+- `ix_foreign_analogs_material_system`: Поиск зарубежных аналогов материала (по системе стандартов).
+
+Использование:
+Пример запроса материалов, аналогом которых является AISI 4130:
+
+    from materials.models import ForeignAnalog
+
+    material_ids = db.query(ForeignAnalog.material_id).filter(
+        ForeignAnalog.normalized_grade == "4130", ForeignAnalog.standard_system == "AISI").all()
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from .base import Base
+
+
+class ForeignAnalog(Base):
+    __tablename__ = 'foreign_analogs'
+    __table_args__ = (
+        Index('ix_foreign_analogs_grade_system', 'normalized_grade', 'standard_system'),
+        Index('ix_foreign_analogs_material_system', 'material_id', 'standard_system'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False)
+    characteristics_id = Column(Integer, ForeignKey('characteristics_of_material.id'), nullable=False, index=True)
+    standard_system = Column(String, nullable=True)
+    foreign_grade = Column(String, nullable=False)
+    normalized_grade = Column(String, nullable=False)
+
+    characteristics = relationship("CharacteristicsOfMaterial", back_populates="analogs")
+
+    def __repr__(self):
+        return f"<ForeignAnalog(material_id={self.material_id}, standard_system={self.standard_system}, " \
+               f"foreign_grade={self.foreign_grade})>"
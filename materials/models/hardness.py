@@ -12,6 +12,7 @@
 
 Связи:
 - `material`: Связь один-к-одному с моделью `Material`, которая указывает на соответствующий материал.
+- `values`: Связь один-ко-многим с моделью `HardnessValue`, содержащей числовые значения твердости.
 
 Использование:
 Модель `Hardness` используется для хранения значений твердости материалов. Пример создания экземпляра и добавления его
@@ -41,10 +42,13 @@ class Hardness(Base):
     __tablename__ = 'hardness'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False)
+    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False, index=True)
     hardness_value = Column(String, nullable=False)
 
     material = relationship("Material", back_populates="hardness")
+    # Значения удаляются обработчиком обновления производных таблиц (`derived.DERIVED_TABLES`), поэтому при удалении
+    # записи ORM не обнуляет их внешний ключ
+    values = relationship("HardnessValue", back_populates="hardness", passive_deletes="all")
 
     def __repr__(self):
         return f"<Hardness(id={self.id}, material_id={self.material_id}, hardness_value={self.hardness_value})>"
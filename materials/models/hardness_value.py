@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль определяет модель `HardnessValue`, представляющую производную таблицу с числовыми значениями твердости.
+Таблица заполняется разбором строкового поля `Hardness.hardness_value` (см. `materials.parsers.hardness`) и хранит
+одну строку на каждое условие (состояние материала, вид проката, стандарт) каждого материала.
+
+Поля модели:
+- `id` (Integer): Первичный ключ, автоматически увеличивается.
+- `material_id` (Integer): Внешний ключ, ссылающийся на таблицу `materials`.
+- `hardness_id` (Integer): Внешний ключ, ссылающийся на таблицу `hardness`.
+- `scale` (String): Шкала твердости ('HB', 'HRC' или 'HV').
+- `condition` (String): Условие, для которого указана твердость (например, '08Х13 после отжига , Пруток ГОСТ 5949-75').
+- `min_value` (Float): Минимальное число твердости.
+- `max_value` (Float): Максимальное число твердости.
+
+Индексы:
+- `ix_hardness_values_scale_min_max`: Поиск по шкале и нижней границе твердости.
+- `ix_hardness_values_scale_max`: Поиск по шкале и верхней границе твердости.
+
+Использование:
+Пример запроса материалов с твердостью по Бринеллю от 200 до 250 HB:
+
+    from materials.models import HardnessValue
+
+    material_ids = db.query(HardnessValue.material_id).filter(
+        HardnessValue.scale == "HB", HardnessValue.min_value <= 250, HardnessValue.max_value >= 200).all()
+"""
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from .base import Base
+
+
+class HardnessValue(Base):
+    __tablename__ = 'hardness_values'
+    __table_args__ = (
+        Index('ix_hardness_values_scale_min_max', 'scale', 'min_value', 'max_value'),
+        Index('ix_hardness_values_scale_max', 'scale', 'max_value'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False, index=True)
+    hardness_id = Column(Integer, ForeignKey('hardness.id'), nullable=False, index=True)
+    scale = Column(String, nullable=False)
+    condition = Column(String, nullable=True)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+
+    hardness = relationship("Hardness", back_populates="values")
+
+    def __repr__(self):
+        return f"<HardnessValue(material_id={self.material_id}, scale={self.scale}, condition={self.condition}, " \
+               f"min_value={self.min_value}, max_value={self.max_value})>"
@@ -8,7 +8,7 @@
 
 Поля модели:
 - `id` (Integer): Первичный ключ, автоматически увеличивается.
-- `brand` (String): Название или бренд материала, уникальное значение.
+- `brand` (String): Название или бренд материала, уникальное значение (уникальный индекс `ix_materials_brand`).
 - `class_of_material` (String): Класс материала, определяющий его основные свойства.
 - `subclass_of_material` (String): Подкласс материала, уточняющий свойства материала.
 
@@ -44,16 +44,19 @@
 химический состав, твердость и другие свойства.
 """
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 
 
 class Material(Base):
     __tablename__ = 'materials'
+    # Таблица materials в поставляемой базе данных импортирована без первичного ключа, поэтому поиск по id
+    # обеспечивается отдельным индексом
+    __table_args__ = (Index('ix_materials_id', 'id'),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    brand = Column(String, nullable=False, unique=True)
+    brand = Column(String, nullable=False, unique=True, index=True)
     class_of_material = Column(String, nullable=False)
     subclass_of_material = Column(String)
 
@@ -41,8 +41,8 @@ class MaterialIndices(Base):
     __tablename__ = 'material_indices'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False)
-    index_of_material_class = Column(Integer, nullable=False)
+    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False, index=True)
+    index_of_material_class = Column(Integer, nullable=False, index=True)
 
     material = relationship("Material", back_populates="material_indices")
 
@@ -17,6 +17,7 @@
 
 Связи:
 - `material`: Связь один-к-одному с моделью `Material`, которая указывает на соответствующий материал.
+- `values`: Связь один-ко-многим с моделью `MechanicalPropertyValue`, содержащей числовые значения свойств.
 
 Использование:
 Модель `MechanicalProperties` используется для хранения механических свойств материалов. Пример создания экземпляра и
@@ -50,7 +51,7 @@ class MechanicalProperties(Base):
     __tablename__ = 'mechanical_properties'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False)
+    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False, index=True)
     tensile_strength = Column(String, nullable=True)
     yield_strength = Column(String, nullable=True)
     elongation_at_break = Column(String, nullable=True)
@@ -58,6 +59,9 @@ class MechanicalProperties(Base):
     impact_strength = Column(String, nullable=True)
 
     material = relationship("Material", back_populates="mechanical_properties")
+    # Значения удаляются обработчиком обновления производных таблиц (`derived.DERIVED_TABLES`), поэтому при удалении
+    # записи ORM не обнуляет их внешний ключ
+    values = relationship("MechanicalPropertyValue", back_populates="mechanical_properties", passive_deletes="all")
 
     def __repr__(self):
         return f"<MechanicalProperties(id={self.id}, material_id={self.material_id}, tensile_strength={self.tensile_strength}, yield_strength={self.yield_strength}, elongation_at_break={self.elongation_at_break}, relative_narrowing={self.relative_narrowing}, impact_strength={self.impact_strength})>"
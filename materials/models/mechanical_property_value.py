@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль определяет модель `MechanicalPropertyValue`, представляющую производную таблицу с числовыми значениями
+механических свойств. Таблица заполняется разбором строковых полей модели `MechanicalProperties` (см.
+`materials.parsers.mechanical`) и хранит данные в длинном формате: одна строка на каждое свойство каждого условия
+(вида проката, категории и стандарта) каждого материала.
+
+Поля модели:
+- `id` (Integer): Первичный ключ, автоматически увеличивается.
+- `material_id` (Integer): Внешний ключ, ссылающийся на таблицу `materials`.
+- `mechanical_properties_id` (Integer): Внешний ключ, ссылающийся на таблицу `mechanical_properties`.
+- `property` (String): Название столбца свойства в модели `MechanicalProperties` (например, 'yield_strength').
+- `product_form` (String): Вид проката (например, 'Отливки' или 'Пруток').
+- `category` (String): Категория, класс прочности или условие испытания (например, 'КТ130').
+- `standard` (String): Стандарт, по которому указано значение.
+- `min_value` (Float): Минимальное значение свойства.
+- `max_value` (Float): Максимальное значение свойства.
+
+Индексы:
+- `ix_mechanical_property_values_property_form_min`: Поиск по свойству, виду проката и нижней границе значения.
+- `ix_mechanical_property_values_property_min`: Поиск по свойству и нижней границе значения.
+- `ix_mechanical_property_values_property_max`: Поиск по свойству и верхней границе значения.
+
+Использование:
+Пример запроса отливок с пределом текучести не менее 600 МПа:
+
+    from materials.models import MechanicalPropertyValue
+
+    material_ids = db.query(MechanicalPropertyValue.material_id).filter(
+        MechanicalPropertyValue.property == "yield_strength", MechanicalPropertyValue.product_form == "Отливки",
+        MechanicalPropertyValue.min_value >= 600).all()
+"""
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from .base import Base
+
+
+class MechanicalPropertyValue(Base):
+    __tablename__ = 'mechanical_property_values'
+    __table_args__ = (
+        Index('ix_mechanical_property_values_property_form_min', 'property', 'product_form', 'min_value'),
+        Index('ix_mechanical_property_values_property_min', 'property', 'min_value'),
+        Index('ix_mechanical_property_values_property_max', 'property', 'max_value'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False, index=True)
+    mechanical_properties_id = Column(Integer, ForeignKey('mechanical_properties.id'), nullable=False, index=True)
+    property = Column(String, nullable=False)
+    product_form = Column(String, nullable=True)
+    category = Column(String, nullable=True)
+    standard = Column(String, nullable=True)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+
+    mechanical_properties = relationship("MechanicalProperties", back_populates="values")
+
+    def __repr__(self):
+        return f"<MechanicalPropertyValue(material_id={self.material_id}, property={self.property}, " \
+               f"product_form={self.product_form}, category={self.category}, standard={self.standard}, " \
+               f"min_value={self.min_value}, max_value={self.max_value})>"
@@ -10,6 +10,13 @@
 - `material_name` (String): Название материала, для которого применяется стандарт.
 - `standard` (String): Стандарт, применяемый к материалу (например, ГОСТ, ТУ).
 
+Связи:
+- `chemical_compositions`: Связь один-ко-многим с моделью `ChemicalComposition` через `ChemicalComposition.standard_id`.
+  Связь загружается обычным списком (`lazy='select'`), поэтому для нескольких стандартов ее можно загрузить одним
+  запросом: `select(Standard).options(selectinload(Standard.chemical_compositions))`.
+
+Индексы: `material_name` (поиск стандарта по наименованию материала) и `standard` (поиск марок по стандарту).
+
 Использование:
 Модель `Standard` используется для хранения стандартов материалов. Пример создания экземпляра и добавления его в базу
 данных:
@@ -37,10 +44,10 @@ class Standard(Base):
     __tablename__ = 'standards'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    material_name = Column(String, nullable=False)
-    standard = Column(String, nullable=False)
+    material_name = Column(String, nullable=False, index=True)
+    standard = Column(String, nullable=False, index=True)
 
-    chemical_compositions = relationship("ChemicalComposition", back_populates="standard", lazy='dynamic')
+    chemical_compositions = relationship("ChemicalComposition", back_populates="standard", lazy='select')
 
     def __repr__(self):
         return f"<Standard(id={self.id}, material_name={self.material_name}, standard={self.standard})>"
@@ -46,7 +46,7 @@ class TechnologicalProperties(Base):
     __tablename__ = 'technological_properties'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False)
+    material_id = Column(Integer, ForeignKey('materials.id'), nullable=False, index=True)
     weldability = Column(String, nullable=True)
     flock_sensitivity = Column(String, nullable=True)
     temper_brittleness = Column(String, nullable=True)
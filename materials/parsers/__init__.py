@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль предоставляет доступ к разборщикам текстовых полей базы данных. Многие свойства материалов хранятся в виде
+строк (например, '0.01 - 0.04' или 'до 0.2'); разборщики преобразуют их в числовые значения, которые затем сохраняются
+в производных таблицах с индексами.
+
+Модули:
+- composition: Разбор содержания химических элементов в диапазоны (min, max).
+- foreign_analogs: Разбор зарубежных аналогов на систему стандартов и марку.
+- hardness: Разбор твердости на шкалу и диапазон (min, max), перевод между шкалами твердости.
+- mechanical: Разбор механических свойств на условия (вид проката, категория, стандарт) и значения (min, max).
+
+Использование:
+    from materials.parsers import parse_range
+
+    print(parse_range("до 0.2"))  # (0.0, 0.2)
+"""
+from .composition import ELEMENT_COLUMNS, parse_range, parse_composition
+from .mechanical import MECHANICAL_PROPERTY_COLUMNS, MechanicalPropertyEntry, parse_mechanical_property, \
+    parse_mechanical_properties
+from .hardness import HARDNESS_SCALES, HardnessEntry, parse_hardness, convert_hardness, convert_hardness_range
+from .foreign_analogs import ForeignAnalogEntry, normalize_grade, parse_foreign_grade, parse_foreign_analogs
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль содержит разбор содержания химических элементов из таблицы `chemical_composition`. Содержание элемента
+хранится в виде строки и преобразуется в диапазон `(min, max)` в процентах:
+
+- '0.01 - 0.04' -> (0.01, 0.04): диапазон;
+- 'до 0.2' -> (0.0, 0.2): ограничение сверху (также '<', '<=', 'max');
+- 'min 99.5' -> (99.5, 100.0): ограничение снизу (также 'от', '>', '>=');
+- '12' -> (12.0, 12.0): точное значение.
+
+Строки, которые не являются содержанием одного элемента (например, 'Ni - basis' или 'всего 0.5' в столбцах `Other` и
+`Impurities`), не разбираются: для них возвращается `None`.
+
+Основные компоненты:
+- `ELEMENT_COLUMNS`: Столбцы модели `ChemicalComposition`, содержащие содержание элементов.
+- `parse_range(value)`: Преобразует строку в диапазон `(min, max)`.
+- `parse_composition(composition)`: Возвращает словарь элемент -> диапазон для записи химического состава.
+"""
+import re
+from typing import Dict, Optional, Tuple
+
+from materials.models import ChemicalComposition
+
+# Столбцы, не содержащие содержание отдельного элемента
+_NON_ELEMENT_COLUMNS = {"id", "material_id", "standard_id", "Other", "Impurities"}
+
+ELEMENT_COLUMNS = tuple(column.key for column in ChemicalComposition.__table__.columns
+                        if column.key not in _NON_ELEMENT_COLUMNS)
+
+# Верхняя граница содержания элемента для ограничений вида 'min X'
+MAX_CONTENT = 100.0
+
+_NUMBER = r"(\d+(?:[.,]\d+)?|[.,]\d+)"
+_RANGE = re.compile(rf"^{_NUMBER}\s*[-–—]\s*{_NUMBER}$")
+_UPPER = re.compile(rf"^(?:до|max|<=|=<|≤|<)\s*{_NUMBER}$", re.IGNORECASE)
+_LOWER = re.compile(rf"^(?:min|от|>=|=>|≥|>)\s*{_NUMBER}$", re.IGNORECASE)
+_EXACT = re.compile(rf"^{_NUMBER}$")
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", "."))
+
+
+# Функция для преобразования строки содержания элемента в диапазон (min, max)
+def parse_range(value: Optional[str]) -> Optional[Tuple[float, float]]:
+    if value is None:
+        return None
+    value = value.strip().rstrip("%").strip()
+    match = _RANGE.match(value)
+    if match:
+        low, high = _number(match.group(1)), _number(match.group(2))
+        return (low, high) if low <= high else (high, low)
+    match = _UPPER.match(value)
+    if match:
+        return 0.0, _number(match.group(1))
+    match = _LOWER.match(value)
+    if match:
+        return _number(match.group(1)), MAX_CONTENT
+    match = _EXACT.match(value)
+    if match:
+        number = _number(match.group(1))
+        return number, number
+    return None
+
+
+# Функция для получения диапазонов содержания всех элементов записи химического состава
+def parse_composition(composition) -> Dict[str, Tuple[float, float]]:
+    ranges = {}
+    for element in ELEMENT_COLUMNS:
+        parsed = parse_range(getattr(composition, element))
+        if parsed is not None:
+            ranges[element] = parsed
+    return ranges
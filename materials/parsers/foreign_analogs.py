@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль содержит разбор зарубежных аналогов из поля `CharacteristicsOfMaterial.foreign_analogs`. Аналоги
+перечисляются через ';' или с новой строки; перед списком марок может стоять страна или система стандартов, а перед
+маркой - обозначение системы:
+
+    'США: AISI 4130, UNS G41300; Германия: 25CrMo4, 1.7218; Япония: SCM430'
+
+Система стандартов определяется по обозначению перед маркой ('AISI 4130' -> ('AISI', '4130')), по виду марки
+('1.7218' - номер материала W.Nr., 'G41300' - UNS) или по стране перед списком (`COUNTRY_SYSTEMS`: 'Германия' -> 'DIN').
+Если система не определена, она не указывается (`None`). Значения без марок ('Нет данных', 'Известны') пропускаются.
+
+Для поиска марка нормализуется функцией `normalize_grade`: верхний регистр, без пробелов, дефисов и точек
+('X5CrNi18-10' -> 'X5CRNI1810'), поэтому 'AISI 4130', 'aisi4130' и '4130' находят одну марку.
+
+Основные компоненты:
+- `STANDARD_SYSTEMS`: Обозначения систем стандартов, распознаваемые перед маркой.
+- `COUNTRY_SYSTEMS`: Системы стандартов по умолчанию для стран.
+- `ForeignAnalogEntry`: Разобранный зарубежный аналог.
+- `normalize_grade(text)`: Нормализует марку для поиска.
+- `parse_foreign_grade(text, default_system)`: Разбирает одну марку с необязательным обозначением системы.
+- `parse_foreign_analogs(value)`: Разбирает строку зарубежных аналогов в список аналогов.
+"""
+import re
+from typing import List, NamedTuple, Optional
+
+# Обозначения систем стандартов перед маркой и их приведение к одному написанию
+STANDARD_SYSTEMS = {
+    "AISI": "AISI", "SAE": "SAE", "ASTM": "ASTM", "UNS": "UNS", "DIN": "DIN", "EN": "EN", "W.NR.": "W.Nr.",
+    "WNR": "W.Nr.", "W.NR": "W.Nr.", "JIS": "JIS", "BS": "BS", "AFNOR": "AFNOR", "NF": "AFNOR", "UNI": "UNI",
+    "GB": "GB", "ISO": "ISO", "CSN": "CSN", "PN": "PN", "SS": "SS",
+}
+
+# Системы стандартов по умолчанию для стран, указанных перед списком марок
+COUNTRY_SYSTEMS = {
+    "США": "AISI", "ГЕРМАНИЯ": "DIN", "ЯПОНИЯ": "JIS", "КИТАЙ": "GB", "ВЕЛИКОБРИТАНИЯ": "BS", "АНГЛИЯ": "BS",
+    "ФРАНЦИЯ": "AFNOR", "ИТАЛИЯ": "UNI", "ЕВРОСОЮЗ": "EN", "ЕВРОПА": "EN", "ЧЕХИЯ": "CSN", "ПОЛЬША": "PN",
+    "ШВЕЦИЯ": "SS", "МЕЖДУНАРОДНЫЙ": "ISO",
+}
+
+# Значения, не содержащие марок
+_EMPTY = {"", "nan", "none", "-", "нет данных", "известны", "нет"}
+
+_SEPARATORS = re.compile(r"[;\n]+")
+_LABEL = re.compile(r"^\s*([^:]+?)\s*:\s*(.*)$")
+_SYSTEM_NAMES = "|".join(re.escape(name) for name in sorted(STANDARD_SYSTEMS, key=len, reverse=True))
+# Обозначение системы отделяется от марки пробелом; слитно пишутся только марки AISI и SAE ('AISI4130')
+_SYSTEM_PREFIX = re.compile(rf"^({_SYSTEM_NAMES})(?:\s+|(?<=AISI)(?=\d)|(?<=SAE)(?=\d))", re.IGNORECASE)
+_WERKSTOFF = re.compile(r"^1\.\d{4}$")
+_UNS = re.compile(r"^[A-Z]\d{5}$")
+_GRADE_NOISE = str.maketrans({" ": None, "-": None, ".": None, "\t": None})
+
+
+class ForeignAnalogEntry(NamedTuple):
+    """Зарубежный аналог: система стандартов (None - не определена) и марка."""
+    standard_system: Optional[str]
+    foreign_grade: str
+
+
+# Функция для нормализации марки для поиска: верхний регистр, без пробелов, дефисов и точек
+def normalize_grade(text: str) -> str:
+    return text.upper().translate(_GRADE_NOISE)
+
+
+# Функция для разбора одной марки с необязательным обозначением системы ('AISI 4130' -> ('AISI', '4130'))
+def parse_foreign_grade(text: str, default_system: Optional[str] = None) -> Optional[ForeignAnalogEntry]:
+    text = text.strip().strip("()").strip()
+    if text.lower() in _EMPTY:
+        return None
+    system = default_system
+    match = _SYSTEM_PREFIX.match(text)
+    if match and len(text) > match.end():
+        system = STANDARD_SYSTEMS[match.group(1).upper()]
+        text = text[match.end():].strip()
+    elif _WERKSTOFF.match(text):
+        system = "W.Nr."
+    elif _UNS.match(text.upper()) and system in (None, "AISI", "UNS"):
+        system = "UNS"
+    return ForeignAnalogEntry(system, text) if normalize_grade(text) else None
+
+
+# Функция для разбора строки зарубежных аналогов в список аналогов (без повторов)
+def parse_foreign_analogs(value: Optional[str]) -> List[ForeignAnalogEntry]:
+    entries = []
+    for part in _SEPARATORS.split(value or ""):
+        if part.strip().lower() in _EMPTY:
+            continue
+        default_system = None
+        match = _LABEL.match(part)
+        if match:
+            label = match.group(1).upper()
+            default_system = COUNTRY_SYSTEMS.get(label, STANDARD_SYSTEMS.get(label))
+            part = match.group(2)
+        for grade in part.split(","):
+            entry = parse_foreign_grade(grade, default_system)
+            if entry is not None and entry not in entries:
+                entries.append(entry)
+    return entries
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль содержит разбор твердости из таблицы `hardness` и перевод значений твердости между шкалами. Твердость
+хранится в виде строки со списком значений для разных условий, разделенных ';'. Значение записывается как
+'условие/шкала = значение':
+
+    'Твердость 08Х13 после отжига , Пруток ГОСТ 5949-75/HB 10 -1 = 116 - 179 МПа'
+
+Шкала приводится к одному из обозначений `HARDNESS_SCALES` ('HBW' -> 'HB', 'HRCэ' -> 'HRC'), множитель '10 -1' в
+записи твердости по Бринеллю не влияет на число твердости. Значение преобразуется в диапазон `(min, max)`:
+'116 - 179' -> (116.0, 179.0), '140' -> (140.0, 140.0). Текстовые значения ('устанавливается по согласованию с
+заказчиком') пропускаются.
+
+Перевод между шкалами выполняется линейной интерполяцией по таблице соответствия чисел твердости для углеродистых и
+легированных сталей (ГОСТ 22761, ASTM E140). Значения вне диапазона таблицы не переводятся (возвращается `None`).
+
+Основные компоненты:
+- `HARDNESS_SCALES`: Поддерживаемые шкалы твердости.
+- `HardnessEntry`: Разобранное значение твердости для одного условия.
+- `parse_hardness(value)`: Разбирает строку твердости в список значений по условиям.
+- `convert_hardness(value, from_scale, to_scale)`: Переводит число твердости из одной шкалы в другую.
+- `convert_hardness_range(low, high, from_scale, to_scale)`: Переводит диапазон твердости; границы за пределами
+  таблицы соответствия становятся открытыми.
+"""
+import re
+from bisect import bisect_left
+from typing import List, NamedTuple, Optional, Tuple
+
+HARDNESS_SCALES = ("HB", "HRC", "HV")
+
+_NUMBER = r"(\d+(?:[.,]\d+)?)"
+_PREFIX = re.compile(r"^Твердость\s+", re.IGNORECASE)
+_VALUE = re.compile(rf"^(HBW|HB|HRC[эЭ]?|HV)\s*(?:10\s*-\s*1)?\s*=?\s*{_NUMBER}(?:\s*[-–—]\s*{_NUMBER})?",
+                    re.IGNORECASE)
+
+# Столбцы таблицы соответствия для каждой шкалы
+_TABLE_COLUMNS = {"HV": 0, "HB": 1, "HRC": 2}
+
+# Таблица соответствия чисел твердости: HV, HB, HRC (None - значение вне диапазона шкалы)
+_CONVERSION_TABLE = (
+    (100, 95, None),
+    (120, 114, None),
+    (150, 143, None),
+    (180, 171, None),
+    (200, 190, None),
+    (220, 209, None),
+    (238, 226, 20.0),
+    (266, 253, 25.0),
+    (302, 286, 30.0),
+    (345, 327, 35.0),
+    (392, 371, 40.0),
+    (446, 421, 45.0),
+    (513, 481, 50.0),
+    (595, 545, 55.0),
+    (697, 615, 60.0),
+    (832, None, 65.0),
+)
+
+
+class HardnessEntry(NamedTuple):
+    """Значение твердости для одного условия (состояния материала, вида проката и стандарта)."""
+    scale: str
+    condition: Optional[str]
+    min_value: float
+    max_value: float
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", "."))
+
+
+def _scale(text: str) -> str:
+    text = text.upper()
+    return "HB" if text.startswith("HB") else "HRC" if text.startswith("HRC") else text
+
+
+# Функция для разбора строки твердости в список значений по условиям
+def parse_hardness(value: Optional[str]) -> List[HardnessEntry]:
+    entries = []
+    for item in (value or "").split(";"):
+        condition, separator, text = item.strip().rpartition("/")
+        match = _VALUE.match(text.strip()) if separator else None
+        if match is None:
+            continue
+        low = _number(match.group(2))
+        high = _number(match.group(3)) if match.group(3) else low
+        if low > high:
+            low, high = high, low
+        entries.append(HardnessEntry(_scale(match.group(1)), _PREFIX.sub("", condition).strip(" ,") or None, low, high))
+    return entries
+
+
+# Функция для получения точек таблицы соответствия (HV, значение шкалы) для шкалы
+def _scale_points(scale: str) -> List[tuple]:
+    if scale not in _TABLE_COLUMNS:
+        raise ValueError(f"Неизвестная шкала твердости '{scale}'. Доступны: {list(HARDNESS_SCALES)}")
+    column = _TABLE_COLUMNS[scale]
+    return [(row[0], row[column]) for row in _CONVERSION_TABLE if row[column] is not None]
+
+
+# Функция для линейной интерполяции по точкам (x, y), упорядоченным по возрастанию x
+def _interpolate(points: List[tuple], x: float) -> Optional[float]:
+    xs = [point[0] for point in points]
+    if not points or x < xs[0] or x > xs[-1]:
+        return None
+    index = bisect_left(xs, x)
+    if xs[index] == x:
+        return float(points[index][1])
+    (x0, y0), (x1, y1) = points[index - 1], points[index]
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+
+# Функция для перевода числа твердости из одной шкалы в другую (None - значение вне диапазона таблицы соответствия)
+def convert_hardness(value: float, from_scale: str, to_scale: str) -> Optional[float]:
+    if from_scale == to_scale:
+        _scale_points(from_scale)
+        return float(value)
+    vickers = _interpolate([(y, x) for x, y in _scale_points(from_scale)], value)
+    if vickers is None:
+        return None
+    return _interpolate(_scale_points(to_scale), vickers)
+
+
+# Функция для перевода границы диапазона по точкам (x, y). Граница за пределами таблицы соответствия снаружи диапазона
+# становится открытой (-inf для нижней, inf для верхней); граница за пределами таблицы внутри диапазона не переводится
+def _convert_bound(value: Optional[float], points: List[tuple], lower: bool) -> Optional[float]:
+    if value is None:
+        return None
+    if value < points[0][0]:
+        return float("-inf") if lower else None
+    if value > points[-1][0]:
+        return None if lower else float("inf")
+    return _interpolate(points, value)
+
+
+# Функция для перевода диапазона твердости в другую шкалу (None - диапазон не имеет соответствия в шкале to_scale)
+def convert_hardness_range(low: float, high: float, from_scale: str,
+                           to_scale: str) -> Optional[Tuple[float, float]]:
+    if from_scale == to_scale:
+        _scale_points(from_scale)
+        return float(low), float(high)
+    # Перевод выполняется через числа твердости по Виккерсу
+    inverse = [(y, x) for x, y in _scale_points(from_scale)]
+    target = _scale_points(to_scale)
+    low = _convert_bound(_convert_bound(low, inverse, True), target, True)
+    high = _convert_bound(_convert_bound(high, inverse, False), target, False)
+    if low is None or high is None or low > high:
+        return None
+    return low, high
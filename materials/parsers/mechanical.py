@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль содержит разбор механических свойств из таблицы `mechanical_properties`. Каждое свойство хранится в виде
+строки со списком значений для разных условий, разделенных ';'. Значение записывается как 'условие/значение', где
+условие - перечисление через запятую вида проката (сортамента), категории и стандарта:
+
+    'Отливки, КТ130, ГОСТ 977-88/1324; Пруток, ГОСТ 4543-71/930-1080; '
+
+Условие разбирается на составляющие:
+- `product_form`: Вид проката - первая часть условия, если она не является стандартом ('Отливки', 'Лист тонкий');
+- `category`: Остальные части условия, кроме стандарта ('КТ130', 'Класс прочности 440', 'Т=400 °С');
+- `standard`: Стандарт ('ГОСТ 977-88', 'ТУ 14-1-1530-75').
+
+Значение преобразуется в диапазон `(min, max)`: '1324' -> (1324.0, 1324.0), '930-1080' -> (930.0, 1080.0). Пустые
+значения ('nan') и текстовые пояснения ('Механические свойства не регламентируются') пропускаются.
+
+Основные компоненты:
+- `MECHANICAL_PROPERTY_COLUMNS`: Столбцы модели `MechanicalProperties`, содержащие значения свойств.
+- `MechanicalPropertyEntry`: Разобранное значение свойства для одного условия.
+- `parse_condition(text)`: Разбирает условие на вид проката, категорию и стандарт.
+- `parse_value(text)`: Преобразует строку значения в диапазон `(min, max)`.
+- `parse_mechanical_property(property_name, value)`: Разбирает строку одного свойства.
+- `parse_mechanical_properties(properties)`: Разбирает все свойства записи `MechanicalProperties`.
+"""
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from materials.models import MechanicalProperties
+
+MECHANICAL_PROPERTY_COLUMNS = tuple(column.key for column in MechanicalProperties.__table__.columns
+                                    if column.key not in ("id", "material_id"))
+
+# Значения, означающие отсутствие данных
+_EMPTY = {"", "nan", "none", "-"}
+
+_NUMBER = r"(\d+(?:[.,]\d+)?)"
+_RANGE = re.compile(rf"^{_NUMBER}\s*[-–—]\s*{_NUMBER}$")
+_EXACT = re.compile(rf"^{_NUMBER}$")
+_STANDARD = re.compile(r"^(?:ГОСТ|ОСТ|ДСТУ|ТУ|СТП|СТО)(?![А-Яа-яA-Za-z])")
+
+
+class MechanicalPropertyEntry(NamedTuple):
+    """Значение механического свойства для одного условия (вида проката, категории и стандарта)."""
+    property: str
+    product_form: Optional[str]
+    category: Optional[str]
+    standard: Optional[str]
+    min_value: float
+    max_value: float
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", "."))
+
+
+# Функция для разбора условия на вид проката, категорию и стандарт
+def parse_condition(text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    first, *rest = [part.strip() for part in text.split(",")]
+    standard = next((part for part in [first, *rest] if _STANDARD.match(part)), None)
+    product_form = first if first.lower() not in _EMPTY and first != standard else None
+    category = ", ".join(part for part in rest if part != standard and part.lower() not in _EMPTY) or None
+    return product_form, category, standard
+
+
+# Функция для преобразования строки значения свойства в диапазон (min, max)
+def parse_value(text: Optional[str]) -> Optional[Tuple[float, float]]:
+    if text is None:
+        return None
+    text = text.strip()
+    match = _RANGE.match(text)
+    if match:
+        low, high = _number(match.group(1)), _number(match.group(2))
+        return (low, high) if low <= high else (high, low)
+    match = _EXACT.match(text)
+    if match:
+        number = _number(match.group(1))
+        return number, number
+    return None
+
+
+# Функция для разбора строки одного механического свойства в список значений по условиям
+def parse_mechanical_property(property_name: str, value: Optional[str]) -> List[MechanicalPropertyEntry]:
+    entries = []
+    for item in (value or "").split(";"):
+        condition, separator, text = item.strip().rpartition("/")
+        parsed = parse_value(text) if separator else None
+        if parsed is None:
+            continue
+        product_form, category, standard = parse_condition(condition)
+        entries.append(MechanicalPropertyEntry(property_name, product_form, category, standard, *parsed))
+    return entries
+
+
+# Функция для разбора всех механических свойств записи MechanicalProperties
+def parse_mechanical_properties(properties) -> List[MechanicalPropertyEntry]:
+    entries = []
+    for property_name in MECHANICAL_PROPERTY_COLUMNS:
+        entries.extend(parse_mechanical_property(property_name, getattr(properties, property_name)))
+    return entries
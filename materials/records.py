@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль определяет компактные записи только для чтения, соответствующие моделям базы данных. Записи используются
+там, где данные хранятся в памяти и не должны быть связаны с сессией SQLAlchemy (например, в `MaterialsSnapshot`).
+
+Каждая запись - это класс с `__slots__`, атрибуты которого совпадают со столбцами соответствующей модели. Записи не
+содержат состояния SQLAlchemy, не загружают связи и не изменяются после создания, поэтому их можно безопасно
+передавать между потоками. Функции `crud` и `aio` возвращают записи, построенные прямо из строк запросов Core, без
+создания объектов ORM.
+
+Химический состав разрежен: из 52 элементов у марки обычно заполнено около десяти. Запись `ChemicalCompositionRecord`
+(`SparseRecord`) хранит в `__slots__` только ключевые столбцы, а заполненные элементы - парами элемент -> строка
+содержания в том виде, в каком она хранится в базе данных ('0.26 - 0.33', 'до 0.3'; `items()`); незаполненные элементы
+доступны как атрибуты со значением None. Числовые диапазоны (min, max) по записи возвращает
+`parsers.parse_composition(record)`. Вместе со значениями запись занимает 300-500 байт вместо 1 270 байт плотной
+записи и 3 150 байт объекта ORM (см. `benchmarks.records_bench`).
+Одинаковые наборы заполненных элементов и одинаковые значения ('до 0.035') записи разделяют через общие словари класса.
+Словари живут, пока загружен модуль, и ограничены `SHARED_LIMIT` элементами: после заполнения новые значения хранятся
+в записи без разделения (поставляемая база данных и ее синтетическая копия в 100 раз больше содержат около 1 800
+различных значений и 500 наборов элементов).
+
+Записи:
+- `MaterialRecord`: Соответствует модели `Material`.
+- `MaterialIndicesRecord`: Соответствует модели `MaterialIndices`.
+- `HardnessRecord`: Соответствует модели `Hardness`.
+- `ChemicalCompositionRecord`: Соответствует модели `ChemicalComposition`.
+- `TechnologicalPropertiesRecord`: Соответствует модели `TechnologicalProperties`.
+- `MechanicalPropertiesRecord`: Соответствует модели `MechanicalProperties`.
+- `CharacteristicsRecord`: Соответствует модели `CharacteristicsOfMaterial`.
+- `StandardRecord`: Соответствует модели `Standard`.
+- `ChemicalElementRangeRecord`, `MechanicalPropertyValueRecord`, `HardnessValueRecord`, `ForeignAnalogRecord`:
+  Соответствуют моделям разобранных значений (`ChemicalElementRange`, `MechanicalPropertyValue`, `HardnessValue`,
+  `ForeignAnalog`).
+
+Профиль материала:
+- `MaterialProfile`: Материал вместе с первыми записями всех таблиц свойств и стандартом. Профиль состоит только из
+  записей и строк, поэтому сериализуется `pickle`, а метод `to_dict()` возвращает словарь для JSON.
+- `to_record(instance)`: Преобразует объект модели в запись только для чтения.
+
+Использование:
+Запись создается из строки результата запроса SQLAlchemy Core, столбцы которой идут в порядке столбцов таблицы:
+
+    from sqlalchemy import select
+    from materials.models import Material
+    from materials.records import MaterialRecord
+
+    row = db.execute(select(Material.__table__)).first()
+    material = MaterialRecord.from_row(row)
+    print(material.brand)
+"""
+from collections import deque
+from itertools import compress, repeat
+from operator import is_not
+from typing import Any, Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple
+
+from materials.models import Material, MaterialIndices, Hardness, ChemicalComposition, TechnologicalProperties, \
+    MechanicalProperties, CharacteristicsOfMaterial, Standard, ChemicalElementRange, MechanicalPropertyValue, \
+    HardnessValue, ForeignAnalog
+
+# Выполнение итератора без сохранения результатов
+_consume = deque(maxlen=0).extend
+
+# Максимальное количество общих значений и наборов столбцов разреженной записи (на класс записи)
+SHARED_LIMIT = 65536
+
+
+class Record:
+    """Базовый класс записей: атрибуты задаются в `__slots__` и не изменяются после создания."""
+    __slots__ = ()
+    # Столбцы модели в порядке таблицы (порядок аргументов конструктора)
+    _columns: Tuple[str, ...] = ()
+
+    def __init__(self, *values):
+        # Цикл по столбцам выполняется в C (`map`), а не в байт-коде: запись создается на каждую строку запроса
+        _consume(map(object.__setattr__, repeat(self), self._columns, values))
+
+    @classmethod
+    def from_row(cls, row: Iterable):
+        return cls(*row)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} доступна только для чтения")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} доступна только для чтения")
+
+    def __reduce__(self):
+        return type(self), self._astuple()
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._astuple() == other._astuple()
+
+    def __hash__(self):
+        return hash((type(self), self._astuple()))
+
+    def _astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self._columns)
+
+    def _asdict(self) -> dict:
+        return {name: getattr(self, name) for name in self._columns}
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={value}" for name, value in self._asdict().items() if value is not None)
+        return f"<{type(self).__name__}({values})>"
+
+
+class SparseRecord(Record):
+    """
+    Разреженная запись: ключевые столбцы (первичный и внешние ключи) хранятся в `__slots__`, остальные - только
+    заполненные, парами (имя столбца, значение). Незаполненные столбцы доступны как атрибуты со значением None.
+    """
+    __slots__ = ("_names", "_values")
+    # Ключевые столбцы, хранящиеся в `__slots__`, и разреженные столбцы (идут в таблице после ключевых)
+    _keys: Tuple[str, ...] = ()
+    _sparse: Tuple[str, ...] = ()
+    _sparse_set: FrozenSet[str] = frozenset()
+    _nones: Tuple[None, ...] = ()
+    # Общие кортежи имен заполненных столбцов (ключ - признаки заполненности столбцов) и общие значения: записи с
+    # одинаковым набором столбцов или одинаковыми значениями ('до 0.035') ссылаются на один объект. Словари не
+    # пополняются после `SHARED_LIMIT` элементов
+    _name_sets: Dict[Tuple[bool, ...], Tuple[str, ...]] = {}
+    _shared_values: Dict[Any, Any] = {}
+
+    def __init__(self, *values):
+        keys = len(self._keys)
+        _consume(map(object.__setattr__, repeat(self), self._keys, values))
+        sparse = values[keys:]
+        filled = tuple(map(is_not, sparse, self._nones))
+        names = self._name_sets.get(filled)
+        if names is None:
+            names = tuple(compress(self._sparse, filled))
+            if len(self._name_sets) < SHARED_LIMIT:
+                names = self._name_sets.setdefault(filled, names)
+        # После заполнения словаря общих значений get возвращает общее значение или само значение
+        shared = self._shared_values.setdefault if len(self._shared_values) < SHARED_LIMIT else self._shared_values.get
+        object.__setattr__(self, "_names", names)
+        object.__setattr__(self, "_values", tuple(map(shared, compress(sparse, filled), compress(sparse, filled))))
+
+    def __getattr__(self, name):
+        if name in self._sparse_set:
+            try:
+                return self._values[self._names.index(name)]
+            except ValueError:
+                return None
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def items(self) -> Tuple[Tuple[str, Any], ...]:
+        """Возвращает заполненные столбцы парами (имя столбца, значение) в порядке таблицы."""
+        return tuple(zip(self._names, self._values))
+
+
+# Функция для создания класса записи со столбцами модели. При sparse=True создается разреженная запись
+# (`SparseRecord`); ключевые столбцы модели должны идти в таблице первыми
+def _record_class(name: str, model, sparse: bool = False) -> type:
+    columns = tuple(column.key for column in model.__table__.columns)
+    doc = f"Запись только для чтения модели `{model.__name__}`."
+    if not sparse:
+        return type(name, (Record,), {"__slots__": columns, "_columns": columns, "__doc__": doc})
+    keys = tuple(column.key for column in model.__table__.columns if column.primary_key or column.foreign_keys)
+    if columns[:len(keys)] != keys:
+        raise ValueError(f"Ключевые столбцы модели `{model.__name__}` должны идти в таблице первыми")
+    return type(name, (SparseRecord,), {"__slots__": keys, "_columns": columns, "_keys": keys,
+                                        "_sparse": columns[len(keys):], "_sparse_set": frozenset(columns[len(keys):]),
+                                        "_nones": (None,) * (len(columns) - len(keys)), "_name_sets": {},
+                                        "_shared_values": {}, "__doc__": doc})
+
+
+MaterialRecord = _record_class("MaterialRecord", Material)
+MaterialIndicesRecord = _record_class("MaterialIndicesRecord", MaterialIndices)
+HardnessRecord = _record_class("HardnessRecord", Hardness)
+ChemicalCompositionRecord = _record_class("ChemicalCompositionRecord", ChemicalComposition, sparse=True)
+TechnologicalPropertiesRecord = _record_class("TechnologicalPropertiesRecord", TechnologicalProperties)
+MechanicalPropertiesRecord = _record_class("MechanicalPropertiesRecord", MechanicalProperties)
+CharacteristicsRecord = _record_class("CharacteristicsRecord", CharacteristicsOfMaterial)
+StandardRecord = _record_class("StandardRecord", Standard)
+ChemicalElementRangeRecord = _record_class("ChemicalElementRangeRecord", ChemicalElementRange)
+MechanicalPropertyValueRecord = _record_class("MechanicalPropertyValueRecord", MechanicalPropertyValue)
+HardnessValueRecord = _record_class("HardnessValueRecord", HardnessValue)
+ForeignAnalogRecord = _record_class("ForeignAnalogRecord", ForeignAnalog)
+
+# Соответствие моделей и записей
+RECORD_CLASSES = {
+    Material: MaterialRecord,
+    MaterialIndices: MaterialIndicesRecord,
+    Hardness: HardnessRecord,
+    ChemicalComposition: ChemicalCompositionRecord,
+    TechnologicalProperties: TechnologicalPropertiesRecord,
+    MechanicalProperties: MechanicalPropertiesRecord,
+    CharacteristicsOfMaterial: CharacteristicsRecord,
+    Standard: StandardRecord,
+    ChemicalElementRange: ChemicalElementRangeRecord,
+    MechanicalPropertyValue: MechanicalPropertyValueRecord,
+    HardnessValue: HardnessValueRecord,
+    ForeignAnalog: ForeignAnalogRecord,
+}
+
+
+# Функция для преобразования объекта модели в запись только для чтения (None остается None)
+def to_record(instance) -> Optional[Record]:
+    if instance is None:
+        return None
+    record_class = RECORD_CLASSES[type(instance)]
+    return record_class(*(getattr(instance, name) for name in record_class._columns))
+
+
+class MaterialProfile(NamedTuple):
+    """Материал, первые (по id) записи всех таблиц свойств и стандарт химического состава."""
+    brand: str
+    material: MaterialRecord
+    chemical_composition: Optional[ChemicalCompositionRecord]
+    hardness: Optional[HardnessRecord]
+    mechanical_properties: Optional[MechanicalPropertiesRecord]
+    technological_properties: Optional[TechnologicalPropertiesRecord]
+    characteristics: Optional[CharacteristicsRecord]
+    material_indices: Optional[MaterialIndicesRecord]
+    standard: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает профиль в виде словаря из словарей и строк (например, для `json.dumps`)."""
+        return {name: value._asdict() if isinstance(value, Record) else value
+                for name, value in zip(self._fields, self)}
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль реализует поиск марок-заменителей по химическому составу (поиск ближайших соседей).
+
+Химический состав каждого материала кодируется вектором фиксированной длины: для каждого элемента из
+`ELEMENT_COLUMNS` берется середина диапазона содержания (отсутствующий элемент - 0). Из середин диапазонов извлекается
+квадратный корень (расстояние Хеллингера для долей): иначе основа сплава (Fe, Cu, Ni, Al) подавляла бы различия в
+легирующих элементах, а деление на разброс по каталогу, наоборот, обесценивает разницу в 1-2% легирующего элемента.
+Нормированная матрица и квадраты норм строк вычисляются один раз, а расстояния до всех материалов для пакета брендов
+считаются одним матричным умножением.
+
+Основные компоненты:
+- `Substitute`: Результат поиска: бренд и расстояние до исходного материала.
+- `SubstituteIndex`: Нормированная матрица составов и поиск k ближайших материалов.
+- `get_substitute_index()`: Возвращает общий индекс, построенный по матрице
+  `composition_search.get_composition_matrix()`; индекс перестраивается вместе с матрицей после изменения химического
+  состава через сессии пакета.
+- `find_substitutes(brand, k, same_class)`: Возвращает k ближайших по составу материалов.
+- `find_substitutes_bulk(brands, k, same_class)`: То же для списка брендов; возвращает `BulkResult`.
+
+Параметр `same_class=True` ограничивает поиск материалами того же класса (`Material.class_of_material`).
+
+Использование:
+    from materials.similarity import find_substitutes
+
+    for substitute in find_substitutes("30ХМА", k=5, same_class=True):
+        print(substitute.brand, substitute.distance)
+"""
+import threading
+from typing import Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from materials.composition_search import CompositionMatrix, get_composition_matrix
+from materials.crud import BulkResult, _unique
+
+# Количество брендов, для которых расстояния вычисляются одним матричным умножением
+BATCH_SIZE = 256
+
+
+class Substitute(NamedTuple):
+    """Материал, близкий по химическому составу, и расстояние до исходного материала в нормированном пространстве."""
+    brand: str
+    distance: float
+
+
+class SubstituteIndex:
+    """Нормированные векторы составов всех материалов для поиска ближайших соседей."""
+
+    def __init__(self, matrix: CompositionMatrix):
+        self.matrix = matrix
+        self.vectors = np.sqrt((matrix.mins + matrix.maxs) / 2.0)
+        self.squared_norms = np.einsum("ij,ij->i", self.vectors, self.vectors)
+
+    def _nearest(self, rows: np.ndarray, k: int, same_class: bool) -> List[List[Substitute]]:
+        vectors = self.vectors[rows]
+        distances = self.squared_norms[rows, None] + self.squared_norms[None, :] - 2.0 * vectors @ self.vectors.T
+        np.maximum(distances, 0.0, out=distances)
+        distances[np.arange(len(rows)), rows] = np.inf
+        if same_class:
+            distances[self.matrix.classes[rows, None] != self.matrix.classes[None, :]] = np.inf
+
+        k = min(k, distances.shape[1] - 1)
+        if k <= 0:
+            return [[] for _ in rows]
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        result = []
+        for row_distances, candidates in zip(distances, nearest):
+            candidates = candidates[np.lexsort((candidates, row_distances[candidates]))]
+            result.append([Substitute(self.matrix.brands[index], float(np.sqrt(row_distances[index])))
+                           for index in candidates if np.isfinite(row_distances[index])])
+        return result
+
+    def find(self, brand: str, k: int = 5, same_class: bool = False) -> Optional[List[Substitute]]:
+        """Возвращает k ближайших по составу материалов (None, если состав материала неизвестен)."""
+        row = self.matrix.brand_index.get(brand)
+        if row is None:
+            return None
+        return self._nearest(np.array([row]), k, same_class)[0]
+
+    def find_bulk(self, brands: Iterable[str], k: int = 5, same_class: bool = False) -> BulkResult:
+        """Возвращает k ближайших материалов для каждого бренда; бренды без состава перечислены в `missing`."""
+        brands = _unique(brands)
+        known = [brand for brand in brands if brand in self.matrix.brand_index]
+        result = BulkResult(missing=[brand for brand in brands if brand not in self.matrix.brand_index])
+        for start in range(0, len(known), BATCH_SIZE):
+            batch = known[start:start + BATCH_SIZE]
+            rows = np.array([self.matrix.brand_index[brand] for brand in batch])
+            for brand, substitutes in zip(batch, self._nearest(rows, k, same_class)):
+                result[brand] = substitutes
+        return result
+
+
+_index: Optional[SubstituteIndex] = None
+_index_lock = threading.Lock()
+
+
+# Функция для получения общего индекса заменителей (перестраивается вместе с матрицей состава)
+def get_substitute_index() -> SubstituteIndex:
+    global _index
+    matrix = get_composition_matrix()
+    if _index is None or _index.matrix is not matrix:
+        with _index_lock:
+            if _index is None or _index.matrix is not matrix:
+                _index = SubstituteIndex(matrix)
+    return _index
+
+
+# Функция для поиска k ближайших по химическому составу материалов
+def find_substitutes(brand: str, k: int = 5, same_class: bool = False) -> Optional[List[Substitute]]:
+    return get_substitute_index().find(brand, k, same_class)
+
+
+# Функция для поиска k ближайших по химическому составу материалов для списка брендов
+def find_substitutes_bulk(brands: Iterable[str], k: int = 5, same_class: bool = False) -> BulkResult:
+    return get_substitute_index().find_bulk(brands, k, same_class)
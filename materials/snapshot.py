@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Этот модуль реализует режим работы с базой данных материалов, полностью загруженной в память. Поставляемая база данных
+используется только для чтения, поэтому ее можно один раз прочитать целиком и отвечать на запросы без обращения к
+SQLite и ORM.
+
+`MaterialsSnapshot` загружает все таблицы за один проход (по одному запросу SQLAlchemy Core на таблицу, без создания
+объектов ORM) и хранит их в виде записей только для чтения из модуля `materials.records`, сгруппированных в словари по
+бренду и идентификатору. Методы снимка повторяют функции модуля `crud` (без параметра `db`) и выполняются за O(1).
+
+Основные компоненты:
+- `MaterialsSnapshot`: Снимок базы данных в памяти.
+- `MaterialsSnapshot.load(db)`: Загружает снимок из базы данных.
+- `get_snapshot()`: Возвращает общий снимок, загружая его при первом обращении.
+
+В отличие от функций `crud`, методы снимка не печатают сообщения о ненайденных материалах, а просто возвращают `None`.
+
+Использование:
+    from materials.snapshot import get_snapshot
+
+    snapshot = get_snapshot()
+    composition = snapshot.get_chemical_composition_by_brand("30ХМА")
+    print(composition.C)
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from materials.crud import BULK_TABLES, BulkResult, _unique
+from materials.database import session_scope
+from materials.models import Material, Standard
+from materials.parsers import parse_composition
+from materials.records import RECORD_CLASSES, Record, MaterialRecord, MaterialIndicesRecord, MaterialProfile
+
+
+class MaterialsSnapshot:
+    """Снимок всех таблиц базы данных материалов в памяти с методами, повторяющими функции `crud`."""
+
+    def __init__(self, materials: Iterable[MaterialRecord], related: Dict[str, Iterable[Record]],
+                 standards: Iterable[Record]):
+        self._materials_by_brand: Dict[str, MaterialRecord] = {}
+        for material in materials:
+            self._materials_by_brand.setdefault(material.brand, material)
+        self._brands = tuple(self._materials_by_brand)
+        brand_by_id = {material.id: material.brand for material in self._materials_by_brand.values()}
+
+        related = {name: sorted(records, key=lambda item: item.id) for name, records in related.items()}
+        self._init_standards(brand_by_id, related.get("chemical_composition", ()), standards)
+
+        self._material_indices_by_id: Dict[int, MaterialIndicesRecord] = {}
+        brands_by_class_index: Dict[int, List[str]] = {}
+        for index in related.get("material_indices", ()):
+            self._material_indices_by_id[index.id] = index
+            brand = brand_by_id.get(index.material_id)
+            if brand is not None:
+                brands_by_class_index.setdefault(index.index_of_material_class, []).append(brand)
+        self._brands_by_class_index = {key: tuple(value) for key, value in brands_by_class_index.items()}
+
+        # Для каждой таблицы свойств: material_id -> первая по id запись (как `.first()` в функциях crud)
+        self._related: Dict[str, Dict[int, Record]] = {}
+        for name, records in related.items():
+            by_material_id = {}
+            for record in records:
+                by_material_id.setdefault(record.material_id, record)
+            self._related[name] = by_material_id
+
+    def _init_standards(self, brand_by_id: Dict[int, str], compositions: Iterable[Record],
+                        standards: Iterable[Record]):
+        # Стандарт бренда, как в `crud`: первый по id состав со standard_id, иначе первый по id стандарт с
+        # material_name, равным бренду. Наименования, которых нет в materials, ищутся только по material_name
+        standard_by_id: Dict[int, str] = {}
+        self._standard_by_name: Dict[str, str] = {}
+        brands_by_standard: Dict[str, set] = {}
+        for standard in sorted(standards, key=lambda item: item.id):
+            standard_by_id[standard.id] = standard.standard
+            self._standard_by_name.setdefault(standard.material_name, standard.standard)
+            if standard.material_name in self._materials_by_brand:
+                brands_by_standard.setdefault(standard.standard, set()).add(standard.material_name)
+
+        self._standard_by_brand: Dict[str, Optional[str]] = {}
+        for composition in compositions:
+            brand = brand_by_id.get(composition.material_id)
+            standard = standard_by_id.get(composition.standard_id)
+            if brand is not None and standard is not None:
+                self._standard_by_brand.setdefault(brand, standard)
+                brands_by_standard.setdefault(standard, set()).add(brand)
+        for brand in self._brands:
+            if brand not in self._standard_by_brand:
+                self._standard_by_brand[brand] = self._standard_by_name.get(brand)
+        self._brands_by_standard = {key: tuple(sorted(value)) for key, value in brands_by_standard.items()}
+
+    @classmethod
+    def load(cls, db: Optional[Session] = None) -> "MaterialsSnapshot":
+        """Загружает все таблицы базы данных за один проход."""
+        with session_scope(db) as db:
+            def records(model):
+                record_class = RECORD_CLASSES[model]
+                return [record_class(*row) for row in db.execute(select(model.__table__))]
+
+            return cls(
+                materials=records(Material),
+                related={name: records(model) for name, model in BULK_TABLES.items()},
+                standards=records(Standard),
+            )
+
+    def __len__(self):
+        return len(self._materials_by_brand)
+
+    def __contains__(self, brand: str):
+        return brand in self._materials_by_brand
+
+    def __repr__(self):
+        return f"<MaterialsSnapshot(materials={len(self)})>"
+
+    def _related_by_brand(self, name: str, brand: str) -> Optional[Record]:
+        material = self._materials_by_brand.get(brand)
+        if material is None:
+            return None
+        return self._related[name].get(material.id)
+
+    def _related_by_brands(self, name: str, brands: Iterable[str]) -> BulkResult:
+        brands = _unique(brands)
+        return BulkResult({brand: self._related_by_brand(name, brand) for brand in brands if brand in self},
+                          [brand for brand in brands if brand not in self])
+
+    def get_material_by_brand(self, brand: str) -> Optional[MaterialRecord]:
+        return self._materials_by_brand.get(brand)
+
+    def get_material_class_index_by_id(self, index_id: int) -> Optional[MaterialIndicesRecord]:
+        return self._material_indices_by_id.get(index_id)
+
+    def get_hardness_by_brand(self, brand: str):
+        return self._related_by_brand("hardness", brand)
+
+    def get_chemical_composition_by_brand(self, brand: str):
+        return self._related_by_brand("chemical_composition", brand)
+
+    def get_technological_properties_by_brand(self, brand: str):
+        return self._related_by_brand("technological_properties", brand)
+
+    def get_mechanical_properties_by_brand(self, brand: str):
+        return self._related_by_brand("mechanical_properties", brand)
+
+    def get_characteristics_by_brand(self, brand: str):
+        return self._related_by_brand("characteristics", brand)
+
+    def get_chemical_element_ranges_by_brand(self, brand: str) -> Optional[Dict[str, Tuple[float, float]]]:
+        if brand not in self:
+            return None
+        composition = self.get_chemical_composition_by_brand(brand)
+        return parse_composition(composition) if composition is not None else {}
+
+    def get_all_brands(self) -> List[str]:
+        return list(self._brands)
+
+    def get_brands_by_material_class_index(self, index_of_material_class: int) -> List[str]:
+        return list(self._brands_by_class_index.get(index_of_material_class, ()))
+
+    def get_standard_of_chemical_composition_by_brand(self, brand: str) -> Optional[str]:
+        if brand in self._standard_by_brand:
+            return self._standard_by_brand[brand]
+        return self._standard_by_name.get(brand)
+
+    def get_brands_by_standard(self, standard: str) -> List[str]:
+        return list(self._brands_by_standard.get(standard, ()))
+
+    def get_materials_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        brands = _unique(brands)
+        return BulkResult({brand: self._materials_by_brand[brand] for brand in brands if brand in self},
+                          [brand for brand in brands if brand not in self])
+
+    def get_hardness_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._related_by_brands("hardness", brands)
+
+    def get_chemical_composition_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._related_by_brands("chemical_composition", brands)
+
+    def get_technological_properties_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._related_by_brands("technological_properties", brands)
+
+    def get_mechanical_properties_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._related_by_brands("mechanical_properties", brands)
+
+    def get_characteristics_by_brands(self, brands: Iterable[str]) -> BulkResult:
+        return self._related_by_brands("characteristics", brands)
+
+    def get_standards(self, brands: Iterable[str]) -> BulkResult:
+        brands = _unique(brands)
+        found = {brand: self.get_standard_of_chemical_composition_by_brand(brand) for brand in brands
+                 if brand in self or brand in self._standard_by_name}
+        return BulkResult(found, [brand for brand in brands if brand not in found])
+
+    def get_materials_bulk(self, brands: Iterable[str], include: Optional[Iterable[str]] = None) -> BulkResult:
+        include = list(BULK_TABLES) if include is None else _unique(include)
+        unknown = [name for name in include if name not in BULK_TABLES]
+        if unknown:
+            raise ValueError(f"Неизвестные таблицы для пакетной загрузки: {unknown}. Доступны: {list(BULK_TABLES)}")
+        materials = self.get_materials_by_brands(brands)
+        result = BulkResult(missing=materials.missing)
+        for brand, material in materials.items():
+            result[brand] = {"material": material}
+            for name in include:
+                result[brand][name] = self._related[name].get(material.id)
+        return result
+
+    def get_material_profile(self, brand: str) -> Optional[MaterialProfile]:
+        material = self._materials_by_brand.get(brand)
+        if material is None:
+            return None
+        return MaterialProfile(brand=brand, material=material,
+                               standard=self.get_standard_of_chemical_composition_by_brand(brand),
+                               **{name: self._related[name].get(material.id) for name in BULK_TABLES})
+
+    def get_material_profiles(self, brands: Iterable[str]) -> BulkResult:
+        brands = _unique(brands)
+        return BulkResult({brand: self.get_material_profile(brand) for brand in brands if brand in self},
+                          [brand for brand in brands if brand not in self])
+
+
+_snapshot: Optional[MaterialsSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+# Функция для получения общего снимка базы данных (загружается при первом обращении)
+def get_snapshot() -> MaterialsSnapshot:
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = MaterialsSnapshot.load()
+    return _snapshot
+
+
+# Функция для сброса общего снимка; следующий вызов get_snapshot() загрузит данные заново
+def reset_snapshot() -> None:
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
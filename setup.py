@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 setup(
     name='materials',
     version='0.2.09',
-    packages=find_packages(),
+    packages=find_packages(exclude=('benchmarks', 'benchmarks.*')),
     include_package_data=True,
     package_data={
         'materials': ['data/materials1.db'],
@@ -14,6 +14,10 @@ setup(
         'pandas>=2.0.0',
         'numpy>=1.24.0',
     ],
+    extras_require={
+        'aio': ['aiosqlite>=0.19.0', 'greenlet>=3.0.0'],
+        'arrow': ['pyarrow>=14.0.0'],
+    },
     python_requires='>=3.8',
     description='Пакет Python для работы с базой данных материалов',
     author='sad-engineer',
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Общие настройки тестов. Тесты работают с копией поставляемой базы данных во временном каталоге, поэтому переменные
+окружения `MATERIALS_DATABASE_PATH` и `MATERIALS_COMPILED_PATH` задаются до импорта пакета `materials`. Тесты, которые
+изменяют данные, выполняют изменения в сессии `db` и откатывают их по завершении.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import pytest
+
+_PACKAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "materials")
+_TEMP_DIR = tempfile.mkdtemp(prefix="materials-tests-")
+DATABASE_PATH = os.path.join(_TEMP_DIR, "materials.db")
+shutil.copyfile(os.path.join(_PACKAGE_DIR, "materials.db"), DATABASE_PATH)
+os.environ["MATERIALS_DATABASE_PATH"] = DATABASE_PATH
+os.environ["MATERIALS_COMPILED_PATH"] = os.path.join(_TEMP_DIR, "materials.catalogue")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_TEMP_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db():
+    """Сессия, изменения в которой откатываются после теста."""
+    from materials.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def sqlite_connection():
+    """Соединение sqlite3 с копией базы данных для вычисления ожидаемых значений без пакета."""
+    connection = sqlite3.connect(DATABASE_PATH)
+    yield connection
+    connection.close()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Тесты асинхронных функций `materials.aio`: результаты совпадают с синхронными функциями `crud`.
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from materials import aio, crud  # noqa: E402
+
+BRANDS = ["30ХМА", "Л63", "08Н6Г4МЛ", "10Г2С", "Неизвестная марка"]
+
+
+# Функция для выполнения сопрограммы в новом цикле событий с закрытием соединений асинхронного движка
+def run(coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await aio.dispose_async_engine()
+
+    return asyncio.run(main())
+
+
+def test_standards_match_crud():
+    expected = crud.get_standards(BRANDS)
+    result = run(aio.get_standards(BRANDS))
+    assert dict(result) == dict(expected)
+    assert result.missing == expected.missing == ["Неизвестная марка"]
+
+
+@pytest.mark.parametrize("brand", BRANDS)
+def test_standard_by_brand_matches_crud(brand):
+    expected = crud.get_standard_of_chemical_composition_by_brand(brand)
+    assert run(aio.get_standard_of_chemical_composition_by_brand(brand)) == expected
+
+
+def test_concurrent_first_sessions():
+    async def lookups():
+        return await asyncio.gather(*(aio.get_material_by_brand("30ХМА") for _ in range(10)))
+
+    assert {material.id for material in run(lookups())} == {crud.get_material_by_brand("30ХМА").id}
+
+
+def test_materials_bulk_matches_crud():
+    expected = crud.get_materials_bulk(BRANDS)
+    result = run(aio.get_materials_bulk(BRANDS))
+    assert result.missing == expected.missing
+    assert dict(result) == dict(expected)
+
+
+def test_material_profiles_match_crud():
+    expected = crud.get_material_profiles(BRANDS)
+    result = run(aio.get_material_profiles(BRANDS))
+    assert result.missing == expected.missing
+    assert dict(result) == dict(expected)
+
+
+@pytest.mark.parametrize("brand", BRANDS)
+def test_getters_match_crud(brand):
+    for getter in ["get_material_by_brand", "get_hardness_by_brand", "get_chemical_composition_by_brand",
+                   "get_mechanical_properties_by_brand", "get_chemical_element_ranges_by_brand",
+                   "get_material_profile"]:
+        assert run(getattr(aio, getter)(brand)) == getattr(crud, getter)(brand), getter
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Тесты кэша функций `crud` (`materials.cache`).
+"""
+import pytest
+
+from materials import cache, crud, database
+from materials.cache import CachedCrud, TTLCache, freeze
+
+
+@pytest.fixture
+def cached():
+    return CachedCrud(maxsize=16, ttl=None, revision_check_interval=0)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    lru = TTLCache(maxsize=2, ttl=None)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1
+    lru.put("c", 3)
+    assert lru.get("b") is None
+    assert (lru.get("a"), lru.get("c")) == (1, 3)
+    assert lru.stats().evictions == 1
+
+
+def test_freeze_converts_lists_only():
+    record = crud.get_material_by_brand("30ХМА")
+    assert freeze([record, "Л63"]) == (record, "Л63")
+    assert freeze(record) is record
+
+
+def test_cached_value_matches_crud(cached):
+    assert cached.get_chemical_composition_by_brand("30ХМА") == crud.get_chemical_composition_by_brand("30ХМА")
+    assert cached.get_all_brands() == crud.get_all_brands()
+    cached.get_chemical_composition_by_brand("30ХМА")
+    assert cached.stats().hits == 1
+
+
+def test_write_generation_invalidates(cached, monkeypatch):
+    cached.get_material_by_brand("30ХМА")
+    monkeypatch.setattr(database, "_write_generation", database.get_write_generation() + 1)
+    cached.get_material_by_brand("30ХМА")
+    assert cached.stats().misses == 2
+
+
+def test_result_of_call_overlapping_a_write_is_not_stored(cached, monkeypatch):
+    def lookup(brand):
+        # Транзакция подтверждена, пока функция выполняет запрос
+        monkeypatch.setattr(database, "_write_generation", database.get_write_generation() + 1)
+        return crud.get_material_by_brand(brand)
+
+    assert cached._call(lookup, "30ХМА").brand == "30ХМА"
+    assert len(cached._cache) == 0
+
+
+def test_revision_is_checked_on_miss_only(cached, monkeypatch):
+    calls = []
+    monkeypatch.setattr(cache, "get_alembic_revision", lambda: calls.append(1) or "revision")
+    cached.get_material_by_brand("30ХМА")
+    cached.get_material_by_brand("30ХМА")
+    cached.get_material_by_brand("30ХМА")
+    assert len(calls) == 1
+    cached.get_material_by_brand("Л63")
+    assert len(calls) == 2
+
+
+def test_revision_change_invalidates(cached, monkeypatch):
+    revisions = iter(["a", "b"])
+    monkeypatch.setattr(cache, "get_alembic_revision", lambda: next(revisions))
+    cached.get_material_by_brand("30ХМА")
+    cached.get_material_by_brand("Л63")
+    assert cached.stats().invalidations == 1
+    assert len(cached._cache) == 1
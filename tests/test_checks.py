@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Тесты производительности пакета: те же проверки, что выполняет `python -m materials.checks` (планы запросов функций
+`crud` и время импорта пакета). Бюджет времени импорта задается переменной окружения `MATERIALS_IMPORT_TIME_BUDGET`.
+
+Поиск марок по индексу проверяется относительно: он должен быть в несколько раз быстрее полного перебора марок с
+вычислением сходства по триграммам, поэтому результат не зависит от нагрузки машины, на которой выполняются тесты.
+
+Использование:
+    python -m pytest tests
+"""
+import statistics
+import time
+
+from materials import brand_search, checks
+
+# Во сколько раз поиск по индексу должен быть быстрее полного перебора (на практике - в 10-40 раз)
+BRAND_SEARCH_MIN_SPEEDUP = 3
+
+
+def test_query_plans_use_indexes():
+    checks.check_query_plans()
+
+
+def test_import_time_within_budget():
+    assert checks.check_import_time() <= checks.IMPORT_TIME_BUDGET
+
+
+# Функция для поиска похожих марок полным перебором, без индекса триграмм
+def _scan_similar(index: brand_search.BrandIndex, query: str, limit: int = 10):
+    trigrams = brand_search._trigrams(brand_search.normalize_brand(query))
+    scored = []
+    for position, key in enumerate(index.keys):
+        other = brand_search._trigrams(key)
+        score = len(trigrams & other) / len(trigrams | other)
+        if score >= brand_search.MIN_SIMILARITY:
+            scored.append((-score, position))
+    return sorted(scored)[:limit]
+
+
+# Функция для измерения медианного времени полного перебора для каждой строки поиска
+def _measure_scan_time(queries, repeat: int = 5):
+    index = brand_search.get_brand_index()
+    timings = {}
+    for query in queries:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _scan_similar(index, query)
+            samples.append(time.perf_counter() - start)
+        timings[query] = statistics.median(samples)
+    return timings
+
+
+def test_brand_search_faster_than_full_scan():
+    indexed = checks.measure_brand_search_time()
+    scanned = _measure_scan_time(checks.BRAND_SEARCH_QUERIES)
+    assert set(indexed) == set(checks.BRAND_SEARCH_QUERIES)
+    assert sum(indexed.values()) * BRAND_SEARCH_MIN_SPEEDUP < sum(scanned.values())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Тесты обновления производных таблиц (`materials.derived`) при записи через сессии пакета: сброс сессии, массовые
+`update`, `delete` и `insert`. Изменения выполняются в сессии `db` и откатываются после теста.
+"""
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.orm import Session
+
+from materials.database import MaterialsSession, get_engine
+from materials.models import ChemicalComposition, ChemicalElementRange, Hardness, HardnessValue, Material
+
+BRAND = "30ХМА"
+
+
+# Функция для получения диапазонов элемента по материалу из производной таблицы: список (min, max)
+def element_ranges(db, material_id: int, element: str = "C") -> list:
+    statement = select(ChemicalElementRange.min_value, ChemicalElementRange.max_value) \
+        .where(ChemicalElementRange.material_id == material_id, ChemicalElementRange.element == element)
+    return [tuple(row) for row in db.execute(statement)]
+
+
+def material_id(db) -> int:
+    return db.execute(select(Material.id).where(Material.brand == BRAND)).scalar_one()
+
+
+def test_refresh_after_flush(db):
+    composition = db.query(ChemicalComposition).filter(ChemicalComposition.material_id == material_id(db)).one()
+    composition.C = "0.5 - 0.6"
+    db.flush()
+    assert element_ranges(db, material_id(db)) == [(0.5, 0.6)]
+
+
+def test_refresh_after_flush_of_deleted_record(db):
+    db.delete(db.query(ChemicalComposition).filter(ChemicalComposition.material_id == material_id(db)).one())
+    db.flush()
+    assert element_ranges(db, material_id(db)) == []
+
+
+def test_hardness_refresh_after_flush(db):
+    hardness = db.query(Hardness).filter(Hardness.material_id == material_id(db)).first()
+    hardness.hardness_value = "Твердость 30ХМА после отжига , ГОСТ 4543-71/HB 10 -1 = 650 МПа"
+    db.flush()
+    values = db.execute(select(HardnessValue.min_value).where(HardnessValue.hardness_id == hardness.id)).scalars()
+    assert 650.0 in list(values)
+
+
+def test_refresh_after_bulk_update(db):
+    db.execute(update(ChemicalComposition).where(ChemicalComposition.material_id == material_id(db))
+               .values(C="0.7 - 0.8"))
+    assert element_ranges(db, material_id(db)) == [(0.7, 0.8)]
+
+
+def test_refresh_after_bulk_delete(db):
+    db.execute(delete(ChemicalComposition).where(ChemicalComposition.material_id == material_id(db)))
+    assert element_ranges(db, material_id(db)) == []
+
+
+def test_refresh_after_bulk_insert(db):
+    db.execute(delete(ChemicalComposition).where(ChemicalComposition.material_id == material_id(db)))
+    db.execute(insert(ChemicalComposition), [{"material_id": material_id(db), "C": "0.1 - 0.2"}])
+    assert element_ranges(db, material_id(db)) == [(0.1, 0.2)]
+
+
+def test_other_do_orm_execute_handlers_run(db):
+    statements = []
+
+    def handler(orm_execute_state):
+        statements.append(orm_execute_state.is_update)
+
+    event.listen(MaterialsSession, "do_orm_execute", handler)
+    try:
+        db.execute(update(ChemicalComposition).where(ChemicalComposition.material_id == material_id(db))
+                   .values(C="0.7 - 0.8"))
+    finally:
+        event.remove(MaterialsSession, "do_orm_execute", handler)
+    assert True in statements
+
+
+def test_other_sessions_are_not_affected():
+    with Session(bind=get_engine()) as session:
+        before = element_ranges(session, material_id(session))
+        session.execute(update(ChemicalComposition).where(ChemicalComposition.material_id == material_id(session))
+                        .values(C="0.7 - 0.8"))
+        assert element_ranges(session, material_id(session)) == before
+        session.rollback()
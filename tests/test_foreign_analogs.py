@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Тесты зарубежных аналогов: разбор строки аналогов (`materials.parsers.foreign_analogs`) и поиск материалов по аналогу
+(`crud.find_by_foreign_analog`, `crud.get_foreign_analogs_by_brand`). Поставляемая база данных не содержит аналогов,
+поэтому тесты поиска записывают строку аналогов материала в сессии `db`; изменения откатываются после теста.
+"""
+import pytest
+
+from materials import crud
+from materials.models import CharacteristicsOfMaterial, Material
+from materials.parsers import ForeignAnalogEntry, normalize_grade, parse_foreign_analogs, parse_foreign_grade
+
+BRAND = "30ХМА"
+ANALOGS = "США: AISI 4130, 4130H; Германия: 1.7218, 25CrMo4; Япония: SCM430"
+
+
+@pytest.fixture
+def analogs_db(db):
+    material_id = db.query(Material.id).filter(Material.brand == BRAND).scalar()
+    characteristics = db.query(CharacteristicsOfMaterial) \
+        .filter(CharacteristicsOfMaterial.material_id == material_id).one()
+    characteristics.foreign_analogs = ANALOGS
+    db.flush()
+    return db
+
+
+def test_parse_foreign_analogs():
+    assert parse_foreign_analogs(ANALOGS) == [
+        ForeignAnalogEntry("AISI", "4130"),
+        ForeignAnalogEntry("AISI", "4130H"),
+        ForeignAnalogEntry("W.Nr.", "1.7218"),
+        ForeignAnalogEntry("DIN", "25CrMo4"),
+        ForeignAnalogEntry("JIS", "SCM430"),
+    ]
+    assert parse_foreign_analogs("нет данных") == []
+    assert parse_foreign_analogs(None) == []
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("AISI 4130", ForeignAnalogEntry("AISI", "4130")),
+    ("AISI4130", ForeignAnalogEntry("AISI", "4130")),
+    ("(DIN 25CrMo4)", ForeignAnalogEntry("DIN", "25CrMo4")),
+    ("G41300", ForeignAnalogEntry("UNS", "G41300")),
+    ("4130", ForeignAnalogEntry(None, "4130")),
+    ("-", None),
+])
+def test_parse_foreign_grade(text, expected):
+    assert parse_foreign_grade(text) == expected
+
+
+def test_normalize_grade():
+    assert normalize_grade("25 Cr-Mo.4") == "25CRMO4"
+
+
+def test_find_by_foreign_analog(analogs_db):
+    result = crud.find_by_foreign_analog("AISI 4130", db=analogs_db)
+    assert [(brand, record.standard_system, record.foreign_grade) for brand, record in result] == \
+        [(BRAND, "AISI", "4130")]
+    assert [brand for brand, _ in crud.find_by_foreign_analog("aisi4130", db=analogs_db)] == [BRAND]
+    assert [brand for brand, _ in crud.find_by_foreign_analog("25crmo4", db=analogs_db)] == [BRAND]
+
+
+def test_find_by_foreign_analog_standard_system(analogs_db):
+    assert [brand for brand, _ in crud.find_by_foreign_analog("4130", "AISI", db=analogs_db)] == [BRAND]
+    assert crud.find_by_foreign_analog("4130", "DIN", db=analogs_db) == []
+    assert crud.find_by_foreign_analog("DIN 4130", db=analogs_db) == []
+
+
+def test_find_by_unknown_foreign_analog(analogs_db):
+    assert crud.find_by_foreign_analog("AISI 9999", db=analogs_db) == []
+    assert crud.find_by_foreign_analog("", db=analogs_db) == []
+
+
+def test_get_foreign_analogs_by_brand(analogs_db):
+    analogs = crud.get_foreign_analogs_by_brand(BRAND, db=analogs_db)
+    assert [(record.standard_system, record.foreign_grade) for record in analogs] == \
+        [tuple(entry) for entry in parse_foreign_analogs(ANALOGS)]
+    assert [record.foreign_grade for record in crud.get_foreign_analogs_by_brand(BRAND, "DIN", db=analogs_db)] == \
+        ["25CrMo4"]
+    assert crud.get_foreign_analogs_by_brand(BRAND, "GB", db=analogs_db) == []
+    assert crud.get_foreign_analogs_by_brand("Неизвестная марка", db=analogs_db) == []
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Тесты совпадения результатов снимка данных в памяти (`materials.snapshot`) и скомпилированного каталога
+(`materials.compiled`) с функциями `crud`. Пакетные функции проверяются по всем брендам базы данных, включая
+ненайденные бренды; функции для одного бренда - по каждому `SAMPLE_STEP`-му бренду, чтобы тесты выполнялись быстро.
+"""
+import pytest
+
+from materials import crud
+from materials.compiled import compile_catalogue, CompiledCatalogue
+from materials.snapshot import MaterialsSnapshot
+
+UNKNOWN = "Неизвестная марка"
+
+# Шаг выборки брендов для проверки функций для одного бренда
+SAMPLE_STEP = 25
+
+GETTERS = [
+    "get_material_by_brand",
+    "get_hardness_by_brand",
+    "get_chemical_composition_by_brand",
+    "get_technological_properties_by_brand",
+    "get_mechanical_properties_by_brand",
+    "get_characteristics_by_brand",
+    "get_chemical_element_ranges_by_brand",
+    "get_standard_of_chemical_composition_by_brand",
+    "get_material_profile",
+]
+
+BULK_GETTERS = [
+    "get_materials_by_brands",
+    "get_hardness_by_brands",
+    "get_chemical_composition_by_brands",
+    "get_technological_properties_by_brands",
+    "get_mechanical_properties_by_brands",
+    "get_characteristics_by_brands",
+    "get_materials_bulk",
+    "get_material_profiles",
+]
+
+
+@pytest.fixture(scope="module")
+def brands():
+    return crud.get_all_brands()
+
+
+@pytest.fixture(scope="module", params=["snapshot", "compiled"])
+def source(request, tmp_path_factory):
+    if request.param == "snapshot":
+        yield MaterialsSnapshot.load()
+        return
+    path = str(tmp_path_factory.mktemp("compiled") / "materials.catalogue")
+    compile_catalogue(path)
+    catalogue = CompiledCatalogue(path)
+    yield catalogue
+    catalogue.close()
+
+
+def test_all_brands(source, brands):
+    assert source.get_all_brands() == brands
+
+
+@pytest.mark.parametrize("getter", GETTERS)
+def test_getter_matches_crud(source, brands, getter):
+    for brand in brands[::SAMPLE_STEP] + [UNKNOWN]:
+        assert getattr(source, getter)(brand) == getattr(crud, getter)(brand), brand
+
+
+@pytest.mark.parametrize("getter", BULK_GETTERS)
+def test_bulk_matches_crud(source, brands, getter):
+    names = brands + [UNKNOWN, brands[0]]
+    expected = getattr(crud, getter)(names)
+    result = getattr(source, getter)(names)
+    assert list(result) == list(expected)
+    assert dict(result) == dict(expected)
+    assert result.missing == expected.missing == [UNKNOWN]
+
+
+def test_brands_by_class_index_match_crud(source, sqlite_connection):
+    indices = [index for index, in sqlite_connection.execute(
+        "SELECT DISTINCT index_of_material_class FROM material_indices WHERE index_of_material_class IS NOT NULL")]
+    assert indices
+    for index in sorted(indices) + [-1]:
+        assert source.get_brands_by_material_class_index(index) == crud.get_brands_by_material_class_index(index)
+
+
+def test_bulk_missing_keeps_request_order():
+    result = crud.get_hardness_by_brands([UNKNOWN, "30ХМА", "Другая марка", UNKNOWN])
+    assert list(result) == ["30ХМА"]
+    assert result.missing == [UNKNOWN, "Другая марка"]
+    assert crud.get_materials_bulk([]) == {} and crud.get_materials_bulk([]).missing == []
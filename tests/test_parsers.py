@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Тесты разборщиков текстовых полей (`materials.parsers`): диапазоны содержания элементов, твердость и перевод между
+шкалами твердости, механические свойства.
+"""
+import math
+
+import pytest
+
+from materials.parsers import HardnessEntry, MechanicalPropertyEntry, convert_hardness, convert_hardness_range, \
+    parse_hardness, parse_mechanical_property, parse_range
+from materials.parsers.composition import MAX_CONTENT
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("0.01 - 0.04", (0.01, 0.04)),
+    ("0.5-0.1%", (0.1, 0.5)),
+    ("до 0.2", (0.0, 0.2)),
+    ("<= 0,035", (0.0, 0.035)),
+    ("min 0.5", (0.5, MAX_CONTENT)),
+    ("0,3", (0.3, 0.3)),
+    (".8", (0.8, 0.8)),
+])
+def test_parse_range(value, expected):
+    assert parse_range(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value", [None, "", "ост.", "следы"])
+def test_parse_range_without_number(value):
+    assert parse_range(value) is None
+
+
+def test_parse_hardness():
+    value = "Твердость 30ХМА после отжига , ГОСТ 4543-71/HB 10 -1 = 650 МПа; Пруток/HRCэ 50 - 45; без значения"
+    assert parse_hardness(value) == [
+        HardnessEntry("HB", "30ХМА после отжига , ГОСТ 4543-71", 650.0, 650.0),
+        HardnessEntry("HRC", "Пруток", 45.0, 50.0),
+    ]
+    assert parse_hardness(None) == []
+
+
+def test_convert_hardness():
+    assert convert_hardness(30, "HRC", "HB") == 286.0
+    assert convert_hardness(300, "HV", "HRC") == pytest.approx(29.72, abs=0.01)
+    assert convert_hardness(250, "HB", "HB") == 250.0
+    # Значения вне таблицы соответствия не переводятся
+    assert convert_hardness(100, "HV", "HRC") is None
+    assert convert_hardness(65, "HRC", "HB") is None
+
+
+def test_convert_hardness_unknown_scale():
+    with pytest.raises(ValueError):
+        convert_hardness(100, "HRB", "HV")
+
+
+def test_convert_hardness_range():
+    assert convert_hardness_range(20, 30, "HRC", "HB") == (226.0, 286.0)
+    # Граница за пределами таблицы снаружи диапазона становится открытой
+    low, high = convert_hardness_range(200, 300, "HB", "HRC")
+    assert low == -math.inf and high == pytest.approx(31.71, abs=0.01)
+    assert convert_hardness_range(40, 70, "HRC", "HV") == (392.0, math.inf)
+    # Диапазон целиком ниже шкалы HRC не имеет соответствия
+    assert convert_hardness_range(100, 200, "HB", "HRC") is None
+
+
+def test_parse_mechanical_property():
+    value = "Пруток, ГОСТ 4543-71/ 930; Лист, Закалка/ 735 - 490; Поковка/ нет данных"
+    assert parse_mechanical_property("sT", value) == [
+        MechanicalPropertyEntry("sT", "Пруток", None, "ГОСТ 4543-71", 930.0, 930.0),
+        MechanicalPropertyEntry("sT", "Лист", "Закалка", None, 490.0, 735.0),
+    ]
+    assert parse_mechanical_property("sT", None) == []
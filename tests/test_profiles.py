@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Тесты профилей материалов (`crud.get_material_profile`, `crud.get_material_profiles`).
+"""
+from materials import crud
+from materials.crud import BULK_TABLES, _profile_statement
+from materials.models import ChemicalComposition, Hardness, Material, Standard
+
+BRAND = "30ХМА"
+
+
+def test_profile_matches_single_lookups():
+    profile = crud.get_material_profile(BRAND)
+    assert profile.material == crud.get_material_by_brand(BRAND)
+    assert profile.chemical_composition == crud.get_chemical_composition_by_brand(BRAND)
+    assert profile.hardness == crud.get_hardness_by_brand(BRAND)
+    assert profile.characteristics == crud.get_characteristics_by_brand(BRAND)
+    assert profile.standard == crud.get_standard_of_chemical_composition_by_brand(BRAND)
+
+
+def test_profiles_report_missing_brands():
+    profiles = crud.get_material_profiles([BRAND, "Л63", "Неизвестная марка"])
+    assert list(profiles) == [BRAND, "Л63"]
+    assert profiles.missing == ["Неизвестная марка"]
+
+
+def test_several_rows_per_table_do_not_multiply_rows(db):
+    material = db.query(Material).filter(Material.brand == BRAND).one()
+    first_hardness = db.query(Hardness).filter(Hardness.material_id == material.id).first()
+    first_composition = db.query(ChemicalComposition).filter(ChemicalComposition.material_id == material.id).first()
+    standard = crud.get_standard_of_chemical_composition_by_brand(BRAND, db)
+    db.add_all([Hardness(material_id=material.id, hardness_value="HB 10 -1 = 300 МПа"),
+                ChemicalComposition(material_id=material.id, C="0.1 - 0.2"),
+                Standard(material_name=BRAND, standard="Другой стандарт")])
+    db.flush()
+    db.expire_all()
+
+    assert len(db.execute(_profile_statement([BRAND])).unique().all()) == 1
+    profile = crud.get_material_profile(BRAND, db)
+    assert profile.hardness.id == first_hardness.id
+    assert profile.chemical_composition.id == first_composition.id
+    assert profile.standard == standard
+    assert set(BULK_TABLES) <= set(profile.to_dict())
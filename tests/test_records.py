@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Тесты записей только для чтения (`materials.records`): разреженная запись химического состава, неизменяемость,
+сериализация и ограничение общих словарей.
+"""
+import pickle
+
+import pytest
+
+from materials import crud, records
+from materials.models import ChemicalComposition
+from materials.parsers import parse_composition
+from materials.records import ChemicalCompositionRecord, MaterialRecord, _record_class
+
+BRAND = "30ХМА"
+
+
+@pytest.fixture
+def composition():
+    return crud.get_chemical_composition_by_brand(BRAND)
+
+
+def test_sparse_record_keeps_raw_strings(composition):
+    assert composition.C == "0.26 - 0.33"
+    assert composition.Ag is None
+    assert dict(composition.items())["Cr"] == "0.8 - 1.1"
+    assert all(isinstance(value, str) for _, value in composition.items())
+    assert parse_composition(composition)["C"] == (0.26, 0.33)
+
+
+def test_sparse_record_stores_filled_columns_only(composition):
+    filled = {name: value for name, value in composition._asdict().items()
+              if value is not None and name not in ChemicalCompositionRecord._keys}
+    assert dict(composition.items()) == filled
+    assert len(composition.items()) < len(ChemicalCompositionRecord._sparse)
+
+
+def test_unknown_attribute(composition):
+    with pytest.raises(AttributeError):
+        composition.not_a_column
+
+
+def test_records_are_read_only(composition):
+    with pytest.raises(AttributeError):
+        composition.C = "0.1"
+    with pytest.raises(AttributeError):
+        del composition.id
+
+
+def test_records_compare_hash_and_pickle(composition):
+    copy = pickle.loads(pickle.dumps(composition))
+    assert copy == composition and hash(copy) == hash(composition)
+    material = crud.get_material_by_brand(BRAND)
+    assert isinstance(material, MaterialRecord) and material != composition
+
+
+def test_shared_values_stop_growing_at_limit(monkeypatch):
+    record_class = _record_class("LimitedCompositionRecord", ChemicalComposition, sparse=True)
+    monkeypatch.setattr(records, "SHARED_LIMIT", 2)
+    columns = len(record_class._columns)
+    first = record_class(*([1, 1, 1] + ["a", "b"] + [None] * (columns - 5)))
+    second = record_class(*([2, 2, 2] + ["c", "d", "e"] + [None] * (columns - 6)))
+    assert len(record_class._shared_values) == 2 and len(record_class._name_sets) == 2
+    assert [value for _, value in second.items()] == ["c", "d", "e"]
+    assert first.items()[0][1] == "a"
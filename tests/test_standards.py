@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------------------------------
+"""
+Тесты определения стандарта химического состава. Для наименований, которых нет в таблице `materials`, стандарт должен
+совпадать с прежним поиском по наименованию: первая по id запись `standards` с `material_name`, равным наименованию.
+"""
+import asyncio
+
+import pytest
+
+from materials import aio, crud
+from materials.compiled import compile_catalogue, CompiledCatalogue
+from materials.snapshot import MaterialsSnapshot
+
+UNKNOWN = "Неизвестная марка"
+
+
+@pytest.fixture(scope="module")
+def standards_by_name(sqlite_connection):
+    """Прежний результат поиска по наименованию: material_name -> первый по id стандарт."""
+    standards = {}
+    for name, standard in sqlite_connection.execute("SELECT material_name, standard FROM standards ORDER BY id"):
+        standards.setdefault(name, standard)
+    return standards
+
+
+@pytest.fixture(scope="module")
+def names_only_in_standards(sqlite_connection, standards_by_name):
+    brands = {brand for brand, in sqlite_connection.execute("SELECT brand FROM materials")}
+    names = sorted(set(standards_by_name) - brands)
+    assert names
+    return names
+
+
+@pytest.fixture(scope="module")
+def catalogue(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("compiled") / "materials.catalogue")
+    compile_catalogue(path)
+    catalogue = CompiledCatalogue(path)
+    yield catalogue
+    catalogue.close()
+
+
+@pytest.mark.parametrize("name, standard", [
+    ("08Н6Г4МЛ", "ГОСТ 977 - 88"),
+    ("09Г2ДТ", "ГОСТ 19281 - 2014"),
+    ("10Г2С", "ГОСТ 19281 - 2014"),
+])
+def test_name_only_in_standards(name, standard):
+    assert crud.get_standard_of_chemical_composition_by_brand(name) == standard
+
+
+def test_crud_matches_name_lookup(names_only_in_standards, standards_by_name):
+    result = crud.get_standards(names_only_in_standards + [UNKNOWN])
+    assert dict(result) == {name: standards_by_name[name] for name in names_only_in_standards}
+    assert result.missing == [UNKNOWN]
+    assert crud.get_standard_of_chemical_composition_by_brand(UNKNOWN) is None
+
+
+def test_standard_id_takes_precedence(db):
+    from materials.models import ChemicalComposition, Material, Standard
+
+    standard = Standard(material_name="Другое наименование", standard="ТУ 1-2-3")
+    db.add(standard)
+    db.flush()
+    material_id = db.query(Material.id).filter(Material.brand == "30ХМА").scalar()
+    db.query(ChemicalComposition).filter(ChemicalComposition.material_id == material_id) \
+        .update({ChemicalComposition.standard_id: standard.id})
+    assert crud.get_standard_of_chemical_composition_by_brand("30ХМА", db) == "ТУ 1-2-3"
+    assert crud.get_brands_by_standard("ТУ 1-2-3", db) == ["30ХМА"]
+
+
+@pytest.mark.parametrize("source", ["snapshot", "compiled"])
+def test_in_memory_lookups_match_crud(source, catalogue, names_only_in_standards):
+    lookup = MaterialsSnapshot.load() if source == "snapshot" else catalogue
+    names = crud.get_all_brands() + names_only_in_standards + [UNKNOWN]
+    expected = crud.get_standards(names)
+    result = lookup.get_standards(names)
+    assert dict(result) == dict(expected)
+    assert result.missing == expected.missing
+    assert all(lookup.get_standard_of_chemical_composition_by_brand(name) == expected[name]
+               for name in names_only_in_standards)
+
+
+def test_brands_by_standard_match_crud(catalogue):
+    snapshot = MaterialsSnapshot.load()
+    for standard in ["ГОСТ 977 - 88", "ГОСТ 4543 - 71", "ГОСТ 19281 - 2014", UNKNOWN]:
+        expected = crud.get_brands_by_standard(standard)
+        assert snapshot.get_brands_by_standard(standard) == expected
+        assert catalogue.get_brands_by_standard(standard) == expected